@@ -487,6 +487,12 @@ PROJECTROLES_ENABLE_SEARCH = True
 # PROJECTROLES_SECRET_LENGTH = 32
 # PROJECTROLES_HELP_HIGHLIGHT_DAYS = 7
 # PROJECTROLES_SEARCH_PAGINATION = 5
+# PROJECTROLES_SEARCH_THREADS = 4
+# PROJECTROLES_SEARCH_TIMEOUT = 10
+# PROJECTROLES_SEARCH_PROJECT_LIMIT = 500
+# PROJECTROLES_PLUGIN_REGISTRY_TIMEOUT = 10
+# PROJECTROLES_REMOTE_SYNC_CACHE_TIMEOUT = 300
+# PROJECTROLES_REMOTE_SYNC_INTERVAL = 60
 # Support for viewing the site in "kiosk mode" (under work, experimental)
 # PROJECTROLES_KIOSK_MODE = env.bool('PROJECTROLES_KIOSK_MODE', False)
 
@@ -518,6 +524,13 @@ BGJOBS_PAGINATION = env.int('BGJOBS_PAGINATION', 15)
 
 # Timeline app settings
 TIMELINE_PAGINATION = 15
+# TIMELINE_ARCHIVE_DAYS = 365
+# TIMELINE_ASYNC_MODE = 'thread'
+# TIMELINE_FLUSH_TIMEOUT = 10
+
+
+# Sodarcache app settings
+# SODARCACHE_CACHE_TIMEOUT = 60
 
 
 # Filesfolders app settings
@@ -80,6 +80,8 @@ ENABLED_BACKEND_PLUGINS = [
 PROJECTROLES_SITE_MODE = 'SOURCE'
 PROJECTROLES_SEND_EMAIL = True
 PROJECTROLES_SEARCH_PAGINATION = 10
+# Worker threads can't access data created within test transactions
+PROJECTROLES_SEARCH_THREADS = 1
 
 
 # UI test settings
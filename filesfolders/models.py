@@ -59,19 +59,24 @@ FLAG_CHOICES = [
 class FilesfoldersManager(models.Manager):
     """Manager for custom table-level BaseFilesfoldersClass queries"""
 
-    def find(self, search_term, keywords=None):
+    def find(self, search_term, keywords=None, projects=None):
         """
         Return objects or links matching the query.
         :param search_term: Search term (string)
         :param keywords: Optional search keywords as key/value pairs (dict)
-        :return: Python list of BaseFilesfolderClass objects
+        :param projects: Limit search to these projects (QuerySet or list of
+                         Project objects or pks, optional)
+        :return: QuerySet of BaseFilesfolderClass objects
         """
         objects = super().get_queryset().order_by('name')
 
+        if projects is not None:
+            objects = objects.filter(project__in=projects)
+
         objects = objects.filter(
             Q(name__icontains=search_term)
             | Q(description__icontains=search_term)
-        )
+        ).select_related('project', 'folder')
 
         return objects
 
@@ -1,8 +1,10 @@
 from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import Lower
 from django.urls import reverse
 
 # Projectroles dependency
-from projectroles.models import SODAR_CONSTANTS
+from projectroles.models import RoleAssignment, SODAR_CONSTANTS
 from projectroles.plugins import ProjectAppPluginPoint
 
 from .models import File, Folder, HyperLink
@@ -14,6 +16,7 @@ APP_SETTING_SCOPE_PROJECT = SODAR_CONSTANTS['APP_SETTING_SCOPE_PROJECT']
 
 # Local constants
 SHOW_LIST_COLUMNS = getattr(settings, 'FILESFOLDERS_SHOW_LIST_COLUMNS', False)
+SEARCH_LIMIT = 500  # Default max amount of search results
 
 
 class ProjectAppPlugin(ProjectAppPluginPoint):
@@ -102,20 +105,10 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
         """
         return None
 
-    def get_object_link(self, model_str, uuid):
-        """
-        Return URL for referring to a object used by the app, along with a
-        label to be shown to the user for linking.
-        :param model_str: Object class (string)
-        :param uuid: sodar_uuid of the referred object
-        :return: Dict or None if not found
-        """
-        obj = self.get_object(eval(model_str), uuid)
-
-        if not obj:
-            return None
-
-        elif obj.__class__ == File:
+    @staticmethod
+    def _get_link(obj):
+        """Return link data for a File, Folder or HyperLink object"""
+        if obj.__class__ == File:
             return {
                 'url': reverse(
                     'filesfolders:file_serve',
@@ -138,6 +131,40 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
 
         return None
 
+    def get_object_link(self, model_str, uuid):
+        """
+        Return URL for referring to a object used by the app, along with a
+        label to be shown to the user for linking.
+        :param model_str: Object class (string)
+        :param uuid: sodar_uuid of the referred object
+        :return: Dict or None if not found
+        """
+        obj = self.get_object(eval(model_str), uuid)
+
+        if not obj:
+            return None
+
+        return self._get_link(obj)
+
+    def get_object_links(self, model_str, uuids):
+        """
+        Return URLs and labels for multiple objects of the same model
+        :param model_str: Object class (string)
+        :param uuids: List of sodar_uuid values of the referred objects
+        :return: Dict of {sodar_uuid (string): dict or None}
+        """
+        model = eval(model_str)
+        objects = {
+            str(o.sodar_uuid): o
+            for o in model.objects.filter(sodar_uuid__in=uuids)
+        }
+        return {
+            str(u): self._get_link(objects[str(u)])
+            if str(u) in objects
+            else None
+            for u in uuids
+        }
+
     def search(self, search_term, user, search_type=None, keywords=None):
         """
         Return app items based on a search term, user, optional type and
@@ -149,31 +176,29 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
         :return: Dict
         """
         items = []
+        limit = getattr(settings, 'FILESFOLDERS_SEARCH_LIMIT', SEARCH_LIMIT)
+        projects = None  # No project restriction for superusers
 
-        if not search_type:
-            files = File.objects.find(search_term, keywords)
-            folders = Folder.objects.find(search_term, keywords)
-            links = HyperLink.objects.find(search_term, keywords)
-            items = list(files) + list(folders) + list(links)
-            items.sort(key=lambda x: x.name.lower())
-
-        elif search_type == 'file':
-            items = File.objects.find(search_term, keywords).order_by('name')
+        # Limit search in the database to projects where the user has a role
+        if not user.is_superuser:
+            projects = [
+                p.pk for p in RoleAssignment.objects.get_effective_roles(user)
+            ]
 
-        elif search_type == 'folder':
-            items = Folder.objects.find(search_term, keywords).order_by('name')
+        if projects is None or len(projects) > 0:
+            models = {'file': File, 'folder': Folder, 'link': HyperLink}
+            types = [search_type] if search_type else models.keys()
 
-        elif search_type == 'link':
-            items = HyperLink.objects.find(search_term, keywords).order_by(
-                'name'
-            )
+            for t in [t for t in types if t in models]:
+                # Slice querysets to only fetch max limit objects per model
+                items += (
+                    models[t]
+                    .objects.find(search_term, keywords, projects)
+                    .order_by(Lower('name'))[:limit]
+                )
 
-        if items:
-            items = [
-                x
-                for x in items
-                if user.has_perm('filesfolders.view_data', x.project)
-            ]
+            items.sort(key=lambda x: x.name.lower())
+            items = items[:limit]
 
         return {
             'all': {
@@ -199,6 +224,19 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
             },
         }
 
+    @classmethod
+    def _get_list_value(cls, project, count):
+        """Return project list value for an object count"""
+        if count > 0:
+            return '<a href="{}">{}</a>'.format(
+                reverse(
+                    'filesfolders:list', kwargs={'project': project.sodar_uuid}
+                ),
+                count,
+            )
+
+        return 0
+
     def get_project_list_value(self, column_id, project, user):
         """
         Return a value for the optional additional project list column specific
@@ -215,12 +253,37 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
         elif column_id == 'links':
             count = HyperLink.objects.filter(project=project).count()
 
-        if count > 0:
-            return '<a href="{}">{}</a>'.format(
-                reverse(
-                    'filesfolders:list', kwargs={'project': project.sodar_uuid}
-                ),
-                count,
-            )
+        return self._get_list_value(project, count)
 
-        return 0
+    def get_project_list_values(self, column_id, projects, user):
+        """
+        Return values for the optional additional project list column for
+        multiple projects, counting objects for all projects in one query.
+
+        :param column_id: ID of the column (string)
+        :param projects: List of Project objects
+        :param user: User object (current user)
+        :return: Dict of {project sodar_uuid (string): value}
+        """
+        if column_id == 'files':
+            model = File
+
+        elif column_id == 'links':
+            model = HyperLink
+
+        else:
+            return {}
+
+        counts = dict(
+            model.objects.filter(project__in=projects)
+            .order_by()
+            .values('project__sodar_uuid')
+            .annotate(count=Count('pk'))
+            .values_list('project__sodar_uuid', 'count')
+        )
+        return {
+            str(p.sodar_uuid): self._get_list_value(
+                p, counts.get(p.sodar_uuid, 0)
+            )
+            for p in projects
+        }
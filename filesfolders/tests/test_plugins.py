@@ -1,6 +1,7 @@
 """Plugin tests for the filesfolders app"""
 import uuid
 
+from django.test import override_settings
 from django.urls import reverse
 from test_plus.test import TestCase
 
@@ -155,3 +156,104 @@ class TestPlugins(
         """Test get_object_link() with a non-existent object"""
         plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
         self.assertEqual(plugin.get_object_link('File', uuid.uuid4()), None)
+
+    def test_get_object_links(self):
+        """Test get_object_links() for multiple objects"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        uuid_fail = uuid.uuid4()
+
+        with self.assertNumQueries(1):
+            ret = plugin.get_object_links(
+                'File', [self.file.sodar_uuid, uuid_fail]
+            )
+
+        self.assertEqual(
+            ret,
+            {
+                str(self.file.sodar_uuid): plugin.get_object_link(
+                    'File', self.file.sodar_uuid
+                ),
+                str(uuid_fail): None,
+            },
+        )
+
+    def test_get_project_list_values(self):
+        """Test get_project_list_values()"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        project_empty = self._make_project(
+            'TestProjectEmpty', PROJECT_TYPE_PROJECT, None
+        )
+        projects = [self.project, project_empty]
+        url = reverse(
+            'filesfolders:list', kwargs={'project': self.project.sodar_uuid}
+        )
+        with self.assertNumQueries(1):
+            ret = plugin.get_project_list_values('files', projects, self.user)
+        expected = {
+            str(self.project.sodar_uuid): '<a href="{}">1</a>'.format(url),
+            str(project_empty.sodar_uuid): 0,
+        }
+        self.assertEqual(ret, expected)
+        self.assertEqual(
+            ret[str(self.project.sodar_uuid)],
+            plugin.get_project_list_value('files', self.project, self.user),
+        )
+
+    def test_get_project_list_values_invalid(self):
+        """Test get_project_list_values() with an unknown column"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        with self.assertNumQueries(0):
+            ret = plugin.get_project_list_values(
+                'invalid', [self.project], self.user
+            )
+        self.assertEqual(ret, {})
+
+    def test_search(self):
+        """Test search() as superuser"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.search('', self.user)
+        self.assertEqual(
+            ret['all']['items'], [self.file, self.folder, self.hyperlink]
+        )
+
+    def test_search_type(self):
+        """Test search() with a search type"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.search('', self.user, search_type='folder')
+        self.assertEqual(ret['all']['items'], [self.folder])
+
+    def test_search_user(self):
+        """Test search() as user with access to one project"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        user_guest = self.make_user('user_guest')
+        role_guest = Role.objects.get_or_create(name=PROJECT_ROLE_GUEST)[0]
+        self._make_assignment(self.project, user_guest, role_guest)
+        project_no_access = self._make_project(
+            'TestProjectNoAccess', PROJECT_TYPE_PROJECT, None
+        )
+        self._make_folder(
+            name='folder_no_access',
+            project=project_no_access,
+            folder=None,
+            owner=self.user,
+            description='',
+        )
+        with self.assertNumQueries(4):  # Roles, files, folders, links
+            ret = plugin.search('', user_guest)
+        self.assertEqual(
+            ret['all']['items'], [self.file, self.folder, self.hyperlink]
+        )
+
+    def test_search_no_role(self):
+        """Test search() as user without roles"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        user_no_roles = self.make_user('user_no_roles')
+        ret = plugin.search('', user_no_roles)
+        self.assertEqual(ret['all']['items'], [])
+
+    @override_settings(FILESFOLDERS_SEARCH_LIMIT=2)
+    def test_search_limit(self):
+        """Test search() with a result limit"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.search('', self.user)
+        self.assertEqual(ret['all']['items'], [self.file, self.folder])
@@ -2,6 +2,10 @@
 import json
 import logging
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
 from projectroles.models import AppSetting, APP_SETTING_TYPES, SODAR_CONSTANTS
 from projectroles.plugins import get_app_plugin, get_active_plugins
 
@@ -19,6 +23,8 @@ VALID_SCOPES = [
     APP_SETTING_SCOPE_USER,
     APP_SETTING_SCOPE_PROJECT_USER,
 ]
+CACHE_KEY_PREFIX = 'sodar_core.app_settings'
+CACHE_TIMEOUT = 60  # Default cache timeout in seconds
 
 
 logger = logging.getLogger(__name__)
@@ -121,22 +127,31 @@ class AppSettingAPI:
         return setting_obj.value == str(input_value)
 
     @classmethod
-    def get_default_setting(cls, app_name, setting_name, post_safe=False):
+    def _get_cache_key(cls, project=None, user=None):
         """
-        Get default setting value from an app plugin.
+        Return cache key for settings of a project and/or user.
 
-        :param app_name: App name (string, must equal "name" in app plugin)
+        :param project: Project object or pk
+        :param user: User object or pk
+        :return: String
+        """
+        return '{}.{}.{}'.format(
+            CACHE_KEY_PREFIX,
+            getattr(project, 'pk', project) or '',
+            getattr(user, 'pk', user) or '',
+        )
+
+    @classmethod
+    def _get_default(cls, app_plugin, setting_name, post_safe=False):
+        """
+        Get default setting value from an app plugin object.
+
+        :param app_plugin: Plugin object extending ProjectAppPluginPoint
         :param setting_name: Setting name (string)
         :param post_safe: Whether a POST safe value should be returned (bool)
         :return: Setting value (string, integer or boolean)
-        :raise: ValueError if app plugin is not found
         :raise: KeyError if nothing is found with setting_name
         """
-        app_plugin = get_app_plugin(app_name)
-
-        if not app_plugin:
-            raise ValueError('App plugin not found: "{}"'.format(app_name))
-
         if setting_name in app_plugin.app_settings:
             if app_plugin.app_settings[setting_name]['type'] == 'JSON':
                 if not app_plugin.app_settings[setting_name].get('default'):
@@ -151,10 +166,68 @@ class AppSettingAPI:
 
         raise KeyError(
             'Setting "{}" not found in app plugin "{}"'.format(
-                setting_name, app_name
+                setting_name, app_plugin.name
             )
         )
 
+    @classmethod
+    def get_default_setting(cls, app_name, setting_name, post_safe=False):
+        """
+        Get default setting value from an app plugin.
+
+        :param app_name: App name (string, must equal "name" in app plugin)
+        :param setting_name: Setting name (string)
+        :param post_safe: Whether a POST safe value should be returned (bool)
+        :return: Setting value (string, integer or boolean)
+        :raise: ValueError if app plugin is not found
+        :raise: KeyError if nothing is found with setting_name
+        """
+        app_plugin = get_app_plugin(app_name)
+
+        if not app_plugin:
+            raise ValueError('App plugin not found: "{}"'.format(app_name))
+
+        return cls._get_default(app_plugin, setting_name, post_safe)
+
+    @classmethod
+    def get_setting_values(cls, project=None, user=None):
+        """
+        Return values of all settings stored in the database for a project
+        and/or user. The values are retrieved in a single query and cached
+        until a setting is changed or the cache timeout is reached.
+
+        :param project: Project object or pk (optional)
+        :param user: User object or pk (optional)
+        :return: Dict of {(app name, setting name): value}
+        :raise: ValueError if neither project nor user are set
+        """
+        cache_key = cls._get_cache_key(project, user)
+        ret = cache.get(cache_key)
+
+        if ret is None:
+            ret = AppSetting.objects.get_setting_values(project, user)
+            cache.set(
+                cache_key,
+                ret,
+                getattr(
+                    settings,
+                    'PROJECTROLES_APP_SETTINGS_CACHE_TIMEOUT',
+                    CACHE_TIMEOUT,
+                ),
+            )
+
+        return ret
+
+    @classmethod
+    def invalidate_cache(cls, project=None, user=None):
+        """
+        Invalidate cached setting values for a project and/or user.
+
+        :param project: Project object or pk (optional)
+        :param user: User object or pk (optional)
+        """
+        cache.delete(cls._get_cache_key(project, user))
+
     @classmethod
     def get_app_setting(
         cls, app_name, setting_name, project=None, user=None, post_safe=False
@@ -171,12 +244,12 @@ class AppSettingAPI:
         :return: String or None
         :raise: KeyError if nothing is found with setting_name
         """
-        try:
-            val = AppSetting.objects.get_setting_value(
-                app_name, setting_name, project=project, user=user
-            )
+        values = cls.get_setting_values(project, user)
 
-        except AppSetting.DoesNotExist:
+        if (app_name, setting_name) in values:
+            val = values[(app_name, setting_name)]
+
+        else:
             val = cls.get_default_setting(app_name, setting_name, post_safe)
 
         # Handle post_safe for dict values (JSON)
@@ -202,6 +275,7 @@ class AppSettingAPI:
 
         ret = {}
         app_plugins = get_active_plugins()
+        values = cls.get_setting_values(project, user)
 
         for plugin in app_plugins:
             p_settings = cls.get_setting_defs(
@@ -209,11 +283,16 @@ class AppSettingAPI:
             )
 
             for s_key in p_settings:
-                ret[
-                    'settings.{}.{}'.format(plugin.name, s_key)
-                ] = cls.get_app_setting(
-                    plugin.name, s_key, project, user, post_safe
-                )
+                if (plugin.name, s_key) in values:
+                    val = values[(plugin.name, s_key)]
+
+                else:
+                    val = cls._get_default(plugin, s_key, post_safe)
+
+                if post_safe and isinstance(val, dict):
+                    val = json.dumps(val)
+
+                ret['settings.{}.{}'.format(plugin.name, s_key)] = val
 
         return ret
 
@@ -482,3 +561,12 @@ class AppSettingAPI:
             cls._check_type(v['type'])
 
         return setting_defs
+
+
+def invalidate_app_setting_cache(sender, instance, **kwargs):
+    """Signal for invalidating cached setting values on AppSetting changes"""
+    AppSettingAPI.invalidate_cache(instance.project_id, instance.user_id)
+
+
+post_save.connect(invalidate_app_setting_cache, sender=AppSetting)
+post_delete.connect(invalidate_app_setting_cache, sender=AppSetting)
@@ -0,0 +1,91 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projectroles.models import RemoteSite, SODAR_CONSTANTS
+from projectroles.remote_projects import (
+    RemoteProjectAPI,
+    SYNC_CACHE_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# SODAR constants
+SITE_MODE_TARGET = SODAR_CONSTANTS['SITE_MODE_TARGET']
+SITE_MODE_SOURCE = SODAR_CONSTANTS['SITE_MODE_SOURCE']
+
+
+class Command(BaseCommand):
+    help = (
+        'Precomputes remote project sync data for target sites and reports '
+        'sync metrics.'
+    )
+
+    def add_arguments(self, parser):
+        pass
+
+    def handle(self, *args, **options):
+        if settings.PROJECTROLES_SITE_MODE != SITE_MODE_SOURCE:
+            logger.error('Site not in SOURCE mode, unable to cache sync data')
+            return
+
+        if not getattr(
+            settings,
+            'PROJECTROLES_REMOTE_SYNC_CACHE_TIMEOUT',
+            SYNC_CACHE_TIMEOUT,
+        ):
+            logger.error(
+                'PROJECTROLES_REMOTE_SYNC_CACHE_TIMEOUT=0, sync data caching '
+                'disabled'
+            )
+            return
+
+        remote_api = RemoteProjectAPI()
+        target_sites = RemoteSite.objects.filter(mode=SITE_MODE_TARGET)
+        site_keys = {}
+
+        logger.info(
+            'Caching sync data for {} target sites..'.format(
+                target_sites.count()
+            )
+        )
+
+        for site in target_sites:
+            remote_projects = list(site.projects.all())
+            cache_key = remote_api.get_target_cache_key(remote_projects)
+            shared = cache_key in site_keys.values()
+            site_keys[site.pk] = cache_key
+
+            start_time = time.time()
+            sync_data = remote_api.get_target_data(site)
+            logger.info(
+                'Target site "{}": {} projects, {} users, {} in {:.2f} s'.format(
+                    site.name,
+                    len(sync_data['projects']),
+                    len(sync_data['users']),
+                    'shared' if shared else 'built',
+                    time.time() - start_time,
+                )
+            )
+            metrics = remote_api.get_sync_metrics(site)
+
+            if metrics:
+                logger.info(
+                    'Target site "{}": latest sync at {}, {} bytes in '
+                    '{:.2f} s{}'.format(
+                        site.name,
+                        metrics['date'].strftime('%Y-%m-%d %H:%M:%S'),
+                        metrics['size'],
+                        metrics['time'],
+                        ' (delta)' if metrics['delta'] else '',
+                    )
+                )
+
+        logger.info(
+            'Cached sync data for {} distinct project sets'.format(
+                len(set(site_keys.values()))
+            )
+        )
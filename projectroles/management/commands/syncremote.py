@@ -1,15 +1,11 @@
-import json
 import logging
-import urllib.request
 
 from django.contrib import auth
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.urls import reverse
 
 from projectroles.models import RemoteSite, SODAR_CONSTANTS
 from projectroles.remote_projects import RemoteProjectAPI
-from projectroles.views_api import CORE_API_MEDIA_TYPE, CORE_API_DEFAULT_VERSION
 
 User = auth.get_user_model()
 logger = logging.getLogger(__name__)
@@ -24,7 +20,15 @@ class Command(BaseCommand):
     help = 'Synchronizes user and project data from a remote site.'
 
     def add_arguments(self, parser):
-        pass
+        parser.add_argument(
+            '-f',
+            '--full',
+            dest='full',
+            required=False,
+            default=False,
+            action='store_true',
+            help='Retrieve full data instead of changes since the last sync',
+        )
 
     def handle(self, *args, **options):
         if getattr(settings, 'PROJECTROLES_DISABLE_CATEGORIES', False):
@@ -57,20 +61,10 @@ class Command(BaseCommand):
             )
         )
 
-        api_url = site.get_url() + reverse(
-            'projectroles:api_remote_get', kwargs={'secret': site.secret}
-        )
+        remote_api = RemoteProjectAPI()
 
         try:
-            api_req = urllib.request.Request(api_url)
-            api_req.add_header(
-                'accept',
-                '{}; version={}'.format(
-                    CORE_API_MEDIA_TYPE, CORE_API_DEFAULT_VERSION
-                ),
-            )
-            response = urllib.request.urlopen(api_req)
-            remote_data = json.loads(response.read())
+            remote_data = remote_api.get_remote_data(site, full=options['full'])
 
         except Exception as ex:
             logger.error(
@@ -78,7 +72,11 @@ class Command(BaseCommand):
             )
             return
 
-        remote_api = RemoteProjectAPI()
+        if remote_data is None:
+            logger.info(
+                'No changes in remote site detected, nothing to synchronize'
+            )
+            return
 
         try:
             remote_api.sync_source_data(site, remote_data)
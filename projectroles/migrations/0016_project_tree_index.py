@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 03:39
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def populate_tree_index(apps, schema_editor):
+    """Set tree_path and full_title for existing projects"""
+    Project = apps.get_model('projectroles', 'Project')
+
+    def _update(parent, parent_path=None, parent_title=None):
+        for project in Project.objects.filter(parent=parent):
+            tree_path = str(project.sodar_uuid)
+            full_title = project.title
+
+            if parent_path:
+                tree_path = parent_path + '/' + tree_path
+                full_title = parent_title + ' / ' + full_title
+
+            Project.objects.filter(pk=project.pk).update(
+                tree_path=tree_path, full_title=full_title
+            )
+            _update(project, tree_path, full_title)
+
+    _update(None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0015_fix_appsetting_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='full_title',
+            field=models.CharField(editable=False, help_text='Full project title including parents (auto-generated)', max_length=4096, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tree_path',
+            field=models.CharField(db_index=True, editable=False, help_text='Project tree path as SODAR UUIDs from the root (auto-generated)', max_length=4096, null=True),
+        ),
+        migrations.RunPython(
+            populate_tree_index, migrations.RunPython.noop
+        ),
+    ]
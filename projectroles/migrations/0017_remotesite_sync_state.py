@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 04:18
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0016_project_tree_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotesite',
+            name='sync_hashes',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict, help_text='Hashes of remote project sync data last sent to the site'),
+        ),
+        migrations.AddField(
+            model_name='remotesite',
+            name='sync_token',
+            field=models.CharField(blank=True, help_text='Token identifying the latest remote project sync', max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 04:35
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0017_remotesite_sync_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotesite',
+            name='sync_etag',
+            field=models.CharField(blank=True, help_text='ETag of the latest remote project sync data', max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='remotesite',
+            name='sync_version',
+            field=models.PositiveIntegerField(default=0, help_text='Version of synchronized data, increased on changes'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+import threading
 import uuid
 
 from django.apps import apps
@@ -6,8 +7,16 @@ from django.contrib.auth.models import AbstractUser, Group
 from django.contrib.auth.signals import user_logged_in
 from django.contrib.postgres.fields import JSONField
 from django.core.exceptions import ValidationError
+from django.core.signals import request_finished, request_started
 from django.db import models
-from django.db.models import Q
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.db.models.functions import Concat, Length, Substr
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
@@ -35,6 +44,23 @@ APP_SETTING_TYPE_CHOICES = [
 APP_SETTING_VAL_MAXLENGTH = 255
 PROJECT_SEARCH_TYPES = ['project']
 PROJECT_TAG_STARRED = 'STARRED'
+PROJECT_TITLE_DELIMITER = ' / '
+PROJECT_PATH_DELIMITER = '/'
+REMOTE_SYNC_IGNORE_FIELDS = [
+    'last_login',
+    'sync_token',
+    'sync_hashes',
+    'sync_version',
+    'sync_etag',
+]
+# User fields included in remote sync data
+REMOTE_SYNC_USER_FIELDS = [
+    'username',
+    'name',
+    'first_name',
+    'last_name',
+    'email',
+]
 
 
 # Project ----------------------------------------------------------------------
@@ -43,34 +69,161 @@ PROJECT_TAG_STARRED = 'STARRED'
 class ProjectManager(models.Manager):
     """Manager for custom table-level Project queries"""
 
-    def find(self, search_term, keywords=None, project_type=None):
+    def find(self, search_term, keywords=None, project_type=None, user=None):
         """
         Return projects with a partial match in full title or, including titles
         of parent Project objects, or the description of the current object.
-        Restrict to project type if project_type is set.
+        Restrict to project type if project_type is set. If user is set,
+        restrict to projects the user has access to. Results are ranked by
+        exact and prefix matches of the title, followed by the full title.
 
         :param search_term: Search term (string)
         :param keywords: Optional search keywords as key/value pairs (dict)
         :param project_type: Project type or None
-        :return: List of Project objects
+        :param user: User object for restricting access (optional)
+        :return: QuerySet of Project objects
         """
-        search_term = search_term.lower()
-        projects = super().get_queryset().order_by('title')
+        projects = self.get_visible(user) if user else super().get_queryset()
+        projects = projects.filter(
+            Q(full_title__icontains=search_term)
+            | Q(description__icontains=search_term)
+        )
 
         if project_type:
             projects = projects.filter(type=project_type)
 
-        # NOTE: Can't use a custom function in filter()
-        result = [
-            p
-            for p in projects
+        return projects.annotate(
+            search_rank=Case(
+                When(title__iexact=search_term, then=Value(0)),
+                When(title__istartswith=search_term, then=Value(1)),
+                default=Value(2),
+                output_field=models.IntegerField(),
+            )
+        ).order_by('search_rank', 'full_title')
+
+    def get_visible(self, user):
+        """
+        Return projects and categories the user has access to: projects where
+        the user has a role, categories containing them and projects under
+        categories owned by the user. Resolves access with one role query.
+
+        :param user: User object
+        :return: QuerySet of Project objects
+        """
+        if user.is_superuser:
+            return super().get_queryset()
+
+        if not user.is_authenticated:
+            return super().get_queryset().none()
+
+        visible_uuids = set()
+        q = Q()
+
+        for path, role_name, p_type in RoleAssignment.objects.filter(
+            user=user
+        ).values_list('project__tree_path', 'role__name', 'project__type'):
+            visible_uuids.update(path.split(PROJECT_PATH_DELIMITER))
+
             if (
-                search_term in p.get_full_title().lower()
-                or (p.description and search_term in p.description.lower())
+                role_name == SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
+                and p_type == SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+            ):
+                q |= Q(tree_path__startswith=path + PROJECT_PATH_DELIMITER)
+
+        return (
+            super().get_queryset().filter(Q(sodar_uuid__in=visible_uuids) | q)
+        )
+
+    def get_ancestors(self, project):
+        """
+        Return parents of a project in inheritance order, using the project
+        tree index in a single query.
+
+        :param project: Project object
+        :return: QuerySet
+        """
+        return (
+            super()
+            .get_queryset()
+            .filter(sodar_uuid__in=project.get_path_uuids()[:-1])
+            .annotate(path_length=Length('tree_path'))
+            .order_by('path_length')
+        )
+
+    def get_project_list(self, user, parent=None):
+        """
+        Return a flat list of projects visible to a user in tree order, with
+        the depth of each project attached in the "depth" attribute. Projects
+        and roles are retrieved in bulk, with invisible branches pruned in
+        memory.
+
+        :param user: User object
+        :param parent: Parent category for limiting the list (optional)
+        :return: List of Project objects
+        """
+        if not user.is_authenticated:
+            return []
+
+        projects = (
+            super()
+            .get_queryset()
+            .filter(submit_status=SODAR_CONSTANTS['SUBMIT_STATUS_OK'])
+        )
+        min_depth = 0
+
+        if parent:
+            projects = projects.filter(
+                tree_path__startswith=parent.tree_path + PROJECT_PATH_DELIMITER
             )
-        ]
+            min_depth = parent.get_depth() + 1
+
+        projects = list(projects)
+
+        if not user.is_superuser:
+            visible = set()
+
+            for p in RoleAssignment.objects.get_effective_roles(user, parent):
+                visible.update(p.get_path_uuids())
+
+            projects = [p for p in projects if str(p.sodar_uuid) in visible]
 
-        return sorted(result, key=lambda x: x.get_full_title())
+        titles = {str(p.sodar_uuid): p.title for p in projects}
+
+        # Sort by title on each level of the tree
+        def _get_key(obj):
+            return [titles.get(u, '') for u in obj.get_path_uuids()[min_depth:]]
+
+        ret = []
+        listed = set()
+
+        for p in sorted(projects, key=_get_key):
+            path_uuids = p.get_path_uuids()
+
+            # Prune projects under a parent which is not listed
+            if len(path_uuids) > min_depth + 1 and path_uuids[-2] not in listed:
+                continue
+
+            p.depth = len(path_uuids) - 1
+            listed.add(path_uuids[-1])
+            ret.append(p)
+
+        return ret
+
+    def get_descendants(self, project):
+        """
+        Return all projects under a project in the project tree, using the
+        project tree index in a single query.
+
+        :param project: Project object
+        :return: QuerySet
+        """
+        return (
+            super()
+            .get_queryset()
+            .filter(
+                tree_path__startswith=project.tree_path + PROJECT_PATH_DELIMITER
+            )
+        )
 
 
 class Project(models.Model):
@@ -132,6 +285,24 @@ class Project(models.Model):
         default=uuid.uuid4, unique=True, help_text='Project SODAR UUID'
     )
 
+    #: Full project title including parents (auto-generated)
+    full_title = models.CharField(
+        max_length=4096,
+        null=True,
+        editable=False,
+        help_text='Full project title including parents (auto-generated)',
+    )
+
+    #: Project tree path as SODAR UUIDs from the root (auto-generated)
+    tree_path = models.CharField(
+        max_length=4096,
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text='Project tree path as SODAR UUIDs from the root '
+        '(auto-generated)',
+    )
+
     # Set manager for custom queries
     objects = ProjectManager()
 
@@ -140,14 +311,10 @@ class Project(models.Model):
         ordering = ['parent__title', 'title']
 
     def __str__(self):
-        parents = self.get_parents()
-        ret = ' / '.join([p.title for p in parents]) if parents else ''
+        if self.full_title:
+            return self.full_title
 
-        if ret:
-            ret += ' / '
-
-        ret += self.title
-        return ret
+        return self._get_full_title()
 
     def __repr__(self):
         values = (
@@ -158,12 +325,26 @@ class Project(models.Model):
         return 'Project({})'.format(', '.join(repr(v) for v in values))
 
     def save(self, *args, **kwargs):
-        """Version of save() to include custom validation for Project"""
+        """
+        Version of save() to include custom validation for Project and to
+        maintain the project tree index for the project and its children.
+        """
         self._validate_parent()
         self._validate_title()
         self._validate_parent_type()
+        old_index = (
+            Project.objects.filter(pk=self.pk)
+            .values_list('tree_path', 'full_title')
+            .first()
+            if self.pk
+            else None
+        )
+        self._set_tree_index()
         super().save(*args, **kwargs)
 
+        if old_index and old_index[0]:
+            self._update_child_tree_index(*old_index)
+
     def _validate_parent(self):
         """Validate parent value to ensure project can't be set as its own
         parent"""
@@ -186,6 +367,78 @@ class Project(models.Model):
         if self.parent and self.title == self.parent.title:
             raise ValidationError('Project and parent titles can not be equal')
 
+    def _get_full_title(self):
+        """Return full title by walking through parents, bypassing the index"""
+        ret = self.title
+        parent = self.parent
+
+        while parent:
+            ret = parent.title + PROJECT_TITLE_DELIMITER + ret
+            parent = parent.parent
+
+        return ret
+
+    def _get_tree_path(self):
+        """Return tree path by walking through parents, bypassing the index"""
+        ret = str(self.sodar_uuid)
+        parent = self.parent
+
+        while parent:
+            ret = str(parent.sodar_uuid) + PROJECT_PATH_DELIMITER + ret
+            parent = parent.parent
+
+        return ret
+
+    def _set_tree_index(self):
+        """Set tree_path and full_title based on the current parent"""
+        parent_index = None
+
+        if self.parent:
+            # Read from the database in case the parent object is outdated
+            parent_index = (
+                Project.objects.filter(pk=self.parent.pk)
+                .values_list('tree_path', 'full_title')
+                .first()
+            )
+
+        if parent_index and parent_index[0]:
+            self.tree_path = (
+                parent_index[0] + PROJECT_PATH_DELIMITER + str(self.sodar_uuid)
+            )
+            self.full_title = (
+                parent_index[1] + PROJECT_TITLE_DELIMITER + self.title
+            )
+
+        else:
+            self.tree_path = self._get_tree_path()
+            self.full_title = self._get_full_title()
+
+    def _update_child_tree_index(self, old_path, old_title):
+        """
+        Update tree_path and full_title for all children of the project in a
+        single query if the project has been moved or renamed.
+
+        :param old_path: Previous tree_path of the project (string)
+        :param old_title: Previous full_title of the project (string)
+        """
+        if old_path == self.tree_path and old_title == self.full_title:
+            return
+
+        Project.objects.filter(
+            tree_path__startswith=old_path + PROJECT_PATH_DELIMITER
+        ).update(
+            tree_path=Concat(
+                Value(self.tree_path),
+                Substr('tree_path', len(old_path) + 1),
+                output_field=models.CharField(),
+            ),
+            full_title=Concat(
+                Value(self.full_title),
+                Substr('full_title', len(old_title) + 1),
+                output_field=models.CharField(),
+            ),
+        )
+
     def get_absolute_url(self):
         return reverse(
             'projectroles:detail', kwargs={'project': self.sodar_uuid}
@@ -201,26 +454,45 @@ class Project(models.Model):
         :return: Iterable of Project
         """
         if flat:
+            children = {}
 
-            def _get(obj, ret=None):
-                if ret is None:
-                    ret = []
+            # Descendants of projects not included are left out in _get()
+            for p in (
+                Project.objects.get_descendants(self)
+                .filter(submit_status=SODAR_CONSTANTS['SUBMIT_STATUS_OK'])
+                .order_by('title')
+            ):
+                children.setdefault(p.parent_id, []).append(p)
 
-                ret += list(obj.get_children())
+            def _get(obj, ret):
+                ret += children.get(obj.pk, [])
 
-                for child in obj.get_children():
-                    ret = _get(child, ret)
+                for child in children.get(obj.pk, []):
+                    _get(child, ret)
 
                 return ret
 
-            return _get(self)
+            return _get(self, [])
 
         return self.children.filter(
             submit_status=SODAR_CONSTANTS['SUBMIT_STATUS_OK']
         ).order_by('title')
 
+    def get_path_uuids(self):
+        """
+        Return SODAR UUIDs of the parents of the project and the project itself
+        from the project tree index, starting from the root.
+
+        :return: List of strings
+        """
+        tree_path = self.tree_path or self._get_tree_path()
+        return tree_path.split(PROJECT_PATH_DELIMITER)
+
     def get_depth(self):
         """Return depth of project in the project tree structure (root=0)"""
+        if self.tree_path:
+            return self.tree_path.count(PROJECT_PATH_DELIMITER)
+
         ret = 0
         p = self
 
@@ -251,23 +523,25 @@ class Project(models.Model):
         :param inherited_only: Only show inherited owners if True (bool)
         :return: List
         """
-        owners = []
-        owner_as = self.get_owner()
-
-        if owner_as and not inherited_only:
-            owners.append(owner_as)
+        path_uuids = self.get_path_uuids()
 
-        parent = self.parent
+        if inherited_only:
+            path_uuids = path_uuids[:-1]
 
-        while parent:
-            parent_owner_as = parent.get_owner()
+        owner_as = (
+            RoleAssignment.objects.filter(
+                project__sodar_uuid__in=path_uuids,
+                role__name=SODAR_CONSTANTS['PROJECT_ROLE_OWNER'],
+            )
+            .select_related('user', 'role', 'project')
+            .annotate(path_length=Length('project__tree_path'))
+            .order_by('-path_length')
+        )
+        owners = []
 
-            if parent_owner_as and parent_owner_as.user not in [
-                a.user for a in owners
-            ]:
-                owners.append(parent_owner_as)
-
-            parent = parent.parent
+        for a in owner_as:
+            if a.user not in [o.user for o in owners]:
+                owners.append(a)
 
         return owners
 
@@ -276,7 +550,14 @@ class Project(models.Model):
         Return True if user is owner in this project or inherits ownership from
         a parent category.
         """
-        return True if user in [a.user for a in self.get_owners()] else False
+        if not user.is_authenticated:
+            return False
+
+        return RoleAssignment.objects.filter(
+            user=user,
+            project__sodar_uuid__in=self.get_path_uuids(),
+            role__name=SODAR_CONSTANTS['PROJECT_ROLE_OWNER'],
+        ).exists()
 
     def get_delegates(self):
         """Return RoleAssignments for delegates"""
@@ -311,21 +592,30 @@ class Project(models.Model):
         True, return True if user has roles in ANY child project. Also return
         True if user inherits owner permissions from a parent category.
         """
-        if self.is_owner(user) or self.roles.filter(user=user).count() > 0:
-            return True
+        if not user.is_authenticated:
+            return False
+
+        q = Q(project=self) | Q(
+            project__sodar_uuid__in=self.get_path_uuids()[:-1],
+            role__name=SODAR_CONSTANTS['PROJECT_ROLE_OWNER'],
+        )
 
         if include_children:
-            for child in self.children.all():
-                if child.has_role(user, include_children=True):
-                    return True
+            q |= Q(
+                project__tree_path__startswith=self.tree_path
+                + PROJECT_PATH_DELIMITER
+            )
 
-        return False
+        return RoleAssignment.objects.filter(q, user=user).exists()
 
     def get_parents(self):
         """Return an array of parent projects in inheritance order"""
         if not self.parent:
             return None
 
+        if self.tree_path:
+            return list(Project.objects.get_ancestors(self))
+
         ret = []
         parent = self.parent
 
@@ -427,6 +717,75 @@ class RoleAssignmentManager(models.Manager):
         except RoleAssignment.DoesNotExist:
             return None
 
+    def get_effective_roles(self, user, project=None):
+        """
+        Return the effective roles of a user in the project tree, including
+        owner roles inherited from parent categories. If project is set, limit
+        the results to the project and its children. Retrieves the roles in
+        at most two queries.
+
+        :param user: User object
+        :param project: Project object (optional)
+        :return: Dict of {Project: role name}
+        """
+        if not user.is_authenticated:
+            return {}
+
+        assignments = (
+            super()
+            .get_queryset()
+            .filter(user=user)
+            .select_related('project', 'role')
+        )
+        subtree_q = None
+
+        if project:
+            subtree_q = Q(pk=project.pk) | Q(
+                tree_path__startswith=project.tree_path + PROJECT_PATH_DELIMITER
+            )
+            assignments = assignments.filter(
+                Q(project__sodar_uuid__in=project.get_path_uuids())
+                | Q(
+                    project__tree_path__startswith=project.tree_path
+                    + PROJECT_PATH_DELIMITER
+                )
+            )
+
+        ret = {}
+        owner_q = None
+
+        for a in assignments:
+            if (
+                a.role.name == SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
+                and a.project.type == SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+            ):
+                q = Q(
+                    tree_path__startswith=a.project.tree_path
+                    + PROJECT_PATH_DELIMITER
+                )
+                owner_q = owner_q | q if owner_q else q
+
+            # Skip roles in parents outside the requested subtree
+            if (
+                project
+                and a.project != project
+                and a.project.get_depth() < project.get_depth()
+            ):
+                continue
+
+            ret[a.project] = a.role.name
+
+        if owner_q:
+            inherited = Project.objects.filter(owner_q)
+
+            if subtree_q:
+                inherited = inherited.filter(subtree_q)
+
+            for p in inherited:
+                ret[p] = SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
+
+        return ret
+
 
 class RoleAssignment(models.Model):
     """
@@ -479,10 +838,19 @@ class RoleAssignment(models.Model):
 
     def save(self, *args, **kwargs):
         """Version of save() to include custom validation for RoleAssignment"""
+        self.validate()
+        super().save(*args, **kwargs)
+
+    def validate(self):
+        """
+        Run custom validation for RoleAssignment. Called in save(), call
+        explicitly if the object is created without save().
+
+        :raise: ValidationError if validation fails
+        """
         self._validate_user()
         self._validate_owner()
         self._validate_delegate()
-        super().save(*args, **kwargs)
 
     def _validate_user(self):
         """Validate fields to ensure user has only one role set for the
@@ -534,6 +902,137 @@ class RoleAssignment(models.Model):
                         )
 
 
+# RoleCache --------------------------------------------------------------------
+
+
+class RoleCache:
+    """
+    Cache for role assignment and ownership lookups of a user. The cache is
+    stored in the user object and scoped to the current request, so cached
+    results live for the duration of a single request even if the user object
+    is reused. Outside of requests, e.g. in management commands or Celery
+    tasks, lookups are not cached. The cache is invalidated when role
+    assignments or projects are saved or deleted in the current process.
+    """
+
+    #: Cache attribute name in the user object
+    attr_name = '_sodar_role_cache'
+
+    #: Current cache version, increased on invalidation
+    version = 0
+
+    #: Request scope of the current thread, None outside of requests
+    local = threading.local()
+
+    @classmethod
+    def _get_cache(cls, user):
+        """
+        Return role cache dict for user, resetting it if outdated or created
+        in another request.
+
+        :param user: User object
+        :return: Dict or None if not in a request
+        """
+        scope = getattr(cls.local, 'scope', None)
+
+        if scope is None:
+            return None
+
+        cache = getattr(user, cls.attr_name, None)
+
+        if (
+            not cache
+            or cache['version'] != cls.version
+            or cache['scope'] is not scope
+        ):
+            cache = {
+                'version': cls.version,
+                'scope': scope,
+                'assignment': {},
+                'owner': {},
+            }
+            setattr(user, cls.attr_name, cache)
+
+        return cache
+
+    @classmethod
+    def get_assignment(cls, user, project):
+        """
+        Return assignment of user to project, or None if not found.
+
+        :param user: User object
+        :param project: Project object
+        :return: RoleAssignment object or None
+        """
+        if not project or not user.is_authenticated:
+            return None
+
+        cache = cls._get_cache(user)
+
+        if cache and project.pk in cache['assignment']:
+            return cache['assignment'][project.pk]
+
+        ret = (
+            RoleAssignment.objects.filter(user=user, project=project)
+            .select_related('role')
+            .first()
+        )
+
+        if cache:
+            cache['assignment'][project.pk] = ret
+
+        return ret
+
+    @classmethod
+    def is_owner(cls, user, project):
+        """
+        Return True if user is owner in project or inherits ownership from a
+        parent category.
+
+        :param user: User object
+        :param project: Project object
+        :return: Boolean
+        """
+        if not project or not user.is_authenticated:
+            return False
+
+        cache = cls._get_cache(user)
+
+        if cache and project.pk in cache['owner']:
+            return cache['owner'][project.pk]
+
+        ret = project.is_owner(user)
+
+        if cache:
+            cache['owner'][project.pk] = ret
+
+        return ret
+
+    @classmethod
+    def start_request(cls):
+        """Start a new cache scope for a request in the current thread"""
+        cls.local.scope = object()
+
+    @classmethod
+    def end_request(cls):
+        """End the cache scope of the current thread"""
+        cls.local.scope = None
+
+    @classmethod
+    def reset(cls, user):
+        """
+        Remove the role cache from a user object.
+
+        :param user: User object
+        """
+        user.__dict__.pop(cls.attr_name, None)
+
+    @classmethod
+    def invalidate(cls):
+        """Invalidate role caches of all users"""
+        cls.version += 1
+
+
 # AppSetting ---------------------------------------------------------------
 
 
@@ -569,6 +1068,28 @@ class AppSettingManager(models.Manager):
         )
         return setting.get_value()
 
+    def get_setting_values(self, project=None, user=None):
+        """
+        Return values of all settings stored for project and/or user, retrieved
+        in a single query.
+
+        Note that project and/or user must be set.
+
+        :param project: Project object or pk
+        :param user: User object or pk
+        :return: Dict of {(app plugin name, setting name): value}
+        :raise: ValueError if project and user are both unset
+        """
+        if (project is None) and (user is None):
+            raise ValueError('Project and user unset.')
+        objects = (
+            super()
+            .get_queryset()
+            .filter(project=project, user=user)
+            .select_related('app_plugin')
+        )
+        return {(s.app_plugin.name, s.name): s.get_value() for s in objects}
+
 
 class AppSetting(models.Model):
     """
@@ -888,6 +1409,36 @@ class RemoteSite(models.Model):
         default=True, unique=False, help_text='RemoteSite visibility to users'
     )
 
+    #: Token identifying the latest remote project sync with the site
+    sync_token = models.CharField(
+        max_length=255,
+        unique=False,
+        blank=True,
+        null=True,
+        help_text='Token identifying the latest remote project sync',
+    )
+
+    #: Hashes of remote project sync data last sent to a target site
+    sync_hashes = JSONField(
+        default=dict,
+        help_text='Hashes of remote project sync data last sent to the site',
+    )
+
+    #: Version of synchronized data, increased on changes to the data
+    sync_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Version of synchronized data, increased on changes',
+    )
+
+    #: ETag of the latest remote project sync data received from the site
+    sync_etag = models.CharField(
+        max_length=255,
+        unique=False,
+        blank=True,
+        null=True,
+        help_text='ETag of the latest remote project sync data',
+    )
+
     class Meta:
         ordering = ['name']
         unique_together = ['url', 'mode', 'secret']
@@ -1059,7 +1610,7 @@ class SODARUser(AbstractUser):
             return group_name
 
 
-# User signals -----------------------------------------------------------------
+# Signals ----------------------------------------------------------------------
 
 
 def handle_ldap_login(sender, user, **kwargs):
@@ -1090,5 +1641,106 @@ def assign_user_group(sender, user, **kwargs):
     user.set_group()
 
 
+def invalidate_role_cache(sender, instance, **kwargs):
+    """Signal for invalidating RoleCache on role or project changes"""
+    RoleCache.invalidate()
+
+
+def start_role_cache_request(sender, **kwargs):
+    """Signal for starting a RoleCache scope for a request"""
+    RoleCache.start_request()
+
+
+def end_role_cache_request(sender, **kwargs):
+    """Signal for ending a RoleCache scope after a request"""
+    RoleCache.end_request()
+
+
+def check_user_sync_fields(sender, instance, **kwargs):
+    """
+    Signal for checking if a user update changes fields included in remote
+    sync data, comparing against the stored user if update_fields is not set
+    """
+    if (
+        settings.PROJECTROLES_SITE_MODE != SODAR_CONSTANTS['SITE_MODE_SOURCE']
+        or not instance.pk
+    ):
+        return
+
+    update_fields = kwargs.get('update_fields')
+    fields = [
+        f
+        for f in REMOTE_SYNC_USER_FIELDS
+        if not update_fields or f in update_fields
+    ]
+    old = (
+        sender.objects.filter(pk=instance.pk).values(*fields).first()
+        if fields
+        else None
+    )
+    instance._remote_sync_changed = old is None or any(
+        old[f] != getattr(instance, f) for f in fields
+    )
+
+
+def update_remote_sync_version(sender, instance, **kwargs):
+    """
+    Signal for increasing the sync data version of target sites on changes to
+    synchronized data
+    """
+    if settings.PROJECTROLES_SITE_MODE != SODAR_CONSTANTS['SITE_MODE_SOURCE']:
+        return
+
+    update_fields = kwargs.get('update_fields')
+
+    # Skip login timestamps and sync state updates
+    if update_fields and set(update_fields) <= set(REMOTE_SYNC_IGNORE_FIELDS):
+        return
+
+    # Skip new users and updates not changing synchronized user fields
+    if kwargs.get('signal') == post_save and (
+        sender._meta.label == AUTH_USER_MODEL
+        and (
+            kwargs.get('created')
+            or not getattr(instance, '_remote_sync_changed', True)
+        )
+    ):
+        return
+
+    # Skip M2M signals sent before the change
+    if kwargs.get('signal') == m2m_changed and kwargs.get('action') not in [
+        'post_add',
+        'post_remove',
+        'post_clear',
+    ]:
+        return
+
+    RemoteSite.objects.filter(mode=SODAR_CONSTANTS['SITE_MODE_TARGET']).update(
+        sync_version=F('sync_version') + 1
+    )
+
+
 user_logged_in.connect(handle_ldap_login)
 user_logged_in.connect(assign_user_group)
+
+post_save.connect(invalidate_role_cache, sender=Project)
+post_delete.connect(invalidate_role_cache, sender=Project)
+post_save.connect(invalidate_role_cache, sender=RoleAssignment)
+post_delete.connect(invalidate_role_cache, sender=RoleAssignment)
+request_started.connect(start_role_cache_request)
+request_finished.connect(end_role_cache_request)
+
+for model in [
+    Project,
+    RoleAssignment,
+    RemoteProject,
+    RemoteSite,
+    settings.AUTH_USER_MODEL,
+]:
+    post_save.connect(update_remote_sync_version, sender=model)
+    post_delete.connect(update_remote_sync_version, sender=model)
+
+pre_save.connect(check_user_sync_fields, sender=AUTH_USER_MODEL)
+m2m_changed.connect(
+    update_remote_sync_version, sender=AUTH_USER_MODEL + '_groups'
+)
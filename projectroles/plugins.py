@@ -1,6 +1,11 @@
 """Plugin point definitions and plugin API for apps based on projectroles"""
 
+import time
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from djangoplugins.models import Plugin
 from djangoplugins.point import PluginPoint
 
 
@@ -16,6 +21,9 @@ ENABLED = 0
 DISABLED = 1
 REMOVED = 2
 
+REGISTRY_VERSION_KEY = 'sodar_core.plugins.version'
+REGISTRY_TIMEOUT = 10  # Default interval for checking the version in seconds
+
 
 # Plugin points ----------------------------------------------------------------
 
@@ -160,6 +168,19 @@ class ProjectAppPluginPoint(PluginPoint):
         # TODO: Implement this in your app plugin
         return None
 
+    def get_object_links(self, model_str, uuids):
+        """
+        Return object links for multiple objects of the same model. By default,
+        calls get_object_link() for each object. Override this to retrieve the
+        objects in bulk.
+
+        :param model_str: Object class (string)
+        :param uuids: List of sodar_uuid values of the referred objects
+        :return: Dict of {sodar_uuid (string): dict or None}
+        """
+        # TODO: Implement this in your app plugin for bulk queries (optional)
+        return {str(u): self.get_object_link(model_str, u) for u in uuids}
+
     def get_extra_data_link(self, _extra_data, _name):
         """
         Return a link for the given timeline label that stars with ``"extra:"``.
@@ -199,6 +220,18 @@ class ProjectAppPluginPoint(PluginPoint):
         # TODO: Implement this in your app plugin
         return None
 
+    def update_site_cache(self, name=None, user=None):
+        """
+        Update cached data for this app not belonging to any project,
+        limitable to item ID. Called by synccache when updates are split per
+        project.
+
+        :param name: Item name to limit update to (string, optional)
+        :param user: User object to denote user triggering the update (optional)
+        """
+        # TODO: Implement this in your app plugin
+        return None
+
     def get_statistics(self):
         """
         Return app statistics as a dict. Should take the form of
@@ -222,6 +255,23 @@ class ProjectAppPluginPoint(PluginPoint):
         # TODO: Implement this in your app plugin (optional)
         return None
 
+    def get_project_list_values(self, column_id, projects, user):
+        """
+        Return values for the optional additional project list column for
+        multiple projects. By default, calls get_project_list_value() for each
+        project. Override this to retrieve the values in bulk.
+
+        :param column_id: ID of the column (string)
+        :param projects: List of Project objects
+        :param user: User object (current user)
+        :return: Dict of {project sodar_uuid (string): value}
+        """
+        # TODO: Implement this in your app plugin for bulk queries (optional)
+        return {
+            str(p.sodar_uuid): self.get_project_list_value(column_id, p, user)
+            for p in projects
+        }
+
 
 class BackendPluginPoint(PluginPoint):
     """Projectroles plugin point for registering backend apps"""
@@ -316,13 +366,131 @@ class SiteAppPluginPoint(PluginPoint):
 # Plugin API -------------------------------------------------------------------
 
 
+class PluginRegistry:
+    """
+    Registry of enabled plugins indexed by type and name. The registry is
+    built on first access with one query per plugin type and refreshed when
+    plugin objects are changed in the database, e.g. in change_plugin_status().
+    Changes made in other processes are detected with a version number stored
+    in the Django cache, which is checked at most once per
+    PROJECTROLES_PLUGIN_REGISTRY_TIMEOUT seconds.
+    """
+
+    #: Registry data, None if not built
+    data = None
+
+    @staticmethod
+    def _get_version():
+        """
+        Return the shared registry version from the Django cache.
+
+        :return: Integer
+        """
+        cache.add(REGISTRY_VERSION_KEY, 0, None)
+        return cache.get(REGISTRY_VERSION_KEY, 0)
+
+    @classmethod
+    def _build(cls):
+        """
+        Build registry data from enabled plugins in the database.
+
+        :return: Dict
+        """
+        points = {
+            'project_app': ProjectAppPluginPoint,
+            'backend': BackendPluginPoint,
+            'site_app': SiteAppPluginPoint,
+        }
+        data = {
+            'names': {},
+            'sorted': {},
+            'version': cls._get_version(),
+            'checked': time.monotonic(),
+        }
+
+        for plugin_type, point in points.items():
+            plugins = sorted(point.get_plugins() or [], key=lambda x: x.name)
+            data['names'][plugin_type] = {p.name: p for p in plugins}
+            data['sorted'][plugin_type] = plugins
+
+        data['ordered'] = sorted(
+            data['sorted']['project_app'], key=lambda x: x.plugin_ordering
+        )
+        return data
+
+    @classmethod
+    def _get_data(cls):
+        """
+        Return registry data, building it if not available.
+
+        :return: Dict
+        """
+        data = cls.data
+        timeout = getattr(
+            settings, 'PROJECTROLES_PLUGIN_REGISTRY_TIMEOUT', REGISTRY_TIMEOUT
+        )
+
+        # Rebuild if plugins have been changed in another process
+        if data and time.monotonic() - data['checked'] >= timeout:
+            if cls._get_version() != data['version']:
+                data = None
+
+            else:
+                data['checked'] = time.monotonic()
+
+        if data is None:
+            data = cls._build()
+
+            # Do not store an empty registry, e.g. before plugins are synced
+            if any(data['sorted'].values()):
+                cls.data = data
+
+        return data
+
+    @classmethod
+    def get_plugins(cls, plugin_type, custom_order=False):
+        """
+        Return enabled plugins of a specific type.
+
+        :param plugin_type: "project_app", "site_app" or "backend" (string)
+        :param custom_order: Order by plugin_ordering for project apps (boolean)
+        :return: List
+        """
+        if custom_order and plugin_type == 'project_app':
+            return list(cls._get_data()['ordered'])
+
+        return list(cls._get_data()['sorted'][plugin_type])
+
+    @classmethod
+    def get_plugin(cls, name, plugin_type):
+        """
+        Return enabled plugin of a specific type by name.
+
+        :param name: Plugin name (string)
+        :param plugin_type: "project_app", "site_app" or "backend" (string)
+        :return: Plugin object or None if not found
+        """
+        return cls._get_data()['names'][plugin_type].get(name)
+
+    @classmethod
+    def refresh(cls):
+        """Refresh the registry on next access in all processes"""
+        cls.data = None
+
+        try:
+            cache.incr(REGISTRY_VERSION_KEY)
+
+        except ValueError:
+            cache.set(REGISTRY_VERSION_KEY, 1, None)
+
+
 def get_active_plugins(plugin_type='project_app', custom_order=False):
     """
     Return active plugins of a specific type.
 
     :param plugin_type: "project_app", "site_app" or "backend" (string)
     :param custom_order: Order by plugin_ordering for project apps (boolean)
-    :return: List or None
+    :return: List
     :raise: ValueError if plugin_type is not recognized
     """
     if plugin_type not in PLUGIN_TYPES.keys():
@@ -332,27 +500,14 @@ def get_active_plugins(plugin_type='project_app', custom_order=False):
             )
         )
 
-    plugins = eval(PLUGIN_TYPES[plugin_type]).get_plugins()
-
-    if plugins:
-        return sorted(
-            [
-                p
-                for p in plugins
-                if (
-                    p.is_active()
-                    and (
-                        plugin_type in ['project_app', 'site_app']
-                        or p.name in settings.ENABLED_BACKEND_PLUGINS
-                    )
-                )
-            ],
-            key=lambda x: x.plugin_ordering
-            if custom_order and plugin_type == 'project_app'
-            else x.name,
-        )
+    plugins = PluginRegistry.get_plugins(plugin_type, custom_order)
 
-    return None
+    if plugin_type == 'backend':
+        return [
+            p for p in plugins if p.name in settings.ENABLED_BACKEND_PLUGINS
+        ]
+
+    return plugins
 
 
 def change_plugin_status(name, status, plugin_type='app'):
@@ -396,11 +551,11 @@ def get_app_plugin(plugin_name):
     :param plugin_name: Plugin name (string)
     :return: ProjectAppPlugin object or None if not found
     """
-    for k, v in PLUGIN_TYPES.items():
-        try:
-            return eval(v).get_plugin(plugin_name)
-        except Exception:
-            pass  # TODO refactor
+    for plugin_type in PLUGIN_TYPES.keys():
+        plugin = PluginRegistry.get_plugin(plugin_name, plugin_type)
+
+        if plugin:
+            return plugin
 
 
 def get_backend_api(plugin_name, force=False, **kwargs):
@@ -423,6 +578,18 @@ def get_backend_api(plugin_name, force=False, **kwargs):
         return plugin.get_api(**kwargs) if plugin.is_active() else None
 
 
+# Signals ----------------------------------------------------------------------
+
+
+def refresh_plugin_registry(sender, instance, **kwargs):
+    """Signal for refreshing PluginRegistry on plugin changes"""
+    PluginRegistry.refresh()
+
+
+post_save.connect(refresh_plugin_registry, sender=Plugin)
+post_delete.connect(refresh_plugin_registry, sender=Plugin)
+
+
 # Plugins within projectroles --------------------------------------------------
 
 
@@ -1,17 +1,34 @@
 """Remote project management utilities for the projectroles app"""
 
+import gzip
+import hashlib
+import io
+import json
 import logging
+import urllib.error
+import urllib.request
+import uuid
+import zlib
+
+from collections import defaultdict
+from copy import deepcopy
+from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
 
 from projectroles.models import (
     Project,
     Role,
     RoleAssignment,
+    RoleCache,
     RemoteProject,
     RemoteSite,
     SODAR_CONSTANTS,
@@ -45,6 +62,12 @@ REMOTE_LEVEL_VIEW_AVAIL = SODAR_CONSTANTS['REMOTE_LEVEL_VIEW_AVAIL']
 REMOTE_LEVEL_READ_INFO = SODAR_CONSTANTS['REMOTE_LEVEL_READ_INFO']
 REMOTE_LEVEL_READ_ROLES = SODAR_CONSTANTS['REMOTE_LEVEL_READ_ROLES']
 
+# Local constants
+SYNC_DATA_KEYS = ['users', 'projects', 'peer_sites']
+SYNC_CHUNK_SIZE = 64 * 1024  # Chunk size for streaming sync data in bytes
+SYNC_CACHE_KEY_PREFIX = 'sodar_core.remote_sync'
+SYNC_CACHE_TIMEOUT = 300  # Default timeout for cached sync data in seconds
+
 
 class RemoteProjectAPI:
     """Remote project data handling API"""
@@ -68,6 +91,12 @@ class RemoteProjectAPI:
         #: Updated parent projects in current sync operation
         self.updated_parents = []
 
+        #: Roles by name for the current sync operation
+        self.roles = {}
+
+        #: Users by username for the current sync operation
+        self.users = {}
+
     # Internal functions -------------------------------------------------------
 
     @staticmethod
@@ -79,6 +108,118 @@ class RemoteProjectAPI:
         obj.save()
         return obj
 
+    @staticmethod
+    def _get_data_hash(data):
+        """
+        Return hash of a sync data entry.
+
+        :param data: Dict
+        :return: String
+        """
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    @staticmethod
+    def _get_parent_uuids(projects, p_uuid):
+        """
+        Return UUIDs of parent categories for a project in sync data.
+
+        :param projects: Dict of project sync data
+        :param p_uuid: Project UUID (string)
+        :return: List of UUIDs (string)
+        """
+        ret = []
+        parent_uuid = projects[p_uuid].get('parent_uuid')
+
+        while parent_uuid and parent_uuid in projects:
+            ret.append(parent_uuid)
+            parent_uuid = projects[parent_uuid].get('parent_uuid')
+
+        return ret
+
+    @staticmethod
+    def _get_project_parent_uuid(project):
+        """
+        Return parent UUID of a project from the project tree index.
+
+        :param project: Project object
+        :return: String or None
+        """
+        path = project.get_path_uuids()
+        return path[-2] if len(path) > 1 else None
+
+    @staticmethod
+    def _get_target_objects(remote_projects):
+        """
+        Retrieve objects required for building target site sync data in bulk.
+
+        :param remote_projects: List of RemoteProject objects for target site
+        :return: Projects and categories (dicts with UUID keys), peer sites
+                 (dict with project UUID keys), project roles and category
+                 owners (dicts with project pk keys)
+        """
+        projects = {
+            str(p.sodar_uuid): p
+            for p in Project.objects.filter(
+                sodar_uuid__in=[rp.project_uuid for rp in remote_projects]
+            )
+        }
+
+        # Parent categories from the project tree index
+        category_uuids = set()
+
+        for project in projects.values():
+            category_uuids.update(project.get_path_uuids()[:-1])
+
+        categories = {
+            str(c.sodar_uuid): c
+            for c in Project.objects.filter(sodar_uuid__in=category_uuids)
+        }
+
+        # All RemoteSites which host the projects with a sufficient access
+        # level, including the current target site
+        peer_relations = defaultdict(list)
+
+        for relation in RemoteProject.objects.filter(
+            project_uuid__in=[rp.project_uuid for rp in remote_projects],
+            level__in=[REMOTE_LEVEL_READ_INFO, REMOTE_LEVEL_READ_ROLES],
+        ).select_related('site'):
+            peer_relations[str(relation.project_uuid)].append(relation.site)
+
+        # Project roles for READ_ROLES and REVOKED projects, category owners
+        role_project_pks = [
+            projects[str(rp.project_uuid)].pk
+            for rp in remote_projects
+            if rp.level in [REMOTE_LEVEL_READ_ROLES, REMOTE_LEVEL_REVOKED]
+            and str(rp.project_uuid) in projects
+        ]
+        category_pks = [c.pk for c in categories.values()]
+        project_roles = defaultdict(list)
+        category_owners = {}
+
+        for role_as in (
+            RoleAssignment.objects.filter(
+                Q(project__pk__in=role_project_pks)
+                | Q(project__pk__in=category_pks, role__name=PROJECT_ROLE_OWNER)
+            )
+            .select_related('user', 'role')
+            .prefetch_related('user__groups')
+        ):
+            if role_as.project_id in category_pks:
+                category_owners[role_as.project_id] = role_as
+
+            else:
+                project_roles[role_as.project_id].append(role_as)
+
+        return (
+            projects,
+            categories,
+            peer_relations,
+            project_roles,
+            category_owners,
+        )
+
     def _check_local_conflicts(self, c_uuid):
         """
         Check for local category name conflicts on a target site.
@@ -329,24 +470,109 @@ class RemoteProjectAPI:
         else:
             logger.debug('Nothing to update for peer site "{}"'.format(uuid))
 
+    def _add_role_events(self, project, role_events):
+        """
+        Add timeline events for role changes in a project in bulk.
+
+        :param project: Project object
+        :param role_events: List of tuples (event_name, description, user)
+        """
+        self.timeline.add_events(
+            [
+                {
+                    'project': project,
+                    'app_name': APP_NAME,
+                    'user': self.tl_user,
+                    'event_name': event_name,
+                    'description': tl_desc,
+                    'status_type': 'OK',
+                    'objects': [
+                        {
+                            'obj': role_user,
+                            'label': 'user',
+                            'name': role_user.username,
+                        },
+                        {
+                            'obj': self.source_site,
+                            'label': 'site',
+                            'name': self.source_site.name,
+                        },
+                    ],
+                }
+                for event_name, tl_desc, role_user in role_events
+            ]
+        )
+
+    @classmethod
+    def _validate_roles(cls, assignments):
+        """
+        Validate role assignments of a project after an update in memory,
+        ensuring each user has one role and the project has one owner.
+
+        :param assignments: List of RoleAssignment objects
+        :raise: ValidationError if validation fails
+        """
+        pairs = set()
+        owner_as = None
+
+        for a in assignments:
+            if (a.project.pk, a.user.pk) in pairs:
+                raise ValidationError(
+                    'Role {} already set for {} in {}'.format(
+                        a.role, a.user, a.project
+                    )
+                )
+
+            pairs.add((a.project.pk, a.user.pk))
+
+            if a.role.name == PROJECT_ROLE_OWNER:
+                if owner_as:
+                    raise ValidationError(
+                        'User {} already set as owner of {}'.format(
+                            owner_as.user, a.project
+                        )
+                    )
+
+                owner_as = a
+
     def _update_roles(self, project, p_data):
-        """Create or update project roles"""
-        # TODO: Refactor this
+        """
+        Create or update project roles. Existing assignments are retrieved
+        with a single query and changes are written in bulk.
+
+        :param project: Project object
+        :param p_data: Project data from the source site (dict)
+        """
         uuid = str(project.sodar_uuid)
         allow_local = getattr(settings, 'PROJECTROLES_ALLOW_LOCAL_USERS', False)
+        existing = {
+            a.user.pk: a
+            for a in RoleAssignment.objects.filter(
+                project=project
+            ).select_related('user', 'role')
+        }
+        owner_as = next(
+            (a for a in existing.values() if a.role.name == PROJECT_ROLE_OWNER),
+            None,
+        )
+        created = []
+        updated = defaultdict(list)
+        deleted = []
+        role_events = []
 
         for r_uuid, r in {k: v for k, v in p_data['roles'].items()}.items():
             # Ensure the Role exists
-            try:
-                role = Role.objects.get(name=r['role'])
+            role = self.roles.get(r['role'])
 
-            except Role.DoesNotExist:
+            if not role:
                 error_msg = 'Role object "{}" not found (assignment {})'.format(
                     r['role'], r_uuid
                 )
                 self._handle_user_error(error_msg, project, r_uuid)
                 continue
 
+            user = self.users.get(r['user'])
+
             # Ensure the user is valid
             if (
                 '@' not in r['user']
@@ -365,7 +591,7 @@ class RemoteProjectAPI:
                 '@' not in r['user']
                 and allow_local
                 and r['role'] != PROJECT_ROLE_OWNER
-                and not User.objects.filter(username=r['user']).first()
+                and not user
             ):
                 error_msg = (
                     'Local user "{}" not found, role of "{}" will '
@@ -378,10 +604,7 @@ class RemoteProjectAPI:
             # users are not allowed
             if (
                 r['role'] == PROJECT_ROLE_OWNER
-                and (
-                    not allow_local
-                    or not User.objects.filter(username=r['user']).first()
-                )
+                and (not allow_local or not user)
                 and '@' not in r['user']
             ):
                 role_user = self.default_owner
@@ -401,51 +624,53 @@ class RemoteProjectAPI:
                 ] = status_msg
                 logger.info(status_msg)
 
+            elif not user:
+                error_msg = (
+                    'User "{}" not found, role of "{}" will '
+                    'not be assigned'.format(r['user'], r['role'])
+                )
+                self._handle_user_error(error_msg, project, r_uuid)
+                continue
+
             else:
-                role_user = User.objects.get(username=r['user'])
+                role_user = user
 
             # Update RoleAssignment if it exists and is changed
-            old_as = RoleAssignment.objects.filter(
-                project=project, user=role_user
-            ).first()
+            old_as = existing.get(role_user.pk)
 
             # Delete existing owner role
-            if r['role'] == PROJECT_ROLE_OWNER:
-                old_owner_as = project.get_owner()
+            if (
+                r['role'] == PROJECT_ROLE_OWNER
+                and owner_as
+                and owner_as.user != role_user
+            ):
+                # Owner may have been created earlier in the same batch
+                if owner_as.pk:
+                    deleted.append(owner_as.pk)
 
-                if old_owner_as and old_owner_as.user != role_user:
-                    old_owner_as.delete()
-                    logger.debug(
-                        'Deleted existing owner role from '
-                        'user "{}"'.format(old_owner_as.user.username)
-                    )
+                else:
+                    created.remove(owner_as)
+
+                existing.pop(owner_as.user.pk)
+                logger.debug(
+                    'Deleted existing owner role from '
+                    'user "{}"'.format(owner_as.user.username)
+                )
 
             if old_as and old_as.role != role:
                 old_as.role = role
-                old_as.user = role_user
-                old_as.save()
-                self.remote_data['projects'][str(project.sodar_uuid)]['roles'][
-                    r_uuid
-                ]['status'] = 'updated'
-
-                if self.tl_user:  # Taskflow
-                    tl_desc = (
+                updated[role].append(old_as.pk)
+                self.remote_data['projects'][uuid]['roles'][r_uuid][
+                    'status'
+                ] = 'updated'
+                role_events.append(
+                    (
+                        'remote_role_update',
                         'update role to "{}" for {{{}}} from site '
-                        '{{{}}}'.format(role.name, 'user', 'site')
-                    )
-                    tl_event = self.timeline.add_event(
-                        project=project,
-                        app_name=APP_NAME,
-                        user=self.tl_user,
-                        event_name='remote_role_update',
-                        description=tl_desc,
-                        status_type='OK',
+                        '{{{}}}'.format(role.name, 'user', 'site'),
+                        role_user,
                     )
-                    tl_event.add_object(role_user, 'user', role_user.username)
-                    tl_event.add_object(
-                        self.source_site, 'site', self.source_site.name
-                    )
-
+                )
                 logger.info(
                     'Updated role {}: {} = {}'.format(
                         r_uuid, role_user.username, role.name
@@ -454,42 +679,53 @@ class RemoteProjectAPI:
 
             # Create a new RoleAssignment
             elif not old_as:
-                role_values = {
-                    'sodar_uuid': r_uuid,
-                    'project': project,
-                    'role': role,
-                    'user': role_user,
-                }
-                RoleAssignment.objects.create(**role_values)
-
-                self.remote_data['projects'][str(project.sodar_uuid)]['roles'][
-                    r_uuid
-                ]['status'] = 'created'
-
-                if self.tl_user:  # Taskflow
-                    tl_desc = (
+                old_as = RoleAssignment(
+                    sodar_uuid=r_uuid,
+                    project=project,
+                    role=role,
+                    user=role_user,
+                )
+                existing[role_user.pk] = old_as
+                created.append(old_as)
+                self.remote_data['projects'][uuid]['roles'][r_uuid][
+                    'status'
+                ] = 'created'
+                role_events.append(
+                    (
+                        'remote_role_create',
                         'add role "{}" for {{{}}} '
-                        'from site {{{}}}'.format(role.name, 'user', 'site')
+                        'from site {{{}}}'.format(role.name, 'user', 'site'),
+                        role_user,
                     )
-                    tl_event = self.timeline.add_event(
-                        project=project,
-                        app_name=APP_NAME,
-                        user=self.tl_user,
-                        event_name='remote_role_create',
-                        description=tl_desc,
-                        status_type='OK',
-                    )
-                    tl_event.add_object(role_user, 'user', role_user.username)
-                    tl_event.add_object(
-                        self.source_site, 'site', self.source_site.name
-                    )
-
+                )
                 logger.info(
                     'Created role {}: {} -> {}'.format(
                         r_uuid, role_user.username, role.name
                     )
                 )
 
+            if r['role'] == PROJECT_ROLE_OWNER:
+                owner_as = old_as
+
+        # Bulk operations do not call save(), so validate the result here
+        self._validate_roles(list(existing.values()))
+
+        # Write changes in bulk
+        if deleted:
+            RoleAssignment.objects.filter(pk__in=deleted).delete()
+
+        for role, pks in updated.items():
+            RoleAssignment.objects.filter(pk__in=pks).update(role=role)
+
+        if created:
+            RoleAssignment.objects.bulk_create(created)
+
+        if updated or created:  # Signals are not sent for bulk operations
+            RoleCache.invalidate()
+
+        if self.tl_user and role_events:  # Taskflow
+            self._add_role_events(project, role_events)
+
     def _remove_deleted_roles(self, project, p_data):
         """Remove roles for project deleted in source site"""
         timeline = get_backend_api('timeline_backend')
@@ -715,21 +951,68 @@ class RemoteProjectAPI:
                 )
             )
 
-    # API functions ------------------------------------------------------------
+    @staticmethod
+    def get_target_cache_key(remote_projects):
+        """
+        Return cache key for sync data shared by target sites with the same
+        remote projects and access levels.
 
-    def get_target_data(self, target_site):
+        :param remote_projects: List of RemoteProject objects for target site
+        :return: String
         """
-        Get user and project data to be synchronized into a target site.
+        return '{}.data.{}'.format(
+            SYNC_CACHE_KEY_PREFIX,
+            hashlib.sha256(
+                json.dumps(
+                    sorted(
+                        [str(rp.project_uuid), rp.level]
+                        for rp in remote_projects
+                    )
+                ).encode('utf-8')
+            ).hexdigest(),
+        )
 
+    @staticmethod
+    def _exclude_target_site(sync_data, target_site):
+        """
+        Exclude a target site from the peer sites of its sync data.
+
+        :param sync_data: Dict
         :param target_site: RemoteSite object for the target site
         :return: Dict
         """
+        site_uuid = str(target_site.sodar_uuid)
+        sync_data['peer_sites'].pop(site_uuid, None)
+
+        for p_data in sync_data['projects'].values():
+            if site_uuid in p_data.get('remote_sites', []):
+                p_data['remote_sites'].remove(site_uuid)
+
+        return sync_data
+
+    def _build_target_data(self, remote_projects):
+        """
+        Build user and project data for the remote projects of a target site.
+        The related objects are retrieved in bulk, so the number of database
+        queries does not depend on the number of synchronized projects. Peer
+        sites include the target site itself.
+
+        :param remote_projects: List of RemoteProject objects for target site
+        :return: Dict
+        """
         sync_data = {'users': {}, 'projects': {}, 'peer_sites': {}}
+        usernames = set()
+        (
+            projects,
+            categories,
+            peer_relations,
+            project_roles,
+            category_owners,
+        ) = self._get_target_objects(remote_projects)
 
         def _add_user(user):
-            if user.username not in [
-                u['username'] for u in sync_data['users'].values()
-            ]:
+            if user.username not in usernames:
+                usernames.add(user.username)
                 sync_data['users'][str(user.sodar_uuid)] = {
                     'username': user.username,
                     'name': user.name,
@@ -739,70 +1022,48 @@ class RemoteProjectAPI:
                     'groups': [g.name for g in user.groups.all()],
                 }
 
-        def _add_parent_categories(category, project_level):
-            if category.parent:
-                _add_parent_categories(category.parent, project_level)
+        def _add_role(p_data, role_as):
+            p_data['roles'][str(role_as.sodar_uuid)] = {
+                'user': role_as.user.username,
+                'role': role_as.role.name,
+            }
+            _add_user(role_as.user)
+
+        def _add_parent_categories(project, project_level):
+            for c_uuid in project.get_path_uuids()[:-1]:
+                category = categories[c_uuid]
+
+                # Add if not added yet OR if a READ_ROLES project is encountered
+                if c_uuid in sync_data['projects'] and (
+                    sync_data['projects'][c_uuid]['level']
+                    == REMOTE_LEVEL_READ_ROLES
+                    or project_level != REMOTE_LEVEL_READ_ROLES
+                ):
+                    continue
 
-            # Add if not added yet OR if a READ_ROLES project is encountered
-            if (
-                str(category.sodar_uuid) not in sync_data['projects'].keys()
-                or sync_data['projects'][str(category.sodar_uuid)]['level']
-                != REMOTE_LEVEL_READ_ROLES
-                and sync_data[project_level] == REMOTE_LEVEL_READ_ROLES
-            ):
                 cat_data = {
                     'title': category.title,
                     'type': PROJECT_TYPE_CATEGORY,
-                    'parent_uuid': str(category.parent.sodar_uuid)
-                    if category.parent
-                    else None,
+                    'parent_uuid': self._get_project_parent_uuid(category),
                     'description': category.description,
                     'readme': category.readme.raw,
                 }
 
                 if project_level == REMOTE_LEVEL_READ_ROLES:
                     cat_data['level'] = REMOTE_LEVEL_READ_ROLES
-                    role_as = category.get_owner()
                     cat_data['roles'] = {}
-                    cat_data['roles'][str(role_as.sodar_uuid)] = {
-                        'user': role_as.user.username,
-                        'role': role_as.role.name,
-                    }
-                    _add_user(role_as.user)
+
+                    if category.pk in category_owners:
+                        _add_role(cat_data, category_owners[category.pk])
 
                 else:
                     cat_data['level'] = REMOTE_LEVEL_READ_INFO
 
-                sync_data['projects'][str(category.sodar_uuid)] = cat_data
-
-        def _add_peer_site(site):
-            # Do not add sites twice
-            if not sync_data['peer_sites'].get(str(site.sodar_uuid), None):
-                sync_data['peer_sites'][str(site.sodar_uuid)] = {
-                    'name': site.name,
-                    'url': site.url,
-                    'description': site.description,
-                    'user_display': site.user_display,
-                }
-
-        for rp in target_site.projects.all():
-            project = rp.get_project()
+                sync_data['projects'][c_uuid] = cat_data
 
-            # All RemoteSites which also host this project with a sufficient
-            # access level
-            remote_sites = [
-                relation.site
-                for relation in RemoteProject.objects.filter(
-                    project_uuid=project.sodar_uuid
-                )
-                if relation.level
-                in [REMOTE_LEVEL_READ_INFO, REMOTE_LEVEL_READ_ROLES]
-                and relation.site != target_site  # Dont add current target site
-            ]
-
-            # RemoteSite data to create objects on target site
-            for site in remote_sites:
-                _add_peer_site(site)
+        for rp in remote_projects:
+            project = projects.get(str(rp.project_uuid))
+            remote_sites = peer_relations[str(rp.project_uuid)]
 
             project_data = {
                 'level': rp.level,
@@ -825,31 +1086,324 @@ class RemoteProjectAPI:
                 project_data['readme'] = project.readme.raw
 
                 # Add categories
-                if project.parent:
-                    _add_parent_categories(project.parent, rp.level)
-                    project_data['parent_uuid'] = str(project.parent.sodar_uuid)
+                parent_uuid = self._get_project_parent_uuid(project)
+
+                if parent_uuid:
+                    _add_parent_categories(project, rp.level)
+                    project_data['parent_uuid'] = parent_uuid
 
             # If level is READ_ROLES or REVOKED, add roles
             if rp.level in [REMOTE_LEVEL_READ_ROLES, REMOTE_LEVEL_REVOKED]:
                 project_data['roles'] = {}
 
-                for role_as in project.roles.all():
+                for role_as in project_roles[project.pk]:
                     # If REVOKED, only sync owner and delegate
                     if (
                         rp.level == REMOTE_LEVEL_READ_ROLES
                         or role_as.role.name
-                        in ['project owner', 'project delegate']
+                        in [PROJECT_ROLE_OWNER, PROJECT_ROLE_DELEGATE]
                     ):
-                        project_data['roles'][str(role_as.sodar_uuid)] = {
-                            'user': role_as.user.username,
-                            'role': role_as.role.name,
-                        }
-                        _add_user(role_as.user)
+                        _add_role(project_data, role_as)
 
             sync_data['projects'][str(rp.project_uuid)] = project_data
 
+        # RemoteSite data to create objects on target site
+        for sites in peer_relations.values():
+            for site in sites:
+                sync_data['peer_sites'][str(site.sodar_uuid)] = {
+                    'name': site.name,
+                    'url': site.url,
+                    'description': site.description,
+                    'user_display': site.user_display,
+                }
+
+        return sync_data
+
+    # API functions ------------------------------------------------------------
+
+    def get_target_data(self, target_site):
+        """
+        Get user and project data to be synchronized into a target site. Data
+        is shared between target sites with the same remote projects and access
+        levels. It is cached until synchronized data changes or the cache
+        timeout is reached.
+
+        :param target_site: RemoteSite object for the target site
+        :return: Dict
+        """
+        remote_projects = list(target_site.projects.all())
+        cache_key = self.get_target_cache_key(remote_projects)
+        cache_timeout = getattr(
+            settings,
+            'PROJECTROLES_REMOTE_SYNC_CACHE_TIMEOUT',
+            SYNC_CACHE_TIMEOUT,
+        )
+        versions = dict(
+            RemoteSite.objects.filter(mode=SITE_MODE_TARGET).values_list(
+                'pk', 'sync_version'
+            )
+        )
+        cached = cache.get(cache_key) if cache_timeout else None
+
+        if (
+            cached
+            and target_site.pk in versions
+            and cached['versions'].get(target_site.pk)
+            == versions[target_site.pk]
+        ):
+            logger.debug(
+                'Using cached sync data for target site "{}"'.format(
+                    target_site.name
+                )
+            )
+            sync_data = deepcopy(cached['data'])
+
+        else:
+            sync_data = self._build_target_data(remote_projects)
+
+            if cache_timeout:
+                cache.set(
+                    cache_key,
+                    {'data': deepcopy(sync_data), 'versions': versions},
+                    cache_timeout,
+                )
+
+        return self._exclude_target_site(sync_data, target_site)
+
+    @staticmethod
+    def check_sync_rate(target_site):
+        """
+        Check if a target site is allowed to retrieve sync data, based on the
+        minimum interval set in PROJECTROLES_REMOTE_SYNC_INTERVAL. The limit
+        only applies across processes if the Django cache is shared.
+
+        :param target_site: RemoteSite object for the target site
+        :return: Boolean
+        """
+        interval = getattr(settings, 'PROJECTROLES_REMOTE_SYNC_INTERVAL', 0)
+
+        if not interval:
+            return True
+
+        return cache.add(
+            '{}.rate.{}'.format(SYNC_CACHE_KEY_PREFIX, target_site.pk),
+            True,
+            interval,
+        )
+
+    @staticmethod
+    def get_sync_metrics(target_site):
+        """
+        Return metrics of the latest sync data retrieval by a target site.
+
+        :param target_site: RemoteSite object for the target site
+        :return: Dict or None
+        """
+        return cache.get(
+            '{}.metrics.{}'.format(SYNC_CACHE_KEY_PREFIX, target_site.pk)
+        )
+
+    @staticmethod
+    def set_sync_metrics(target_site, duration, size, delta=False):
+        """
+        Store and log metrics of a sync data retrieval by a target site.
+
+        :param target_site: RemoteSite object for the target site
+        :param duration: Time taken to build and send data in seconds (float)
+        :param size: Size of sent data in bytes (int)
+        :param delta: Whether only changes were sent (bool)
+        """
+        cache.set(
+            '{}.metrics.{}'.format(SYNC_CACHE_KEY_PREFIX, target_site.pk),
+            {
+                'date': timezone.now(),
+                'time': duration,
+                'size': size,
+                'delta': delta,
+            },
+            None,
+        )
+        logger.info(
+            'Sent sync data to target site "{}": {} bytes in {:.2f} s'.format(
+                target_site.name, size, duration
+            )
+        )
+
+    def get_sync_data(self, target_site, sync_token=None):
+        """
+        Get data to be synchronized into a target site. If sync_token matches
+        the latest sync with the target site, only return data changed since
+        then along with UUIDs of removed entries under "deleted". Otherwise
+        return full data from get_target_data().
+
+        Projects are returned with their full role lists and parent
+        categories, so removed roles are detected on the target as in a full
+        sync. The state of the returned data is saved for the target site.
+
+        :param target_site: RemoteSite object for the target site
+        :param sync_token: Token of the latest sync on the target (string or
+                           None)
+        :return: Dict
+        """
+        sync_data = self.get_target_data(target_site)
+        hashes = {
+            k: {u: self._get_data_hash(v) for u, v in sync_data[k].items()}
+            for k in SYNC_DATA_KEYS
+        }
+        delta = bool(sync_token) and sync_token == target_site.sync_token
+
+        if delta:
+            old_hashes = target_site.sync_hashes
+            changed = {
+                k: {
+                    u
+                    for u, h in hashes[k].items()
+                    if old_hashes.get(k, {}).get(u) != h
+                }
+                for k in SYNC_DATA_KEYS
+            }
+            deleted = {
+                k: sorted(set(old_hashes.get(k, {})) - set(hashes[k]))
+                for k in SYNC_DATA_KEYS
+            }
+            projects = sync_data['projects']
+            p_uuids = set()
+
+            # Include projects with their parents if any of them changed
+            for p_uuid, p_data in projects.items():
+                if p_data['type'] != PROJECT_TYPE_PROJECT:
+                    continue
+
+                path = [p_uuid] + self._get_parent_uuids(projects, p_uuid)
+
+                if changed['projects'].intersection(path):
+                    p_uuids.update(path)
+
+            changed['projects'] = p_uuids
+            sync_data = {
+                k: {u: v for u, v in sync_data[k].items() if u in changed[k]}
+                for k in SYNC_DATA_KEYS
+            }
+            sync_data['deleted'] = deleted
+
+        target_site.sync_token = str(uuid.uuid4())
+        target_site.sync_hashes = hashes
+        target_site.save(update_fields=['sync_token', 'sync_hashes'])
+        sync_data['sync_token'] = target_site.sync_token
+        sync_data['sync_delta'] = delta
         return sync_data
 
+    def get_remote_data(self, site, full=False):
+        """
+        Retrieve sync data from a source site. Only request data changed since
+        the latest sync if a sync token for the site is available.
+
+        :param site: RemoteSite object for the source site
+        :param full: Request full data regardless of sync token (bool)
+        :return: Dict or None if data has not changed since the latest sync
+        :raise: Exception if data retrieval fails
+        """
+        from projectroles.views_api import (
+            CORE_API_MEDIA_TYPE,
+            CORE_API_DEFAULT_VERSION,
+        )
+
+        api_url = site.get_url() + reverse(
+            'projectroles:api_remote_get', kwargs={'secret': site.secret}
+        )
+        delta = site.sync_token and not full
+
+        if delta:
+            api_url += '?' + urlencode({'since': site.sync_token})
+
+        api_req = urllib.request.Request(api_url)
+        api_req.add_header(
+            'accept',
+            '{}; version={}'.format(
+                CORE_API_MEDIA_TYPE, CORE_API_DEFAULT_VERSION
+            ),
+        )
+        api_req.add_header('accept-encoding', 'gzip')
+
+        if delta and site.sync_etag:
+            api_req.add_header('if-none-match', site.sync_etag)
+
+        try:
+            response = urllib.request.urlopen(api_req)
+
+        except urllib.error.HTTPError as ex:
+            if ex.code == 304:
+                return None
+
+            raise ex
+
+        etag = response.headers.get('etag')
+
+        # Decompress while reading, json.load() still reads the whole
+        # decompressed payload into memory before parsing it
+        if response.headers.get('content-encoding') == 'gzip':
+            response = gzip.GzipFile(fileobj=response)
+
+        remote_data = json.load(io.TextIOWrapper(response, encoding='utf-8'))
+        remote_data['sync_etag'] = etag
+        return remote_data
+
+    @staticmethod
+    def get_sync_etag(target_site):
+        """
+        Return ETag for the sync data of a target site, based on the latest
+        sync token and the sync data version.
+
+        :param target_site: RemoteSite object for the target site
+        :return: String or None if the site has not been synchronized
+        """
+        if not target_site.sync_token:
+            return None
+
+        return '"{}-{}"'.format(
+            target_site.sync_token, target_site.sync_version
+        )
+
+    @staticmethod
+    def stream_sync_data(sync_data, compress=False):
+        """
+        Encode sync data into JSON in chunks for a streaming response. The
+        sync data dict is built in full beforehand, streaming only avoids
+        rendering the complete JSON response in memory.
+
+        :param sync_data: Dict
+        :param compress: Compress data with gzip (bool)
+        :return: Generator yielding bytes
+        """
+        compressor = (
+            zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+        )
+        buf = []
+        buf_size = 0
+
+        for s in json.JSONEncoder().iterencode(sync_data):
+            buf.append(s)
+            buf_size += len(s)
+
+            if buf_size >= SYNC_CHUNK_SIZE:
+                chunk = ''.join(buf).encode('utf-8')
+                buf = []
+                buf_size = 0
+
+                if compressor:
+                    chunk = compressor.compress(chunk)
+
+                if chunk:
+                    yield chunk
+
+        chunk = ''.join(buf).encode('utf-8')
+
+        if compressor:
+            chunk = compressor.compress(chunk) + compressor.flush()
+
+        if chunk:
+            yield chunk
+
     @transaction.atomic
     def sync_source_data(self, site, remote_data, request=None):
         """
@@ -900,6 +1454,26 @@ class RemoteProjectAPI:
 
         logger.info('Synchronizing data from "{}"..'.format(site.name))
 
+        # Store sync token, rolled back along with the sync in case of failure
+        if remote_data.get('sync_token'):
+            site.sync_token = remote_data['sync_token']
+            site.sync_etag = remote_data.get('sync_etag')
+            site.save(update_fields=['sync_token', 'sync_etag'])
+
+        if remote_data.get('sync_delta'):
+            logger.info('Synchronizing changes since the previous sync')
+            RemoteProject.objects.filter(site=site).update(
+                date_access=timezone.now()
+            )
+
+            for k, v in remote_data.get('deleted', {}).items():
+                if v:
+                    logger.info(
+                        'Removed from source data: {} {}'.format(
+                            len(v), k.replace('_', ' ')
+                        )
+                    )
+
         # Return unchanged data if no projects with READ_ROLES are included
         if not {
             k: v
@@ -952,6 +1526,19 @@ class RemoteProjectAPI:
 
         logger.info('User sync OK')
 
+        # Retrieve roles and users for role updates
+        self.roles = {r.name: r for r in Role.objects.all()}
+        self.users = {
+            u.username: u
+            for u in User.objects.filter(
+                username__in=set(
+                    r['user']
+                    for p in self.remote_data['projects'].values()
+                    for r in p.get('roles', {}).values()
+                )
+            )
+        }
+
         ##########################
         # Categories and Projects
         ##########################
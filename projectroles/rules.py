@@ -2,7 +2,7 @@ import rules
 
 from django.conf import settings
 
-from projectroles.models import RoleAssignment, SODAR_CONSTANTS
+from projectroles.models import RoleAssignment, RoleCache, SODAR_CONSTANTS
 
 
 # SODAR constants
@@ -24,13 +24,13 @@ def is_project_owner(user, obj):
     Whether or not the user has the role of project owner, or is the owner of
     a parent category of the current project.
     """
-    return obj.is_owner(user) if obj else False
+    return RoleCache.is_owner(user, obj)
 
 
 @rules.predicate
 def is_project_delegate(user, obj):
     """Whether or not the user has the role of project delegate"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
+    assignment = RoleCache.get_assignment(user, obj)
 
     if assignment:
         return assignment.role.name == PROJECT_ROLE_DELEGATE
@@ -41,7 +41,7 @@ def is_project_delegate(user, obj):
 @rules.predicate
 def is_project_contributor(user, obj):
     """Whether or not the user has the role of project contributor"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
+    assignment = RoleCache.get_assignment(user, obj)
 
     if assignment:
         return assignment.role.name == PROJECT_ROLE_CONTRIBUTOR
@@ -52,7 +52,7 @@ def is_project_contributor(user, obj):
 @rules.predicate
 def is_project_guest(user, obj):
     """Whether or not the user has the role of project guest"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
+    assignment = RoleCache.get_assignment(user, obj)
 
     if assignment:
         return assignment.role.name == PROJECT_ROLE_GUEST
@@ -63,9 +63,7 @@ def is_project_guest(user, obj):
 @rules.predicate
 def has_project_role(user, obj):
     """Whether or not the user has any role in the project"""
-    if RoleAssignment.objects.get_assignment(user, obj) or (
-        obj and obj.is_owner(user)
-    ):
+    if RoleCache.get_assignment(user, obj) or RoleCache.is_owner(user, obj):
         return True
 
     return False
@@ -9,6 +9,7 @@ from django.utils import timezone
 from projectroles.models import (
     Project,
     RoleAssignment,
+    RoleCache,
     RemoteProject,
     SODAR_CONSTANTS,
     PROJECT_TAG_STARRED,
@@ -138,43 +139,15 @@ def is_app_visible(plugin, project, user):
 def get_project_list(user, parent=None):
     """Return flat project list for displaying in templates"""
     # TODO: Remove once reimplementing custom column retrieval
-    project_list = []
-
-    if user.is_superuser:
-        project_list = Project.objects.filter(
-            parent=parent, submit_status='OK'
-        ).order_by('title')
-
-    elif not user.is_anonymous():
-        project_list = [
-            p
-            for p in Project.objects.filter(
-                parent=parent, submit_status='OK'
-            ).order_by('title')
-            if p.has_role(user, include_children=True)
-        ]
-
-    def append_projects(project):
-        lst = [project]
-
-        for c in project.get_children():
-            if user.is_superuser or c.has_role(user, include_children=True):
-                lst += append_projects(c)
-
-        return lst
-
-    flat_list = []
-
-    for p in project_list:
-        flat_list += append_projects(p)
-
-    return flat_list
+    return Project.objects.get_project_list(user, parent)
 
 
 @register.simple_tag
 def get_project_list_indent(project, list_parent):
     """Return indent in pixels for project list"""
-    project_depth = project.get_depth()
+    project_depth = (
+        project.depth if hasattr(project, 'depth') else project.get_depth()
+    )
 
     if list_parent:
         project_depth -= list_parent.get_depth() + 1
@@ -236,9 +209,9 @@ def get_user_role_html(project, user):
     if user.is_superuser:
         return '<span class="text-danger">Superuser</span>'
 
-    role_as = RoleAssignment.objects.filter(project=project, user=user).first()
+    role_as = RoleCache.get_assignment(user, project)
 
-    if project.is_owner(user):
+    if RoleCache.is_owner(user, project):
         if role_as and role_as.role.name == PROJECT_ROLE_OWNER:
             return 'Owner'
 
@@ -152,6 +152,70 @@ class TestAppSettingAPI(
         )
         self.assertEqual(type(val), str)
 
+    def test_get_project_setting_cache(self):
+        """Test get_app_setting() with cached setting values"""
+        with self.assertNumQueries(1):
+            for setting in self.settings:
+                val = app_settings.get_app_setting(
+                    app_name=setting['app_name'],
+                    setting_name=setting['name'],
+                    project=setting['project'],
+                )
+                self.assertEqual(val, setting['value'])
+
+    def test_get_project_setting_cache_update(self):
+        """Test get_app_setting() after updating a cached setting"""
+        setting = self.setting_str_values
+        app_settings.get_app_setting(
+            setting['app_name'], setting['name'], project=self.project
+        )
+        app_settings.set_app_setting(
+            setting['app_name'],
+            setting['name'],
+            setting['update_value'],
+            project=self.project,
+        )
+        val = app_settings.get_app_setting(
+            setting['app_name'], setting['name'], project=self.project
+        )
+        self.assertEqual(val, setting['update_value'])
+
+    def test_get_project_setting_cache_delete(self):
+        """Test get_app_setting() after deleting a cached setting"""
+        setting = self.setting_str_values
+        app_settings.get_app_setting(
+            setting['app_name'], setting['name'], project=self.project
+        )
+        AppSetting.objects.get(
+            name=setting['name'], project=self.project
+        ).delete()
+        val = app_settings.get_app_setting(
+            setting['app_name'], setting['name'], project=self.project
+        )
+        self.assertEqual(
+            val,
+            app_settings.get_default_setting(
+                setting['app_name'], setting['name']
+            ),
+        )
+
+    def test_get_all_settings(self):
+        """Test get_all_settings()"""
+        ret = app_settings.get_all_settings(project=self.project)
+
+        for setting in self.settings:
+            self.assertEqual(
+                ret['settings.{}.{}'.format(EXAMPLE_APP_NAME, setting['name'])],
+                setting['value'],
+            )
+
+        self.assertEqual(
+            ret['settings.{}.project_hidden_setting'.format(EXAMPLE_APP_NAME)],
+            app_settings.get_default_setting(
+                EXAMPLE_APP_NAME, 'project_hidden_setting'
+            ),
+        )
+
     def test_set_project_setting(self):
         """Test set_app_setting()"""
 
@@ -3,7 +3,7 @@
 import uuid
 
 from django.conf import settings
-from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.models import AnonymousUser, Group, Permission
 from django.core.exceptions import ValidationError
 from django.forms.models import model_to_dict
 from django.urls import reverse
@@ -16,6 +16,7 @@ from projectroles.models import (
     Project,
     Role,
     RoleAssignment,
+    RoleCache,
     ProjectInvite,
     AppSetting,
     ProjectUserTag,
@@ -346,6 +347,95 @@ class TestProject(ProjectMixin, TestCase):
         expected = self.category_top.title + ' / ' + self.project_sub.title
         self.assertEqual(self.project_sub.get_full_title(), expected)
 
+    def test_get_full_title_move(self):
+        """Test full title after moving a project under a category"""
+        category_sub = self._make_project(
+            title='TestCategorySub', type=PROJECT_TYPE_CATEGORY, parent=None,
+        )
+        self.project_sub.parent = category_sub
+        self.project_sub.save()
+        expected = category_sub.title + ' / ' + self.project_sub.title
+        self.assertEqual(self.project_sub.get_full_title(), expected)
+
+    def test_get_full_title_rename_parent(self):
+        """Test full title of a child after renaming its parent"""
+        self.category_top.title = 'RenamedCategory'
+        self.category_top.save()
+        project = Project.objects.get(pk=self.project_sub.pk)
+        self.assertEqual(project.full_title, 'RenamedCategory / TestProjectSub')
+
+    def test_get_children_flat(self):
+        """Test get_children() with flat=True"""
+        category_sub = self._make_project(
+            title='TestCategorySub',
+            type=PROJECT_TYPE_CATEGORY,
+            parent=self.category_top,
+        )
+        project_sub_sub = self._make_project(
+            title='TestProjectSubSub',
+            type=PROJECT_TYPE_PROJECT,
+            parent=category_sub,
+        )
+        with self.assertNumQueries(1):
+            children = self.category_top.get_children(flat=True)
+        # Children are returned before their descendants
+        self.assertEqual(
+            children, [category_sub, self.project_sub, project_sub_sub]
+        )
+
+    def test_get_children_flat_status(self):
+        """Test get_children() with flat=True and an unfinished submit"""
+        category_sub = self._make_project(
+            title='TestCategorySub',
+            type=PROJECT_TYPE_CATEGORY,
+            parent=self.category_top,
+        )
+        self._make_project(
+            title='TestProjectSubSub',
+            type=PROJECT_TYPE_PROJECT,
+            parent=category_sub,
+        )
+        category_sub.submit_status = SUBMIT_STATUS_PENDING
+        category_sub.save()
+        children = self.category_top.get_children(flat=True)
+        self.assertEqual(children, [self.project_sub])
+
+    def test_tree_index_move(self):
+        """Test tree index of children after moving their parent"""
+        category_new = self._make_project(
+            title='TestCategoryNew', type=PROJECT_TYPE_CATEGORY, parent=None
+        )
+        self.category_top.parent = category_new
+        self.category_top.save()
+        project = Project.objects.get(pk=self.project_sub.pk)
+        self.assertEqual(project.get_depth(), 2)
+        self.assertEqual(
+            project.full_title,
+            'TestCategoryNew / TestCategoryTop / TestProjectSub',
+        )
+        self.assertEqual(
+            project.get_path_uuids(),
+            [
+                str(category_new.sodar_uuid),
+                str(self.category_top.sodar_uuid),
+                str(project.sodar_uuid),
+            ],
+        )
+        self.assertEqual(
+            list(Project.objects.get_ancestors(project)),
+            [category_new, self.category_top],
+        )
+
+    def test_get_descendants(self):
+        """Test ProjectManager.get_descendants()"""
+        self.assertEqual(
+            list(Project.objects.get_descendants(self.category_top)),
+            [self.project_sub],
+        )
+        self.assertEqual(
+            Project.objects.get_descendants(self.project_top).count(), 0
+        )
+
     def test_is_remote(self):
         """Test Project.is_remote() without remote projects"""
         self.assertEqual(self.project_sub.is_remote(), False)
@@ -512,6 +602,14 @@ class TestRoleAssignment(ProjectMixin, RoleAssignmentMixin, TestCase):
                 self.category_top, self.user_bob, self.role_owner
             )
 
+    def test_validate_unsaved(self):
+        """Test validate() for an unsaved object"""
+        role_as = RoleAssignment(
+            project=self.category_top, user=self.user_bob, role=self.role_owner
+        )
+        with self.assertRaises(ValidationError):
+            role_as.validate()
+
     @override_settings(PROJECTROLES_DELEGATE_LIMIT=1)
     def test_validate_one_delegate(self):
         """Test delegate validation: can't add delegate for project if limit (1)
@@ -585,6 +683,69 @@ class TestRoleAssignment(ProjectMixin, RoleAssignmentMixin, TestCase):
         self.assertTrue(self.project_sub.is_owner(self.user_alice))
         self.assertFalse(self.project_sub.is_owner(self.user_carol))
 
+    def test_is_project_owner_queries(self):
+        """Test project.is_owner() query count"""
+        with self.assertNumQueries(1):
+            self.assertTrue(self.project_sub.is_owner(self.user_alice))
+
+    def test_has_role_index(self):
+        """Test project.has_role() results with the project tree index"""
+        self._make_assignment(
+            self.project_sub, self.user_bob, self.role_contributor
+        )
+        self.assertTrue(self.project_sub.has_role(self.user_bob))
+        self.assertTrue(self.project_sub.has_role(self.user_alice))
+        self.assertFalse(self.category_top.has_role(self.user_bob))
+        self.assertFalse(self.project_top.has_role(self.user_alice))
+
+    def test_has_role_children(self):
+        """Test project.has_role() results with include_children=True"""
+        self._make_assignment(
+            self.project_sub, self.user_bob, self.role_contributor
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(
+                self.category_top.has_role(self.user_bob, include_children=True)
+            )
+        self.assertFalse(
+            self.category_top.has_role(self.user_carol, include_children=True)
+        )
+
+    def test_get_effective_roles(self):
+        """Test get_effective_roles() results"""
+        self._make_assignment(self.project_sub, self.user_bob, self.role_owner)
+        self._make_assignment(
+            self.project_top, self.user_alice, self.role_guest
+        )
+        with self.assertNumQueries(2):
+            roles = RoleAssignment.objects.get_effective_roles(self.user_alice)
+        expected = {
+            self.category_top: PROJECT_ROLE_OWNER,
+            self.project_sub: PROJECT_ROLE_OWNER,
+            self.project_top: PROJECT_ROLE_GUEST,
+        }
+        self.assertEqual(roles, expected)
+        self.assertEqual(
+            RoleAssignment.objects.get_effective_roles(self.user_bob),
+            {self.project_sub: PROJECT_ROLE_OWNER},
+        )
+
+    def test_get_effective_roles_project(self):
+        """Test get_effective_roles() results limited to a project"""
+        self._make_assignment(
+            self.project_top, self.user_alice, self.role_guest
+        )
+        roles = RoleAssignment.objects.get_effective_roles(
+            self.user_alice, project=self.project_sub
+        )
+        self.assertEqual(roles, {self.project_sub: PROJECT_ROLE_OWNER})
+
+    def test_get_effective_roles_anon(self):
+        """Test get_effective_roles() results with an anonymous user"""
+        self.assertEqual(
+            RoleAssignment.objects.get_effective_roles(AnonymousUser()), {}
+        )
+
     def test_get_project_delegates(self):
         """Test get_project_delegates() results"""
         assignment_d0 = self._make_assignment(
@@ -683,6 +844,102 @@ class TestRoleAssignment(ProjectMixin, RoleAssignmentMixin, TestCase):
         )
 
 
+class TestRoleCache(ProjectMixin, RoleAssignmentMixin, TestCase):
+    """Tests for RoleCache"""
+
+    def setUp(self):
+        self.category = self._make_project(
+            title='TestCategory', type=PROJECT_TYPE_CATEGORY, parent=None
+        )
+        self.project = self._make_project(
+            title='TestProject', type=PROJECT_TYPE_PROJECT, parent=self.category
+        )
+        self.role_owner = Role.objects.get_or_create(name=PROJECT_ROLE_OWNER)[0]
+        self.role_guest = Role.objects.get_or_create(name=PROJECT_ROLE_GUEST)[0]
+        self.user_alice = self.make_user('alice')
+        self.user_bob = self.make_user('bob')
+        self.owner_as = self._make_assignment(
+            self.category, self.user_alice, self.role_owner
+        )
+        RoleCache.start_request()
+
+    def tearDown(self):
+        RoleCache.end_request()
+
+    def test_get_assignment(self):
+        """Test get_assignment() caching"""
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                RoleCache.get_assignment(self.user_alice, self.category),
+                self.owner_as,
+            )
+            self.assertEqual(
+                RoleCache.get_assignment(self.user_alice, self.category).role,
+                self.role_owner,
+            )
+
+    def test_get_assignment_anon(self):
+        """Test get_assignment() with an anonymous user"""
+        with self.assertNumQueries(0):
+            self.assertIsNone(
+                RoleCache.get_assignment(AnonymousUser(), self.category)
+            )
+
+    def test_is_owner(self):
+        """Test is_owner() caching"""
+        with self.assertNumQueries(1):
+            self.assertTrue(RoleCache.is_owner(self.user_alice, self.project))
+            self.assertTrue(RoleCache.is_owner(self.user_alice, self.project))
+
+    def test_get_assignment_no_request(self):
+        """Test get_assignment() outside of a request"""
+        RoleCache.end_request()
+
+        with self.assertNumQueries(2):
+            for i in range(2):
+                self.assertEqual(
+                    RoleCache.get_assignment(self.user_alice, self.category),
+                    self.owner_as,
+                )
+
+    def test_request_scope(self):
+        """Test caching for a user object reused between requests"""
+        self.assertTrue(RoleCache.is_owner(self.user_alice, self.project))
+        self.owner_as.role = self.role_guest
+        self.owner_as.save()
+        RoleCache.version -= 1  # Simulate a change in another process
+        self.assertTrue(RoleCache.is_owner(self.user_alice, self.project))
+
+        RoleCache.start_request()
+        self.assertFalse(RoleCache.is_owner(self.user_alice, self.project))
+
+    def test_invalidate_save(self):
+        """Test cache invalidation on RoleAssignment save"""
+        self.assertIsNone(RoleCache.get_assignment(self.user_bob, self.project))
+        guest_as = self._make_assignment(
+            self.project, self.user_bob, self.role_guest
+        )
+        self.assertEqual(
+            RoleCache.get_assignment(self.user_bob, self.project), guest_as
+        )
+
+    def test_invalidate_delete(self):
+        """Test cache invalidation on RoleAssignment delete"""
+        self.assertTrue(RoleCache.is_owner(self.user_alice, self.project))
+        self.owner_as.delete()
+        self.assertFalse(RoleCache.is_owner(self.user_alice, self.project))
+
+    def test_invalidate_project_move(self):
+        """Test cache invalidation on Project move"""
+        self.assertTrue(RoleCache.is_owner(self.user_alice, self.project))
+        category_new = self._make_project(
+            title='TestCategoryNew', type=PROJECT_TYPE_CATEGORY, parent=None
+        )
+        self.project.parent = category_new
+        self.project.save()
+        self.assertFalse(RoleCache.is_owner(self.user_alice, self.project))
+
+
 class TestProjectInvite(
     ProjectMixin, RoleAssignmentMixin, ProjectInviteMixin, TestCase
 ):
@@ -793,6 +1050,116 @@ class TestProjectManager(ProjectMixin, RoleAssignmentMixin, TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], self.category_top)
 
+    def test_find_rank(self):
+        """Test find() result ranking"""
+        project = self._make_project(
+            title='Sub', type=PROJECT_TYPE_PROJECT, parent=self.category_top
+        )
+        result = Project.objects.find('sub', project_type=None)
+        self.assertEqual(list(result), [project, self.project_sub])
+
+    def test_find_user(self):
+        """Test find() with user"""
+        self._set_up_project_list()
+        self._make_assignment(self.project_sub, self.user, self.role_guest)
+        with self.assertNumQueries(2):
+            result = list(Project.objects.find('Test', user=self.user))
+        self.assertEqual(result, [self.category_top, self.project_sub])
+
+    def test_get_visible(self):
+        """Test get_visible()"""
+        self._set_up_project_list()
+        self._make_assignment(self.category_sub, self.user, self.role_owner)
+        self._make_assignment(self.project_top, self.user, self.role_guest)
+        result = Project.objects.get_visible(self.user).order_by('full_title')
+        expected = [
+            self.category_top,
+            self.category_sub,
+            self.project_sub_sub,
+            self.project_top,
+        ]
+        self.assertEqual(list(result), expected)
+
+    def test_get_visible_no_roles(self):
+        """Test get_visible() with no roles"""
+        self._set_up_project_list()
+        self.assertEqual(Project.objects.get_visible(self.user).count(), 0)
+        self.assertEqual(
+            Project.objects.get_visible(AnonymousUser()).count(), 0
+        )
+
+    def _set_up_project_list(self):
+        """Set up projects and roles for project list tests"""
+        self.category_sub = self._make_project(
+            title='TestCategorySub',
+            type=PROJECT_TYPE_CATEGORY,
+            parent=self.category_top,
+        )
+        self.project_sub_sub = self._make_project(
+            title='TestProjectSubSub',
+            type=PROJECT_TYPE_PROJECT,
+            parent=self.category_sub,
+        )
+        self.project_top = self._make_project(
+            title='TestProjectTop', type=PROJECT_TYPE_PROJECT, parent=None
+        )
+        self.role_owner = Role.objects.get(name=PROJECT_ROLE_OWNER)
+        self.role_guest = Role.objects.get(name=PROJECT_ROLE_GUEST)
+        self.user = self.make_user('user')
+
+    def test_get_project_list_superuser(self):
+        """Test get_project_list() as superuser"""
+        self._set_up_project_list()
+        self.user.is_superuser = True
+        self.user.save()
+        result = Project.objects.get_project_list(self.user)
+        expected = [
+            self.category_top,
+            self.category_sub,
+            self.project_sub_sub,
+            self.project_sub,
+            self.project_top,
+        ]
+        self.assertEqual(result, expected)
+        self.assertEqual([p.depth for p in result], [0, 1, 2, 1, 0])
+
+    def test_get_project_list_role(self):
+        """Test get_project_list() with a role in a subproject"""
+        self._set_up_project_list()
+        self._make_assignment(self.project_sub_sub, self.user, self.role_guest)
+        with self.assertNumQueries(2):
+            result = Project.objects.get_project_list(self.user)
+        self.assertEqual(
+            result,
+            [self.category_top, self.category_sub, self.project_sub_sub],
+        )
+
+    def test_get_project_list_inherited(self):
+        """Test get_project_list() with an inherited owner role"""
+        self._set_up_project_list()
+        self._make_assignment(self.category_sub, self.user, self.role_owner)
+        result = Project.objects.get_project_list(
+            self.user, parent=self.category_top
+        )
+        self.assertEqual(result, [self.category_sub, self.project_sub_sub])
+
+    def test_get_project_list_pending(self):
+        """Test get_project_list() with a pending parent category"""
+        self._set_up_project_list()
+        self.category_sub.submit_status = SUBMIT_STATUS_PENDING
+        self.category_sub.save()
+        self.user.is_superuser = True
+        self.user.save()
+        result = Project.objects.get_project_list(self.user)
+        self.assertEqual(
+            result, [self.category_top, self.project_sub, self.project_top]
+        )
+
+    def test_get_project_list_anon(self):
+        """Test get_project_list() with an anonymous user"""
+        self._set_up_project_list()
+        self.assertEqual(Project.objects.get_project_list(AnonymousUser()), [])
+
 
 class TestProjectSetting(
     ProjectMixin, RoleAssignmentMixin, AppSettingMixin, TestCase
@@ -1156,6 +1523,10 @@ class TestRemoteSite(
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': self.site.sodar_uuid,
             'user_display': REMOTE_SITE_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 0,
+            'sync_etag': None,
         }
         self.assertEqual(model_to_dict(self.site), expected)
 
@@ -1175,6 +1546,60 @@ class TestRemoteSite(
         )
         self.assertEqual(repr(self.site), expected)
 
+    def _get_sync_version(self):
+        self.site.refresh_from_db()
+        return self.site.sync_version
+
+    def test_sync_version(self):
+        """Test increasing sync_version on changes to synchronized data"""
+        version = self._get_sync_version()
+        self.owner_as.user = self.make_user('new_owner')
+        self.owner_as.save()
+        self.assertGreater(self._get_sync_version(), version)
+
+        version = self._get_sync_version()
+        self.project.description = 'New description'
+        self.project.save()
+        self.assertEqual(self._get_sync_version(), version + 1)
+
+        version = self._get_sync_version()
+        self.user.groups.add(Group.objects.get_or_create(name='group')[0])
+        self.assertEqual(self._get_sync_version(), version + 1)
+
+    def test_sync_version_ignore(self):
+        """Test sync_version with updates to non-synchronized fields"""
+        version = self._get_sync_version()
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        self.site.sync_token = str(uuid.uuid4())
+        self.site.save(update_fields=['sync_token'])
+        self.assertEqual(self._get_sync_version(), version)
+
+    def test_sync_version_user(self):
+        """Test sync_version with user updates"""
+        version = self._get_sync_version()
+        self.user.is_staff = True
+        self.user.save()
+        self.user.user_permissions.add(Permission.objects.first())
+        self.assertEqual(self._get_sync_version(), version)
+
+        self.user.email = 'new@example.com'
+        self.user.save()
+        self.assertEqual(self._get_sync_version(), version + 1)
+
+        version = self._get_sync_version()
+        self.user.first_name = 'New'
+        self.user.save(update_fields=['first_name'])
+        self.assertEqual(self._get_sync_version(), version + 1)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_sync_version_target(self):
+        """Test sync_version on a site in target mode"""
+        version = self._get_sync_version()
+        self.project.description = 'New description'
+        self.project.save()
+        self.assertEqual(self._get_sync_version(), version)
+
     def test_validate_mode(self):
         """Test _validate_mode() with an invalid mode (should fail)"""
 
@@ -0,0 +1,111 @@
+"""Tests for the plugin API in the projectroles app"""
+
+from django.core.cache import cache
+from django.test import override_settings
+from test_plus.test import TestCase
+
+from projectroles.plugins import (
+    REGISTRY_VERSION_KEY,
+    PluginRegistry,
+    change_plugin_status,
+    get_active_plugins,
+    get_app_plugin,
+)
+
+
+# Local constants
+EXAMPLE_APP_NAME = 'example_project_app'
+EXAMPLE_SITE_APP_NAME = 'example_site_app'
+EXAMPLE_BACKEND_NAME = 'example_backend_app'
+
+
+class TestPluginAPI(TestCase):
+    """Tests for the plugin API and PluginRegistry"""
+
+    def setUp(self):
+        PluginRegistry.refresh()
+
+    def tearDown(self):
+        # Status changes are rolled back without signals, refresh registry
+        PluginRegistry.refresh()
+
+    def test_get_active_plugins(self):
+        """Test get_active_plugins() for project apps"""
+        plugins = get_active_plugins()
+        self.assertEqual(
+            [p.name for p in plugins], sorted([p.name for p in plugins])
+        )
+        self.assertIn(EXAMPLE_APP_NAME, [p.name for p in plugins])
+
+    def test_get_active_plugins_custom_order(self):
+        """Test get_active_plugins() with custom ordering"""
+        plugins = get_active_plugins(custom_order=True)
+        self.assertEqual(
+            plugins, sorted(plugins, key=lambda x: x.plugin_ordering)
+        )
+
+    def test_get_active_plugins_backend(self):
+        """Test get_active_plugins() for backend plugins"""
+        plugins = get_active_plugins(plugin_type='backend')
+        self.assertIn(EXAMPLE_BACKEND_NAME, [p.name for p in plugins])
+
+        with override_settings(ENABLED_BACKEND_PLUGINS=[]):
+            self.assertEqual(get_active_plugins(plugin_type='backend'), [])
+
+    def test_get_active_plugins_invalid(self):
+        """Test get_active_plugins() with an invalid plugin type"""
+        with self.assertRaises(ValueError):
+            get_active_plugins(plugin_type='invalid')
+
+    def test_get_active_plugins_cache(self):
+        """Test get_active_plugins() with a built registry"""
+        get_active_plugins()
+
+        with self.assertNumQueries(0):
+            get_active_plugins()
+            get_active_plugins(plugin_type='site_app')
+            get_app_plugin(EXAMPLE_APP_NAME)
+
+    @override_settings(PROJECTROLES_PLUGIN_REGISTRY_TIMEOUT=0)
+    def test_get_active_plugins_version(self):
+        """Test get_active_plugins() after a refresh in another process"""
+        get_active_plugins()
+        data = PluginRegistry.data
+
+        with self.assertNumQueries(0):
+            get_active_plugins()
+
+        self.assertIs(PluginRegistry.data, data)
+        cache.incr(REGISTRY_VERSION_KEY)
+        get_active_plugins()
+        self.assertIsNot(PluginRegistry.data, data)
+
+    def test_get_active_plugins_version_timeout(self):
+        """Test get_active_plugins() before the version check timeout"""
+        get_active_plugins()
+        data = PluginRegistry.data
+        cache.incr(REGISTRY_VERSION_KEY)
+        get_active_plugins()
+        self.assertIs(PluginRegistry.data, data)
+
+    def test_get_app_plugin(self):
+        """Test get_app_plugin() for different plugin types"""
+        self.assertEqual(
+            get_app_plugin(EXAMPLE_APP_NAME).name, EXAMPLE_APP_NAME
+        )
+        self.assertEqual(
+            get_app_plugin(EXAMPLE_SITE_APP_NAME).name, EXAMPLE_SITE_APP_NAME
+        )
+        self.assertEqual(
+            get_app_plugin(EXAMPLE_BACKEND_NAME).name, EXAMPLE_BACKEND_NAME
+        )
+        self.assertIsNone(get_app_plugin('NON-EXISTING PLUGIN'))
+
+    def test_change_plugin_status(self):
+        """Test change_plugin_status() refreshing the registry"""
+        self.assertIsNotNone(get_app_plugin(EXAMPLE_APP_NAME))
+        change_plugin_status(EXAMPLE_APP_NAME, 1)  # 1 = Disabled
+        self.assertIsNone(get_app_plugin(EXAMPLE_APP_NAME))
+        self.assertNotIn(
+            EXAMPLE_APP_NAME, [p.name for p in get_active_plugins()]
+        )
@@ -1,11 +1,21 @@
 """Test for the remote projects API in the projectroles app"""
 from copy import deepcopy
+import gzip
+import io
+import json
 import uuid
+from unittest.mock import patch
+from urllib.error import HTTPError
 
 from django.conf import settings
 from django.contrib import auth
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.forms.models import model_to_dict
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from test_plus.test import TestCase
 
@@ -89,6 +99,8 @@ NEW_PEER_NAME = PEER_SITE_NAME + ' new'
 NEW_PEER_DESC = PEER_SITE_DESC + ' new'
 NEW_PEER_USER_DISPLAY = not PEER_SITE_USER_DISPLAY
 
+SYNC_TOKEN = str(uuid.uuid4())
+
 
 class TestGetTargetData(
     ProjectMixin,
@@ -424,8 +436,368 @@ class TestGetTargetData(
 
         self.assertEqual(sync_data, expected)
 
+    def test_read_info_read_roles(self):
+        """Test get data with READ_INFO and READ_ROLES in the same category"""
+        new_project = self._make_project(
+            'NewProject', PROJECT_TYPE_PROJECT, self.category
+        )
+        self._make_assignment(new_project, self.user_source, self.role_owner)
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_INFO,
+        )
+        self._make_remote_project(
+            project_uuid=new_project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+
+        sync_data = self.remote_api.get_target_data(self.target_site)
+
+        c_data = sync_data['projects'][str(self.category.sodar_uuid)]
+        self.assertEqual(c_data['level'], REMOTE_LEVEL_READ_ROLES)
+        self.assertEqual(
+            c_data['roles'],
+            {
+                str(self.category_owner_as.sodar_uuid): {
+                    'user': self.user_source.username,
+                    'role': PROJECT_ROLE_OWNER,
+                }
+            },
+        )
+        self.assertEqual(len(sync_data['projects']), 3)
+        self.assertEqual(len(sync_data['users']), 1)
+
+    def test_query_count(self):
+        """Test get_target_data() query count with an increasing project count"""
+
+        def _make_projects(start, count):
+            for i in range(start, start + count):
+                category = self._make_project(
+                    'Category{}'.format(i), PROJECT_TYPE_CATEGORY, self.category
+                )
+                project = self._make_project(
+                    'Project{}'.format(i), PROJECT_TYPE_PROJECT, category
+                )
+                user = self.make_user('user{}'.format(i))
+                user.groups.add(self.group)
+                self._make_assignment(category, user, self.role_owner)
+                self._make_assignment(project, user, self.role_owner)
+                self._make_assignment(
+                    project, self.user_source, self.role_contributor
+                )
+                self._make_remote_project(
+                    project_uuid=project.sodar_uuid,
+                    site=self.target_site,
+                    level=REMOTE_LEVEL_READ_ROLES,
+                )
+                self._make_remote_project(
+                    project_uuid=project.sodar_uuid,
+                    site=self.peer_site,
+                    level=REMOTE_LEVEL_READ_INFO,
+                )
+
+        def _get_query_count():
+            with CaptureQueriesContext(connection) as context:
+                sync_data = self.remote_api.get_target_data(self.target_site)
+            return len(context.captured_queries), sync_data
+
+        self.group = Group.objects.get_or_create(name=SOURCE_USER_GROUP)[0]
+        _make_projects(0, 1)
+        query_count, sync_data = _get_query_count()
+        self.assertEqual(len(sync_data['projects']), 3)
+
+        _make_projects(1, 10)
+        new_query_count, sync_data = _get_query_count()
+        self.assertEqual(len(sync_data['projects']), 23)
+        self.assertEqual(len(sync_data['users']), 12)
+        self.assertEqual(len(sync_data['peer_sites']), 1)
+        self.assertEqual(new_query_count, query_count)
+
+    def test_cache_shared(self):
+        """Test sharing cached data between target sites"""
+        new_target_site = self._make_site(
+            name=TARGET_SITE_NAME + ' new',
+            url=TARGET_SITE_URL + '/new',
+            mode=SITE_MODE_TARGET,
+            description=TARGET_SITE_DESC,
+            secret=build_secret(),
+        )
+        for site in [self.target_site, new_target_site]:
+            self._make_remote_project(
+                project_uuid=self.project.sodar_uuid,
+                site=site,
+                level=REMOTE_LEVEL_READ_ROLES,
+            )
+        sync_data = self.remote_api.get_target_data(self.target_site)
+
+        with self.assertNumQueries(2):
+            new_sync_data = self.remote_api.get_target_data(new_target_site)
+
+        p_uuid = str(self.project.sodar_uuid)
+        self.assertEqual(
+            sync_data['projects'][p_uuid]['remote_sites'],
+            [str(new_target_site.sodar_uuid)],
+        )
+        self.assertEqual(
+            new_sync_data['projects'][p_uuid]['remote_sites'],
+            [str(self.target_site.sodar_uuid)],
+        )
+        self.assertEqual(sync_data['users'], new_sync_data['users'])
+
+    def test_cache_update(self):
+        """Test updating cached data on changes"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_INFO,
+        )
+        self.remote_api.get_target_data(self.target_site)
+        self.project.description = 'New description'
+        self.project.save()
+        sync_data = self.remote_api.get_target_data(self.target_site)
+        self.assertEqual(
+            sync_data['projects'][str(self.project.sodar_uuid)]['description'],
+            'New description',
+        )
+
+    @override_settings(PROJECTROLES_REMOTE_SYNC_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        """Test retrieving data with caching disabled"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_INFO,
+        )
+        sync_data = self.remote_api.get_target_data(self.target_site)
+        self.assertEqual(
+            sync_data, self.remote_api.get_target_data(self.target_site)
+        )
+        self.assertIsNone(
+            cache.get(
+                self.remote_api.get_target_cache_key(
+                    list(self.target_site.projects.all())
+                )
+            )
+        )
+
+    def test_sync_data(self):
+        """Test get_sync_data() without a sync token"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        sync_data = self.remote_api.get_sync_data(self.target_site)
+        self.target_site.refresh_from_db()
+
+        expected = self.remote_api.get_target_data(self.target_site)
+        expected['sync_token'] = self.target_site.sync_token
+        expected['sync_delta'] = False
+        self.assertEqual(sync_data, expected)
+        self.assertIsNotNone(self.target_site.sync_token)
+        self.assertEqual(
+            set(self.target_site.sync_hashes['projects'].keys()),
+            {str(self.category.sodar_uuid), str(self.project.sodar_uuid)},
+        )
+
+    def test_sync_data_delta(self):
+        """Test get_sync_data() with a sync token and no changes"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        sync_token = self.remote_api.get_sync_data(self.target_site)[
+            'sync_token'
+        ]
+        sync_data = self.remote_api.get_sync_data(self.target_site, sync_token)
+
+        expected = {
+            'users': {},
+            'projects': {},
+            'peer_sites': {},
+            'deleted': {'users': [], 'projects': [], 'peer_sites': []},
+            'sync_token': self.target_site.sync_token,
+            'sync_delta': True,
+        }
+        self.assertEqual(sync_data, expected)
+        self.assertNotEqual(sync_data['sync_token'], sync_token)
+
+    def test_sync_data_delta_role(self):
+        """Test get_sync_data() with a sync token and an added role"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        sync_token = self.remote_api.get_sync_data(self.target_site)[
+            'sync_token'
+        ]
+        user_new = self._make_sodar_user(
+            username='new_user@' + SOURCE_USER_DOMAIN,
+            name='New User',
+            first_name='New',
+            last_name='User',
+            email='new_user@example.com',
+        )
+        self._make_assignment(self.project, user_new, self.role_guest)
+        sync_data = self.remote_api.get_sync_data(self.target_site, sync_token)
+
+        self.assertEqual(sync_data['sync_delta'], True)
+        self.assertEqual(
+            list(sync_data['users'].keys()), [str(user_new.sodar_uuid)]
+        )
+        # Project is returned with its parent category and full roles
+        self.assertEqual(
+            set(sync_data['projects'].keys()),
+            {str(self.category.sodar_uuid), str(self.project.sodar_uuid)},
+        )
+        self.assertEqual(
+            len(sync_data['projects'][str(self.project.sodar_uuid)]['roles']),
+            2,
+        )
+
+    def test_sync_data_delta_deleted(self):
+        """Test get_sync_data() with a sync token and removed data"""
+        rp = self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        sync_token = self.remote_api.get_sync_data(self.target_site)[
+            'sync_token'
+        ]
+        rp.delete()
+        sync_data = self.remote_api.get_sync_data(self.target_site, sync_token)
+
+        self.assertEqual(sync_data['projects'], {})
+        self.assertEqual(
+            sync_data['deleted'],
+            {
+                'users': [str(self.user_source.sodar_uuid)],
+                'projects': sorted(
+                    [
+                        str(self.category.sodar_uuid),
+                        str(self.project.sodar_uuid),
+                    ]
+                ),
+                'peer_sites': [],
+            },
+        )
+
+    def test_sync_data_invalid_token(self):
+        """Test get_sync_data() with an outdated sync token"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        sync_token = self.remote_api.get_sync_data(self.target_site)[
+            'sync_token'
+        ]
+        self.remote_api.get_sync_data(self.target_site)
+        sync_data = self.remote_api.get_sync_data(self.target_site, sync_token)
+
+        self.assertEqual(sync_data['sync_delta'], False)
+        self.assertEqual(len(sync_data['projects']), 2)
+
 
 @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+class TestStreamSyncData(TestCase):
+    """Tests for the stream_sync_data() API function"""
+
+    def setUp(self):
+        self.remote_api = RemoteProjectAPI()
+        self.sync_data = {
+            'users': {
+                str(uuid.uuid4()): {'username': 'user{}'.format(i)}
+                for i in range(100)
+            },
+            'projects': {},
+            'peer_sites': {},
+        }
+
+    def test_stream(self):
+        """Test streaming sync data"""
+        with patch('projectroles.remote_projects.SYNC_CHUNK_SIZE', 256):
+            chunks = list(self.remote_api.stream_sync_data(self.sync_data))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(
+            json.loads(b''.join(chunks).decode('utf-8')), self.sync_data
+        )
+
+    def test_stream_compress(self):
+        """Test streaming compressed sync data"""
+        with patch('projectroles.remote_projects.SYNC_CHUNK_SIZE', 256):
+            chunks = list(
+                self.remote_api.stream_sync_data(self.sync_data, compress=True)
+            )
+        self.assertEqual(
+            json.loads(gzip.decompress(b''.join(chunks)).decode('utf-8')),
+            self.sync_data,
+        )
+
+
+class TestGetRemoteData(RemoteSiteMixin, TestCase):
+    """Tests for the get_remote_data() API function"""
+
+    def setUp(self):
+        self.source_site = self._make_site(
+            name=SOURCE_SITE_NAME,
+            url=SOURCE_SITE_URL,
+            mode=SITE_MODE_SOURCE,
+            description=SOURCE_SITE_DESC,
+            secret=SOURCE_SITE_SECRET,
+        )
+        self.source_site.sync_token = SYNC_TOKEN
+        self.source_site.sync_etag = '"{}-1"'.format(SYNC_TOKEN)
+        self.remote_api = RemoteProjectAPI()
+
+    @patch('projectroles.remote_projects.urllib.request.urlopen')
+    def test_get(self, mock_urlopen):
+        """Test retrieving data with a stored sync token and ETag"""
+        response = io.BytesIO(gzip.compress(b'{"users": {}}'))
+        response.headers = {
+            'content-encoding': 'gzip',
+            'etag': '"{}-2"'.format(SYNC_TOKEN),
+        }
+        mock_urlopen.return_value = response
+
+        remote_data = self.remote_api.get_remote_data(self.source_site)
+
+        api_req = mock_urlopen.call_args[0][0]
+        self.assertIn('since=' + SYNC_TOKEN, api_req.full_url)
+        self.assertEqual(
+            api_req.get_header('If-none-match'), self.source_site.sync_etag
+        )
+        self.assertEqual(
+            remote_data,
+            {'users': {}, 'sync_etag': '"{}-2"'.format(SYNC_TOKEN)},
+        )
+
+    @patch('projectroles.remote_projects.urllib.request.urlopen')
+    def test_get_full(self, mock_urlopen):
+        """Test retrieving full data"""
+        mock_urlopen.side_effect = HTTPError('url', 500, 'Error', {}, None)
+
+        with self.assertRaises(HTTPError):
+            self.remote_api.get_remote_data(self.source_site, full=True)
+
+        api_req = mock_urlopen.call_args[0][0]
+        self.assertNotIn('since=', api_req.full_url)
+        self.assertIsNone(api_req.get_header('If-none-match'))
+
+    @patch('projectroles.remote_projects.urllib.request.urlopen')
+    def test_get_not_modified(self, mock_urlopen):
+        """Test retrieving unchanged data"""
+        mock_urlopen.side_effect = HTTPError(
+            'url', 304, 'Not Modified', {}, None
+        )
+        self.assertIsNone(self.remote_api.get_remote_data(self.source_site))
+
+
 class TestSyncSourceData(
     ProjectMixin,
     RoleAssignmentMixin,
@@ -634,6 +1006,10 @@ class TestSyncSourceData(
             'secret': None,
             'sodar_uuid': uuid.UUID(PEER_SITE_UUID),
             'user_display': PEER_SITE_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 0,
+            'sync_etag': None,
         }
         peer_site_dict = model_to_dict(peer_site_obj)
         peer_site_dict.pop('id')
@@ -1041,6 +1417,10 @@ class TestSyncSourceData(
             'description': NEW_PEER_DESC,
             'secret': None,
             'user_display': NEW_PEER_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 0,
+            'sync_etag': None,
         }
         peer_site_dict = model_to_dict(peer_site_obj)
         peer_site_dict.pop('id')
@@ -1299,6 +1679,204 @@ class TestSyncSourceData(
 
         self.assertEqual(remote_data, expected)
 
+    def test_sync_token(self):
+        """Test sync with a sync token in source data"""
+        remote_data = self.default_data
+        remote_data['sync_token'] = SYNC_TOKEN
+        remote_data['sync_delta'] = False
+        remote_data['sync_etag'] = '"{}-0"'.format(SYNC_TOKEN)
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        self.source_site.refresh_from_db()
+        self.assertEqual(self.source_site.sync_token, SYNC_TOKEN)
+        self.assertEqual(self.source_site.sync_etag, remote_data['sync_etag'])
+        self.assertEqual(Project.objects.all().count(), 2)
+        self.assertEqual(RoleAssignment.objects.all().count(), 2)
+
+    def test_sync_delta(self):
+        """Test sync with changes since the previous sync"""
+        self.remote_api.sync_source_data(
+            self.source_site, deepcopy(self.default_data)
+        )
+        new_user_username = 'newuser@' + SOURCE_USER_DOMAIN
+        new_user_uuid = str(uuid.uuid4())
+        new_role_uuid = str(uuid.uuid4())
+        project_data = deepcopy(
+            self.default_data['projects'][SOURCE_PROJECT_UUID]
+        )
+        project_data['roles'][new_role_uuid] = {
+            'user': new_user_username,
+            'role': self.role_contributor.name,
+        }
+        remote_data = {
+            'users': {
+                new_user_uuid: {
+                    'sodar_uuid': new_user_uuid,
+                    'username': new_user_username,
+                    'name': 'New User',
+                    'first_name': 'New',
+                    'last_name': 'User',
+                    'email': 'newuser@example.com',
+                    'groups': [SOURCE_USER_GROUP],
+                }
+            },
+            'projects': {
+                SOURCE_CATEGORY_UUID: deepcopy(
+                    self.default_data['projects'][SOURCE_CATEGORY_UUID]
+                ),
+                SOURCE_PROJECT_UUID: project_data,
+            },
+            'peer_sites': {},
+            'deleted': {'users': [], 'projects': [], 'peer_sites': []},
+            'sync_token': SYNC_TOKEN,
+            'sync_delta': True,
+        }
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        self.source_site.refresh_from_db()
+        self.assertEqual(self.source_site.sync_token, SYNC_TOKEN)
+        self.assertEqual(User.objects.all().count(), 3)
+        self.assertEqual(RoleAssignment.objects.all().count(), 3)
+        self.assertEqual(
+            RoleAssignment.objects.get(sodar_uuid=new_role_uuid).user.username,
+            new_user_username,
+        )
+        self.assertEqual(
+            remote_data['projects'][SOURCE_PROJECT_UUID]['roles'][
+                new_role_uuid
+            ]['status'],
+            'created',
+        )
+        # Unchanged peer site is kept
+        self.assertEqual(RemoteSite.objects.all().count(), 2)
+
+    def test_create_update_roles_bulk(self):
+        """Test sync creating and updating multiple roles in a project"""
+        remote_data = self.default_data
+        roles = remote_data['projects'][SOURCE_PROJECT_UUID]['roles']
+
+        for i in range(20):
+            user_uuid = str(uuid.uuid4())
+            username = 'user{}@{}'.format(i, SOURCE_USER_DOMAIN)
+            remote_data['users'][user_uuid] = {
+                'sodar_uuid': user_uuid,
+                'username': username,
+                'name': 'User {}'.format(i),
+                'first_name': 'User',
+                'last_name': str(i),
+                'email': 'user{}@example.com'.format(i),
+                'groups': [SOURCE_USER_GROUP],
+            }
+            roles[str(uuid.uuid4())] = {
+                'user': username,
+                'role': self.role_contributor.name,
+            }
+
+        update_data = deepcopy(remote_data)
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        project_obj = Project.objects.get(sodar_uuid=SOURCE_PROJECT_UUID)
+        self.assertEqual(
+            RoleAssignment.objects.filter(
+                project=project_obj, role=self.role_contributor
+            ).count(),
+            20,
+        )
+        self.assertEqual(
+            set(
+                str(a.sodar_uuid)
+                for a in RoleAssignment.objects.filter(project=project_obj)
+            ),
+            set(roles.keys()),
+        )
+        for r_uuid, r in roles.items():
+            self.assertEqual(r['status'], 'created')
+
+        for r_uuid, r in update_data['projects'][SOURCE_PROJECT_UUID][
+            'roles'
+        ].items():
+            if r['role'] == self.role_contributor.name:
+                r['role'] = self.role_guest.name
+
+        self.remote_api.sync_source_data(self.source_site, update_data)
+
+        self.assertEqual(
+            RoleAssignment.objects.filter(
+                project=project_obj, role=self.role_guest
+            ).count(),
+            20,
+        )
+        self.assertEqual(
+            RoleAssignment.objects.filter(project=project_obj).count(), 21
+        )
+        self.assertEqual(
+            len(
+                [
+                    r
+                    for r in update_data['projects'][SOURCE_PROJECT_UUID][
+                        'roles'
+                    ].values()
+                    if r.get('status') == 'updated'
+                ]
+            ),
+            20,
+        )
+        self.assertEqual(
+            project_obj.get_owner().user.username, SOURCE_USER_USERNAME
+        )
+
+    def test_create_owner_multiple(self):
+        """Test sync with multiple owner roles in a project"""
+        remote_data = self.default_data
+        user_uuid = str(uuid.uuid4())
+        username = 'owner2@{}'.format(SOURCE_USER_DOMAIN)
+        remote_data['users'][user_uuid] = {
+            'sodar_uuid': user_uuid,
+            'username': username,
+            'name': 'Owner 2',
+            'first_name': 'Owner',
+            'last_name': '2',
+            'email': 'owner2@example.com',
+            'groups': [SOURCE_USER_GROUP],
+        }
+        remote_data['projects'][SOURCE_PROJECT_UUID]['roles'][
+            str(uuid.uuid4())
+        ] = {'user': username, 'role': self.role_owner.name}
+
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        # The owner role created earlier in the same batch is replaced
+        project_obj = Project.objects.get(sodar_uuid=SOURCE_PROJECT_UUID)
+        self.assertEqual(
+            RoleAssignment.objects.filter(
+                project=project_obj, role=self.role_owner
+            ).count(),
+            1,
+        )
+        self.assertEqual(project_obj.get_owner().user.username, username)
+
+    def test_validate_roles(self):
+        """Test in-memory validation of synced roles"""
+        project = self._make_project('TestProject', PROJECT_TYPE_PROJECT, None)
+        user = self.make_user('user')
+        user2 = self.make_user('user2')
+        owner_as = RoleAssignment(
+            project=project, user=user, role=self.role_owner
+        )
+        guest_as = RoleAssignment(
+            project=project, user=user2, role=self.role_guest
+        )
+
+        with self.assertNumQueries(0):
+            self.remote_api._validate_roles([owner_as, guest_as])
+
+        for role_as in [
+            RoleAssignment(project=project, user=user2, role=self.role_owner),
+            RoleAssignment(project=project, user=user, role=self.role_guest),
+        ]:
+            with self.assertRaises(ValidationError):
+                self.remote_api._validate_roles([owner_as, role_as])
+
     def test_update_no_changes(self):
         """Test sync with existing project data and no changes"""
 
@@ -1477,6 +2055,10 @@ class TestSyncSourceData(
             'secret': None,
             'sodar_uuid': uuid.UUID(PEER_SITE_UUID),
             'user_display': PEER_SITE_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 0,
+            'sync_etag': None,
         }
         peer_site_dict = model_to_dict(peer_site_obj)
         peer_site_dict.pop('id')
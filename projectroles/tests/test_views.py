@@ -1,29 +1,34 @@
 """UI view tests for the projectroles app"""
 
 import json
+import time
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 from django.core import mail
 from django.forms import HiddenInput
 from django.forms.models import model_to_dict
-from django.test import RequestFactory, override_settings
+from django.test import RequestFactory, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
-from test_plus.test import TestCase
+from test_plus.test import BaseTestCase, TestCase
 
 from projectroles.app_settings import AppSettingAPI
 from projectroles.models import (
     Project,
     Role,
     RoleAssignment,
+    RoleCache,
     ProjectInvite,
     RemoteSite,
     RemoteProject,
     SODAR_CONSTANTS,
 )
 from projectroles.plugins import (
+    PluginRegistry,
     change_plugin_status,
+    get_app_plugin,
     get_backend_api,
     get_active_plugins,
 )
@@ -37,6 +42,7 @@ from projectroles.tests.test_models import (
     AppSettingMixin,
 )
 from projectroles.utils import get_user_display_name
+from projectroles.views import ProjectSearchView
 
 
 # SODAR constants
@@ -69,16 +75,55 @@ REMOTE_SITE_NEW_DESC = 'New description'
 REMOTE_SITE_NEW_SECRET = build_secret()
 
 EXAMPLE_APP_NAME = 'example_project_app'
+SEARCH_SLEEP = 2
 
 # App settings API
 app_settings = AppSettingAPI()
 
 
+class DummySearchPlugin:
+    """Minimal app plugin substitute for search tests"""
+
+    def __init__(self, name, sleep=0, fail=False):
+        self.name = name
+        self.title = name
+        self.sleep = sleep
+        self.fail = fail
+
+    def search(self, search_term, user, search_type=None, keywords=None):
+        time.sleep(self.sleep)
+
+        if self.fail:
+            raise Exception('Search failed')
+
+        return {'all': {'items': [search_term]}}
+
+
+class DummyRoleSearchPlugin:
+    """App plugin substitute returning role assignments of the user"""
+
+    def __init__(self, name):
+        self.name = name
+        self.title = name
+        self.user = None
+
+    def search(self, search_term, user, search_type=None, keywords=None):
+        self.user = user
+        items = list(RoleAssignment.objects.filter(user=user).order_by('pk'))
+
+        for a in items:
+            RoleCache.get_assignment(user, a.project)
+
+        return {'all': {'items': items}}
+
+
 class TestViewsBase(TestCase):
     """Base class for view testing"""
 
     def setUp(self):
         self.req_factory = RequestFactory()
+        # Plugin status changes of previous tests may have been rolled back
+        PluginRegistry.refresh()
 
         # Force disabling of taskflow plugin if it's available
         if get_backend_api('taskflow'):
@@ -144,6 +189,38 @@ class TestHomeView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
         # Assert project column count
         self.assertEqual(response.context['project_col_count'], 4)
 
+    def test_render_custom_cols_error(self):
+        """Test rendering custom columns with a failing bulk retrieval"""
+        plugin = get_app_plugin('filesfolders')
+        project2 = self._make_project(
+            'TestProject2', PROJECT_TYPE_PROJECT, self.category
+        )
+        self._make_assignment(project2, self.user, self.role_owner)
+        value_orig = plugin.get_project_list_value
+
+        def get_value(column_id, project, user):
+            if project == project2:
+                raise Exception('Value failed')
+
+            return value_orig(column_id, project, user)
+
+        with patch.object(
+            plugin, 'get_project_list_values', side_effect=Exception('Failed')
+        ), patch.object(
+            plugin, 'get_project_list_value', side_effect=get_value
+        ):
+            with self.assertLogs('projectroles.views', level='ERROR') as cm:
+                with self.login(self.user):
+                    response = self.client.get(reverse('home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(cm.output), 4)  # Bulk and project2 per column
+
+        # Values are retrieved per project, omitting the failed project
+        for col in response.context['project_custom_cols']:
+            self.assertIn(str(self.project.sodar_uuid), col['data'])
+            self.assertNotIn(str(project2.sodar_uuid), col['data'])
+
 
 class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
     """Tests for the project search view"""
@@ -180,6 +257,23 @@ class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
             len([p for p in self.plugins if p.search_enable]),
         )
 
+    @override_settings(PROJECTROLES_SEARCH_PROJECT_LIMIT=1)
+    def test_render_project_limit(self):
+        """Test limiting project search results"""
+        project2 = self._make_project(
+            'TestProject2', PROJECT_TYPE_PROJECT, self.category
+        )
+        self._make_assignment(project2, self.user, self.role_owner)
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:search') + '?' + urlencode({'s': 'test'})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['project_results'], [self.project])
+        self.assertContains(response, 'Some results may be omitted')
+
     def test_render_search_type(self):
         """Test to ensure the project search view renders correctly with a search type"""
         with self.login(self.user):
@@ -209,6 +303,74 @@ class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
             ),
         )
 
+    def _get_search_view(self):
+        """Return ProjectSearchView with a request for self.user"""
+        view = ProjectSearchView()
+        view.request = self.req_factory.get(reverse('projectroles:search'))
+        view.request.user = self.user
+        return view
+
+    @override_settings(PROJECTROLES_SEARCH_THREADS=4)
+    def test_search_threads(self):
+        """Test running app searches concurrently"""
+        search_apps = [
+            DummySearchPlugin('app{}'.format(i), sleep=0.5) for i in range(3)
+        ]
+        time_start = time.monotonic()
+        data = self._get_search_view()._get_app_search_data(
+            search_apps, 'test', None, {}
+        )
+        self.assertLess(time.monotonic() - time_start, 1.5)
+        self.assertEqual([d['plugin'] for d in data], search_apps)
+
+        for d in data:
+            self.assertEqual(d['results'], {'all': {'items': ['test']}})
+            self.assertIsNone(d['error'])
+            self.assertGreaterEqual(d['time'], 0.5)
+
+    @override_settings(
+        PROJECTROLES_SEARCH_THREADS=4, PROJECTROLES_SEARCH_TIMEOUT=0.5
+    )
+    def test_search_threads_timeout(self):
+        """Test returning partial results for app searches exceeding timeout"""
+        search_apps = [
+            DummySearchPlugin('fast'),
+            DummySearchPlugin('slow', sleep=SEARCH_SLEEP),
+        ]
+        time_start = time.monotonic()
+        data = self._get_search_view()._get_app_search_data(
+            search_apps, 'test', None, {}
+        )
+        self.assertLess(time.monotonic() - time_start, SEARCH_SLEEP)
+        self.assertEqual(data[0]['results'], {'all': {'items': ['test']}})
+        self.assertIsNone(data[0]['error'])
+        self.assertIsNone(data[1]['results'])
+        self.assertEqual(data[1]['error'], 'Search timed out')
+        self.assertIsNone(data[1]['time'])
+
+    @override_settings(PROJECTROLES_SEARCH_THREADS=4)
+    def test_search_threads_executor(self):
+        """Test sharing the search executor between requests"""
+        view = self._get_search_view()
+        executor = view._get_search_executor(4)
+        self.assertEqual(
+            self._get_search_view()._get_search_executor(4), executor
+        )
+        self.assertLessEqual(executor._max_workers, 4)
+
+    def test_search_exception(self):
+        """Test handling an exception raised in app search"""
+        search_apps = [
+            DummySearchPlugin('fail', fail=True),
+            DummySearchPlugin('app'),
+        ]
+        data = self._get_search_view()._get_app_search_data(
+            search_apps, 'test', None, {}
+        )
+        self.assertIsNone(data[0]['results'])
+        self.assertEqual(data[0]['error'], 'Search failed')
+        self.assertEqual(data[1]['results'], {'all': {'items': ['test']}})
+
     @override_settings(PROJECTROLES_ENABLE_SEARCH=False)
     def test_disable_search(self):
         """Test redirecting the view due to search being disabled"""
@@ -219,6 +381,55 @@ class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
             self.assertRedirects(response, reverse('home'))
 
 
+class TestProjectSearchViewThreads(
+    ProjectMixin, RoleAssignmentMixin, TransactionTestCase, BaseTestCase
+):
+    """
+    Tests for app searches in worker threads of the project search view. Data
+    is committed so it is visible to the connections of the worker threads.
+    """
+
+    def setUp(self):
+        self.user = self.make_user('user')
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, None
+        )
+        self.role_owner = Role.objects.get_or_create(name=PROJECT_ROLE_OWNER)[0]
+        self.owner_as = self._make_assignment(
+            self.project, self.user, self.role_owner
+        )
+        self.view = ProjectSearchView()
+        self.view.request = RequestFactory().get(reverse('projectroles:search'))
+        self.view.request.user = self.user
+
+    @override_settings(PROJECTROLES_SEARCH_THREADS=4)
+    def test_search_threads_db(self):
+        """Test app searches reading from the database in worker threads"""
+        RoleCache.start_request()
+        RoleCache.get_assignment(self.user, self.project)
+        user_cache = getattr(self.user, RoleCache.attr_name)
+        RoleCache.end_request()
+        search_apps = [
+            DummyRoleSearchPlugin('app{}'.format(i)) for i in range(3)
+        ]
+        data = self.view._get_app_search_data(search_apps, 'test', None, {})
+
+        for d in data:
+            self.assertIsNone(d['error'])
+            self.assertEqual(d['results'], {'all': {'items': [self.owner_as]}})
+
+        # Each thread uses its own copy of the user and role cache
+        users = [p.user for p in search_apps]
+        self.assertEqual(len(set(id(u) for u in users)), len(search_apps))
+
+        for user in users:
+            self.assertIsNot(user, self.user)
+            self.assertEqual(user, self.user)
+            self.assertIsNot(
+                getattr(user, RoleCache.attr_name, None), user_cache
+            )
+
+
 class TestProjectDetailView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
     """Tests for Project detail view"""
 
@@ -1920,6 +2131,10 @@ class TestRemoteSiteCreateView(RemoteSiteMixin, TestViewsBase):
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': site.sodar_uuid,
             'user_display': REMOTE_SITE_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 1,  # Increased on save
+            'sync_etag': None,
         }
 
         model_dict = model_to_dict(site)
@@ -1962,6 +2177,10 @@ class TestRemoteSiteCreateView(RemoteSiteMixin, TestViewsBase):
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': site.sodar_uuid,
             'user_display': REMOTE_SITE_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 0,
+            'sync_etag': None,
         }
 
         model_dict = model_to_dict(site)
@@ -2078,6 +2297,10 @@ class TestRemoteSiteUpdateView(RemoteSiteMixin, TestViewsBase):
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': site.sodar_uuid,
             'user_display': REMOTE_SITE_USER_DISPLAY,
+            'sync_token': None,
+            'sync_hashes': {},
+            'sync_version': 2,  # Increased on create and update
+            'sync_etag': None,
         }
 
         model_dict = model_to_dict(site)
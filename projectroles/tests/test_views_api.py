@@ -1,5 +1,6 @@
 """REST API view tests for the projectroles app"""
 import base64
+import gzip
 import json
 import pytz
 
@@ -15,7 +16,11 @@ from test_plus.test import APITestCase
 
 from projectroles import views_api
 from projectroles.models import Project, Role, RoleAssignment, SODAR_CONSTANTS
-from projectroles.plugins import change_plugin_status, get_backend_api
+from projectroles.plugins import (
+    PluginRegistry,
+    change_plugin_status,
+    get_backend_api,
+)
 from projectroles.remote_projects import RemoteProjectAPI
 from projectroles.tests.test_models import (
     ProjectMixin,
@@ -192,6 +197,9 @@ class TestAPIViewsBase(
     """Base API test view with knox authentication"""
 
     def setUp(self):
+        # Plugin status changes of previous tests may have been rolled back
+        PluginRegistry.refresh()
+
         # Force disabling of taskflow plugin if it's available
         if get_backend_api('taskflow'):
             change_plugin_status(
@@ -2045,11 +2053,153 @@ class TestRemoteProjectGetAPIView(
 
         self.assertEqual(response.status_code, 200)
 
+        self.target_site.refresh_from_db()
         expected = self.remote_api.get_target_data(self.target_site)
-        response_dict = json.loads(response.content.decode('utf-8'))
+        expected['sync_token'] = self.target_site.sync_token
+        expected['sync_delta'] = False
+        response_dict = json.loads(
+            b''.join(response.streaming_content).decode('utf-8')
+        )
+
+        self.assertEqual(response_dict, expected)
+
+    def test_get_gzip(self):
+        """Test retrieving compressed project data to the target site"""
+        response = self.client.get(
+            reverse(
+                'projectroles:api_remote_get',
+                kwargs={'secret': REMOTE_SITE_SECRET},
+            ),
+            HTTP_ACCEPT_ENCODING='gzip, deflate',
+        )
 
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.target_site.refresh_from_db()
+        expected = self.remote_api.get_target_data(self.target_site)
+        expected['sync_token'] = self.target_site.sync_token
+        expected['sync_delta'] = False
+        response_dict = json.loads(
+            gzip.decompress(b''.join(response.streaming_content)).decode(
+                'utf-8'
+            )
+        )
         self.assertEqual(response_dict, expected)
 
+    def test_get_gzip_rejected(self):
+        """Test retrieving project data with gzip explicitly not accepted"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+
+        for header in ['gzip;q=0', 'deflate, gzip; q=0.0', '*;q=0', 'br']:
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING=header)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            json.loads(b''.join(response.streaming_content).decode('utf-8'))
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='br, *;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_get_since(self):
+        """Test retrieving project data changed since the previous sync"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        sync_token = json.loads(
+            b''.join(response.streaming_content).decode('utf-8')
+        )['sync_token']
+        response = self.client.get(url, {'since': sync_token})
+
+        self.assertEqual(response.status_code, 200)
+        self.target_site.refresh_from_db()
+        expected = {
+            'users': {},
+            'projects': {},
+            'peer_sites': {},
+            'deleted': {'users': [], 'projects': [], 'peer_sites': []},
+            'sync_token': self.target_site.sync_token,
+            'sync_delta': True,
+        }
+        self.assertEqual(
+            json.loads(b''.join(response.streaming_content).decode('utf-8')),
+            expected,
+        )
+
+    def test_get_not_modified(self):
+        """Test retrieving unchanged project data with an ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        etag = response['ETag']
+        sync_token = json.loads(
+            b''.join(response.streaming_content).decode('utf-8')
+        )['sync_token']
+        response = self.client.get(
+            url, {'since': sync_token}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.target_site.refresh_from_db()
+        self.assertEqual(self.target_site.sync_token, sync_token)
+
+    def test_get_modified(self):
+        """Test retrieving changed project data with an ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        etag = response['ETag']
+        sync_token = json.loads(
+            b''.join(response.streaming_content).decode('utf-8')
+        )['sync_token']
+        self.project.description = 'New description'
+        self.project.save()
+        response = self.client.get(
+            url, {'since': sync_token}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response_dict = json.loads(
+            b''.join(response.streaming_content).decode('utf-8')
+        )
+        self.assertEqual(
+            response_dict['projects'][str(self.project.sodar_uuid)][
+                'description'
+            ],
+            'New description',
+        )
+
+    @override_settings(PROJECTROLES_REMOTE_SYNC_INTERVAL=60)
+    def test_get_rate_limit(self):
+        """Test retrieving project data with a rate limit"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+    def test_get_metrics(self):
+        """Test sync metrics after retrieving project data"""
+        response = self.client.get(
+            reverse(
+                'projectroles:api_remote_get',
+                kwargs={'secret': REMOTE_SITE_SECRET},
+            )
+        )
+        content = b''.join(response.streaming_content)
+
+        metrics = self.remote_api.get_sync_metrics(self.target_site)
+        self.assertEqual(metrics['size'], len(content))
+        self.assertEqual(metrics['delta'], False)
+
     def test_get_invalid_secret(self):
         """Test retrieving project data with an invalid secret (should fail)"""
 
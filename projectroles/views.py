@@ -1,9 +1,14 @@
 """UI views for the projectroles app"""
 
+import copy
 import json
+import logging
 import re
 import requests
-import urllib.request
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 from django.apps import apps
 from django.conf import settings
@@ -11,7 +16,7 @@ from django.core.exceptions import ImproperlyConfigured
 from django.contrib import auth
 from django.contrib import messages
 from django.contrib.auth.mixins import AccessMixin
-from django.db import transaction
+from django.db import connection, transaction
 from django.shortcuts import redirect
 from django.urls import resolve, reverse
 from django.utils import timezone
@@ -41,6 +46,7 @@ from projectroles.models import (
     Project,
     Role,
     RoleAssignment,
+    RoleCache,
     ProjectInvite,
     RemoteSite,
     RemoteProject,
@@ -82,6 +88,12 @@ APP_SETTING_SCOPE_PROJECT = SODAR_CONSTANTS['APP_SETTING_SCOPE_PROJECT']
 APP_NAME = 'projectroles'
 KIOSK_MODE = getattr(settings, 'PROJECTROLES_KIOSK_MODE', False)
 PROJECT_COLUMN_COUNT = 2  # Default columns
+SEARCH_THREADS = 4  # Default max threads for app searches
+SEARCH_TIMEOUT = 10  # Default time limit in seconds for app searches
+SEARCH_PROJECT_LIMIT = 500  # Default max amount of project search results
+# Executor shared by all app searches in the process, created on first use
+SEARCH_EXECUTOR = None
+SEARCH_EXECUTOR_LOCK = threading.Lock()
 
 
 # API constants for internal SODAR Core apps
@@ -90,6 +102,8 @@ PROJECT_COLUMN_COUNT = 2  # Default columns
 # Access Django user model
 User = auth.get_user_model()
 
+logger = logging.getLogger(__name__)
+
 # App settings API
 app_settings = AppSettingAPI()
 
@@ -224,9 +238,7 @@ class ProjectPermissionMixin(PermissionRequiredMixin, ProjectAccessMixin):
 
         # Disable access for non-owner/delegate if remote project is revoked
         if project and project.is_revoked():
-            role_as = RoleAssignment.objects.filter(
-                project=project, user=self.request.user
-            ).first()
+            role_as = RoleCache.get_assignment(self.request.user, project)
 
             if role_as and role_as.role.name not in [
                 PROJECT_ROLE_OWNER,
@@ -390,36 +402,41 @@ class ProjectListContextMixin:
         :param user: User for which the projects are visible
         :param parent: Project object or None
         """
-        project_list = []
-        flat_list = []
-
-        if user.is_superuser:
-            project_list = Project.objects.filter(
-                parent=parent, submit_status='OK'
-            ).order_by('title')
-
-        elif not user.is_anonymous():
-            project_list = [
-                p
-                for p in Project.objects.filter(
-                    parent=parent, submit_status='OK'
-                ).order_by('title')
-                if p.has_role(user, include_children=True)
-            ]
+        return Project.objects.get_project_list(user, parent)
 
-        def _append_projects(project):
-            lst = [project]
+    @classmethod
+    def _get_col_values(cls, app_plugin, column_id, projects, user):
+        """
+        Return custom column values by calling get_project_list_value() for
+        each project, omitting values of projects raising an exception.
 
-            for c in project.get_children():
-                if user.is_superuser or c.has_role(user, include_children=True):
-                    lst += _append_projects(c)
+        :param app_plugin: ProjectAppPluginPoint object
+        :param column_id: ID of the column (string)
+        :param projects: List of Project objects
+        :param user: User object
+        :return: Dict of {project sodar_uuid (string): value}
+        """
+        ret = {}
 
-            return lst
+        for project in projects:
+            try:
+                ret[
+                    str(project.sodar_uuid)
+                ] = app_plugin.get_project_list_value(column_id, project, user)
 
-        for p in project_list:
-            flat_list += _append_projects(p)
+            except Exception as ex:
+                logger.error(
+                    'Exception in get_project_list_value() for app "{}" '
+                    'column "{}" in project "{}" ({}): {}'.format(
+                        app_plugin.name,
+                        column_id,
+                        project.title,
+                        project.sodar_uuid,
+                        ex,
+                    )
+                )
 
-        return flat_list
+        return ret
 
     def _get_custom_cols(self, user, project_list):
         """
@@ -430,6 +447,7 @@ class ProjectListContextMixin:
         """
         i = 0
         cols = []
+        projects = [p for p in project_list if p.type == PROJECT_TYPE_PROJECT]
 
         for app_plugin in [
             ap
@@ -440,20 +458,22 @@ class ProjectListContextMixin:
                 v['app_plugin'] = app_plugin
                 v['key'] = k
                 v['ordering'] = v.get('ordering') or i
-                v['data'] = {}
-
-                for p in [
-                    p for p in project_list if p.type == PROJECT_TYPE_PROJECT
-                ]:
-                    try:
-                        v['data'][
-                            str(p.sodar_uuid)
-                        ] = app_plugin.get_project_list_value(
-                            k, p, self.request.user
-                        )
 
-                    except Exception:
-                        pass  # TODO: Logging
+                try:
+                    v['data'] = app_plugin.get_project_list_values(
+                        k, projects, user
+                    )
+
+                except Exception as ex:
+                    logger.error(
+                        'Exception in get_project_list_values() for app "{}" '
+                        'column "{}", retrieving values per project: {}'.format(
+                            app_plugin.name, k, ex
+                        )
+                    )
+                    v['data'] = self._get_col_values(
+                        app_plugin, k, projects, user
+                    )
 
                 cols.append(v)
                 i += 1
@@ -595,15 +615,21 @@ class ProjectSearchView(LoginRequiredMixin, TemplateView):
         context['search_type'] = search_type
         context['search_keywords'] = search_keywords
 
-        # Get project results
+        # Get project results, slicing the queryset to only fetch max limit
         if not search_type or search_type == 'project':
-            context['project_results'] = [
-                p
-                for p in Project.objects.find(
-                    search_term, project_type='PROJECT'
-                )
-                if self.request.user.has_perm('projectroles.view_project', p)
-            ]
+            limit = getattr(
+                settings,
+                'PROJECTROLES_SEARCH_PROJECT_LIMIT',
+                SEARCH_PROJECT_LIMIT,
+            )
+            context['project_results'] = list(
+                Project.objects.find(
+                    search_term,
+                    project_type=PROJECT_TYPE_PROJECT,
+                    user=self.request.user,
+                )[:limit]
+            )
+            context['project_result_limit'] = limit
 
         # Get app results
         if search_type:
@@ -622,22 +648,152 @@ class ProjectSearchView(LoginRequiredMixin, TemplateView):
                 key=lambda x: x.plugin_ordering,
             )
 
-        context['app_search_data'] = []
+        context['app_search_data'] = self._get_app_search_data(
+            search_apps, search_term, search_type, search_keywords
+        )
+        return context
 
-        for plugin in search_apps:
-            context['app_search_data'].append(
-                {
-                    'plugin': plugin,
-                    'results': plugin.search(
-                        search_term,
-                        self.request.user,
-                        search_type,
-                        search_keywords,
-                    ),
-                }
+    def _search_app(
+        self,
+        plugin,
+        search_term,
+        search_type,
+        search_keywords,
+        user=None,
+        thread=False,
+    ):
+        """
+        Run search for a single app plugin.
+
+        :param plugin: ProjectAppPluginPoint object
+        :param search_term: Search term (string)
+        :param search_type: Search type (string or None)
+        :param search_keywords: Search keywords (dict)
+        :param user: User object (optional, defaults to request user)
+        :param thread: Whether the search is run in a worker thread (bool)
+        :return: Dict
+        """
+        ret = {'plugin': plugin, 'results': None, 'error': None}
+        time_start = time.monotonic()
+
+        try:
+            ret['results'] = plugin.search(
+                search_term,
+                user or self.request.user,
+                search_type,
+                search_keywords,
             )
 
-        return context
+        except Exception as ex:
+            logger.error(
+                'Exception in search() for app "{}": {}'.format(plugin.name, ex)
+            )
+            ret['error'] = 'Search failed'
+
+        finally:
+            # Worker threads open their own connections, release them here
+            if thread:
+                connection.close()
+
+        ret['time'] = time.monotonic() - time_start
+        logger.debug(
+            'Search for app "{}" took {:.3f}s'.format(plugin.name, ret['time'])
+        )
+        return ret
+
+    @staticmethod
+    def _get_search_executor(max_threads):
+        """
+        Return the thread pool executor shared by app searches in all requests
+        of the process, bounding the total number of search threads.
+
+        :param max_threads: Maximum number of threads (int)
+        :return: ThreadPoolExecutor object
+        """
+        global SEARCH_EXECUTOR
+
+        with SEARCH_EXECUTOR_LOCK:
+            if not SEARCH_EXECUTOR:
+                SEARCH_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max_threads, thread_name_prefix='search'
+                )
+
+        return SEARCH_EXECUTOR
+
+    def _get_thread_user(self):
+        """
+        Return a copy of the request user for a worker thread, so threads do
+        not share the role cache stored in the user object.
+
+        :return: User object
+        """
+        user = copy.copy(self.request.user)
+        RoleCache.reset(user)
+        return user
+
+    def _get_app_search_data(
+        self, search_apps, search_term, search_type, search_keywords
+    ):
+        """
+        Run app plugin searches, concurrently if enabled in settings. If an app
+        exceeds the time limit, its results are omitted and the other results
+        are returned. Searches are run in a thread pool shared by all requests,
+        so a timed out search occupies a thread until it finishes.
+
+        :param search_apps: List of ProjectAppPluginPoint objects
+        :param search_term: Search term (string)
+        :param search_type: Search type (string or None)
+        :param search_keywords: Search keywords (dict)
+        :return: List of dicts
+        """
+        max_threads = getattr(
+            settings, 'PROJECTROLES_SEARCH_THREADS', SEARCH_THREADS
+        )
+        timeout = getattr(
+            settings, 'PROJECTROLES_SEARCH_TIMEOUT', SEARCH_TIMEOUT
+        )
+        args = [search_term, search_type, search_keywords]
+
+        if max_threads <= 1 or len(search_apps) <= 1:
+            return [self._search_app(p, *args) for p in search_apps]
+
+        executor = self._get_search_executor(max_threads)
+        futures = [
+            executor.submit(
+                self._search_app,
+                p,
+                *args,
+                user=self._get_thread_user(),
+                thread=True
+            )
+            for p in search_apps
+        ]
+        deadline = time.monotonic() + timeout
+        ret = []
+
+        for plugin, future in zip(search_apps, futures):
+            try:
+                ret.append(
+                    future.result(timeout=max(deadline - time.monotonic(), 0))
+                )
+
+            except TimeoutError:
+                future.cancel()
+                logger.warning(
+                    'Search for app "{}" timed out after {}s'.format(
+                        plugin.name, timeout
+                    )
+                )
+                ret.append(
+                    {
+                        'plugin': plugin,
+                        'results': None,
+                        'error': 'Search timed out',
+                        'time': None,
+                    }
+                )
+
+        return ret
 
     def get(self, request, *args, **kwargs):
         if not getattr(settings, 'PROJECTROLES_ENABLE_SEARCH', False):
@@ -2507,11 +2663,6 @@ class RemoteProjectsSyncView(
 
     def get(self, request, *args, **kwargs):
         """Override get() for a confirmation view"""
-        from projectroles.views_api import (
-            CORE_API_MEDIA_TYPE,
-            CORE_API_DEFAULT_VERSION,
-        )
-
         remote_api = RemoteProjectAPI()
         redirect_url = reverse('projectroles:remote_sites')
 
@@ -2524,20 +2675,8 @@ class RemoteProjectsSyncView(
         context = self.get_context_data(*args, **kwargs)
         site = context['site']
 
-        api_url = site.get_url() + reverse(
-            'projectroles:api_remote_get', kwargs={'secret': site.secret}
-        )
-
         try:
-            api_req = urllib.request.Request(api_url)
-            api_req.add_header(
-                'accept',
-                '{}; version={}'.format(
-                    CORE_API_MEDIA_TYPE, CORE_API_DEFAULT_VERSION
-                ),
-            )
-            response = urllib.request.urlopen(api_req)
-            remote_data = json.loads(response.read().decode('utf-8'))
+            remote_data = remote_api.get_remote_data(site)
 
         except Exception as ex:
             ex_str = str(ex)
@@ -2553,6 +2692,13 @@ class RemoteProjectsSyncView(
             )
             return redirect(redirect_url)
 
+        if remote_data is None:
+            messages.warning(
+                request,
+                'No changes in remote site detected, nothing to synchronize',
+            )
+            return redirect(redirect_url)
+
         # Sync data
         try:
             update_data = remote_api.sync_source_data(
@@ -1,11 +1,14 @@
 """REST API views for the samplesheets app"""
 
 import re
+import time
 
 from django.conf import settings
 from django.contrib import auth
 from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponseNotModified, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 
 from rest_framework import serializers
 from rest_framework.exceptions import APIException, PermissionDenied
@@ -620,6 +623,36 @@ class RemoteProjectGetAPIView(CoreAPIBaseMixin, APIView):
 
     permission_classes = (AllowAny,)  # We check the secret in get()/post()
 
+    @staticmethod
+    def _accepts_gzip(request):
+        """
+        Return True if the Accept-Encoding header of the request accepts gzip
+        with a non-zero quality value, either explicitly or with "*".
+
+        :param request: Request object
+        :return: Boolean
+        """
+        qvalues = {}
+
+        for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+            params = part.split(';')
+            coding = params[0].strip().lower()
+            q = 1.0
+
+            for param in params[1:]:
+                k, _, v = param.partition('=')
+
+                if k.strip().lower() == 'q':
+                    try:
+                        q = float(v)
+
+                    except ValueError:
+                        q = 0.0
+
+            qvalues[coding] = q
+
+        return qvalues.get('gzip', qvalues.get('*', 0.0)) > 0
+
     def get(self, request, *args, **kwargs):
         remote_api = RemoteProjectAPI()
         secret = kwargs['secret']
@@ -632,9 +665,64 @@ class RemoteProjectGetAPIView(CoreAPIBaseMixin, APIView):
         except RemoteSite.DoesNotExist:
             return Response('Remote site not found, unauthorized', status=401)
 
-        sync_data = remote_api.get_target_data(target_site)
+        # Return 304 if nothing has changed since the latest sync
+        etag = remote_api.get_sync_etag(target_site)
+        since = request.GET.get('since')
+
+        if (
+            etag
+            and since == target_site.sync_token
+            and request.META.get('HTTP_IF_NONE_MATCH') == etag
+        ):
+            target_site.projects.all().update(date_access=timezone.now())
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+        # Limit the rate of data retrieval for the target site
+        if not remote_api.check_sync_rate(target_site):
+            response = Response(
+                'Sync rate limit exceeded, retry later', status=429
+            )
+            response['Retry-After'] = getattr(
+                settings, 'PROJECTROLES_REMOTE_SYNC_INTERVAL', 0
+            )
+            return response
+
+        start_time = time.time()
+        sync_data = remote_api.get_sync_data(target_site, since)
 
         # Update access date for target site remote projects
         target_site.projects.all().update(date_access=timezone.now())
 
-        return Response(sync_data, status=200)
+        def _stream(compress):
+            size = 0
+
+            for chunk in remote_api.stream_sync_data(sync_data, compress):
+                size += len(chunk)
+                yield chunk
+
+            remote_api.set_sync_metrics(
+                target_site,
+                time.time() - start_time,
+                size,
+                sync_data['sync_delta'],
+            )
+
+        # Render and compress the response in chunks
+        compress = self._accepts_gzip(request)
+        response = StreamingHttpResponse(
+            _stream(compress),
+            content_type='{}; version={}'.format(
+                CORE_API_MEDIA_TYPE, request.version
+            ),
+            status=200,
+        )
+
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+
+        response['ETag'] = remote_api.get_sync_etag(target_site)
+
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
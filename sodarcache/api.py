@@ -1,8 +1,15 @@
 """Sodarcache API for adding and updating cache items"""
 
 import logging
+import threading
+import uuid
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
 
 # Projectroles dependency
 from projectroles.plugins import get_active_plugins
@@ -15,6 +22,30 @@ from sodarcache.models import JSONCacheItem
 APP_NAMES = get_app_names()
 LABEL_MAX_WIDTH = 32
 CACHE_TYPES = ['json']
+CACHE_KEY_PREFIX = 'sodar_core.sodarcache'
+CACHE_VERSION_KEY = CACHE_KEY_PREFIX + '.version'
+CACHE_TIMEOUT = 60  # Default cache timeout in seconds
+UPSERT_BATCH_SIZE = 500
+UPSERT_FIELDS = [
+    'project_id',
+    'app_name',
+    'name',
+    'data',
+    'user_id',
+    'date_modified',
+    'sodar_uuid',
+]
+# Conflict targets for the unique constraints of items with or without project
+UPSERT_TARGET_PROJECT = '(project_id, app_name, name)'
+UPSERT_TARGET_NO_PROJECT = '(app_name, name) WHERE project_id IS NULL'
+UPSERT_SQL = '''
+INSERT INTO {table} ({fields}) VALUES {values}
+ON CONFLICT {target} DO UPDATE SET
+data = EXCLUDED.data,
+date_modified = EXCLUDED.date_modified,
+user_id = COALESCE(EXCLUDED.user_id, {table}.user_id)
+RETURNING id, name, user_id, sodar_uuid
+'''
 
 # Access Django user model
 User = get_user_model()
@@ -27,6 +58,10 @@ class SodarCacheAPI:
 
     # TODO: Make model selection dynamic once we introduce types other than JSON
 
+    # Hit and miss counts of the current process
+    stats = {'hits': 0, 'misses': 0}
+    stats_lock = threading.Lock()
+
     # Internal functions -------------------------------------------------------
 
     @classmethod
@@ -50,6 +85,138 @@ class SodarCacheAPI:
                 )
             )
 
+    @classmethod
+    def _get_cache_version(cls):
+        """Return current version of cached items, initializing if not set"""
+        cache.add(CACHE_VERSION_KEY, 1, None)
+        return cache.get(CACHE_VERSION_KEY, 1)
+
+    @classmethod
+    def _get_cache_key(cls, app_name, name, project=None):
+        """
+        Return cache key for an item.
+
+        :param app_name: Name of the app which sets the item (string)
+        :param name: Item name (string)
+        :param project: Project object or pk (optional)
+        :return: String
+        """
+        return '{}.item.{}.{}.{}'.format(
+            CACHE_KEY_PREFIX,
+            getattr(project, 'pk', project) or '',
+            app_name,
+            name,
+        )
+
+    @classmethod
+    def _incr_cache_stat(cls, stat):
+        """Increment hit or miss counter of cached items"""
+        with cls.stats_lock:
+            cls.stats[stat] += 1
+
+    @classmethod
+    def _set_cached_item(cls, item, version, cache_key=None):
+        """
+        Store a copy of an item without related objects in the cache along
+        with the cache version it is valid for.
+
+        :param item: JSONCacheItem object
+        :param version: Cache version (int)
+        :param cache_key: Cache key (string, optional, built from item if unset)
+        """
+        values = {
+            f.attname: getattr(item, f.attname)
+            for f in item._meta.concrete_fields
+        }
+        cache.set(
+            cache_key
+            or cls._get_cache_key(item.app_name, item.name, item.project_id),
+            (version, JSONCacheItem(**values)),
+            getattr(settings, 'SODARCACHE_CACHE_TIMEOUT', CACHE_TIMEOUT),
+        )
+
+    @classmethod
+    def _upsert_items(cls, app_name, items, project=None, user=None):
+        """
+        Insert or update JSON cache items with a single query per batch and
+        write them through to the Django cache. If user is not set, the user
+        of an existing item is retained.
+
+        :param app_name: Name of the app which sets the items (string)
+        :param items: Dict of {name: data}
+        :param project: Project object (optional)
+        :param user: User object (optional)
+        :return: List of JSONCacheItem objects
+        """
+        meta = JSONCacheItem._meta
+        fields = [meta.get_field(f) for f in UPSERT_FIELDS]
+        table = connection.ops.quote_name(meta.db_table)
+        now = timezone.now()
+        ret = []
+
+        with transaction.atomic(savepoint=False), connection.cursor() as cursor:
+            names = list(items.keys())
+
+            for i in range(0, len(names), UPSERT_BATCH_SIZE):
+                batch = names[i : i + UPSERT_BATCH_SIZE]
+                params = []
+
+                for name in batch:
+                    values = [
+                        project.pk if project else None,
+                        app_name,
+                        name,
+                        items[name],
+                        user.pk if user else None,
+                        now,
+                        uuid.uuid4(),
+                    ]
+                    params += [
+                        f.get_db_prep_value(v, connection)
+                        for f, v in zip(fields, values)
+                    ]
+
+                cursor.execute(
+                    UPSERT_SQL.format(
+                        table=table,
+                        fields=', '.join(f.column for f in fields),
+                        values=', '.join(
+                            ['({})'.format(', '.join(['%s'] * len(fields)))]
+                            * len(batch)
+                        ),
+                        target=UPSERT_TARGET_PROJECT
+                        if project
+                        else UPSERT_TARGET_NO_PROJECT,
+                    ),
+                    params,
+                )
+                ret += [
+                    JSONCacheItem(
+                        id=pk,
+                        project=project,
+                        app_name=app_name,
+                        name=name,
+                        data=items[name],
+                        user_id=user_id,
+                        date_modified=now,
+                        sodar_uuid=sodar_uuid,
+                    )
+                    for pk, name, user_id, sodar_uuid in cursor.fetchall()
+                ]
+
+        version = cls._get_cache_version()
+
+        for item in ret:
+            cls._set_cached_item(item, version)
+
+        # Invalidate items cached for lookups without a project
+        if project:
+            cache.delete_many(
+                [cls._get_cache_key(app_name, item.name) for item in ret]
+            )
+
+        return ret
+
     # API functions ------------------------------------------------------------
 
     @classmethod
@@ -109,6 +276,8 @@ class SodarCacheAPI:
 
         if items:
             item_count = items.count()
+            # Cached copies of deleted items are removed by the post_delete
+            # signal, so other cached items remain valid
             items.delete()
             logger.info(
                 'Deleted {} item{} from cache(app={}, project={})'.format(
@@ -127,11 +296,35 @@ class SodarCacheAPI:
         )
         return 0
 
+    @classmethod
+    def invalidate_cache(cls):
+        """
+        Invalidate all items stored in the Django cache by incrementing the
+        cache version. Database items are not affected.
+        """
+        try:
+            cache.incr(CACHE_VERSION_KEY)
+
+        except ValueError:
+            cache.set(CACHE_VERSION_KEY, 1, None)
+
+    @classmethod
+    def get_cache_stats(cls):
+        """
+        Return hit and miss counts for item retrieval from the Django cache in
+        the current process.
+
+        :return: Dict
+        """
+        with cls.stats_lock:
+            return dict(cls.stats)
+
     @classmethod
     def get_cache_item(cls, app_name, name, project=None):
         """
         Return cached data by app_name, name (identifier) and optional project.
-        Returns None if not found.
+        Returns None if not found. Found items are read through the Django
+        cache, with changes invalidating the cached item.
 
         :param name: Item name (string)
         :param app_name: Name of the app which sets the item (string)
@@ -140,20 +333,36 @@ class SodarCacheAPI:
         :raise: ValueError if app_name is invalid
         """
         cls._check_app_name(app_name)
+        cache_key = cls._get_cache_key(app_name, name, project)
+        # Get the item and the current version in a single cache lookup
+        values = cache.get_many([CACHE_VERSION_KEY, cache_key])
+        version = values.get(CACHE_VERSION_KEY) or cls._get_cache_version()
+        cached = values.get(cache_key)
+
+        if cached and cached[0] == version:
+            cls._incr_cache_stat('hits')
+            return cached[1]
 
+        cls._incr_cache_stat('misses')
         query_string = {'app_name': app_name, 'name': name}
 
         if project:
             query_string['project'] = project
 
-        return JSONCacheItem.objects.filter(**query_string).first()
+        item = JSONCacheItem.objects.filter(**query_string).first()
+
+        if item:
+            cls._set_cached_item(item, version, cache_key)
+
+        return item
 
     @classmethod
     def set_cache_item(
         cls, app_name, name, data, data_type='json', project=None, user=None
     ):
         """
-        Create or update and save a cache item.
+        Create or update and save a cache item. The item is inserted or
+        updated in a single atomic query.
 
         :param app_name: Name of the app which sets the item (string)
         :param name: Item name (string)
@@ -167,19 +376,10 @@ class SodarCacheAPI:
         """
         cls._check_app_name(app_name)
         cls._check_data_type(data_type)
-        item = cls.get_cache_item(app_name, name, project)
+        item = cls._upsert_items(app_name, {name: data}, project, user)[0]
         log_msg = 'Updated item "{}:{}"'.format(app_name, name)
 
-        if not item:
-            if data_type == 'json':
-                item = JSONCacheItem()
-                item.name = name
-                item.app_name = app_name
-
-        item.data = data
-
         if project:
-            item.project = project
             log_msg += ' in project "{}" ({})'.format(
                 project.title, project.sodar_uuid
             )
@@ -188,10 +388,50 @@ class SodarCacheAPI:
             item.user = user
             log_msg += ' by user "{}"'.format(user.username)
 
-        item.save()
         logger.info(log_msg)
         return item
 
+    @classmethod
+    def set_cache_items(
+        cls, app_name, items, data_type='json', project=None, user=None
+    ):
+        """
+        Create or update multiple cache items of an app in bulk.
+
+        :param app_name: Name of the app which sets the items (string)
+        :param items: Dict of {name: data}
+        :param data_type: String stating the data type of the cache items
+        :param project: Project object (optional)
+        :param user: User object to denote user triggering the update (optional)
+        :return: List of JSONCacheItem objects
+        :raise: ValueError if app_name is invalid
+        :raise: ValueError if data_type is invalid
+        """
+        cls._check_app_name(app_name)
+        cls._check_data_type(data_type)
+
+        if not items:
+            return []
+
+        ret = cls._upsert_items(app_name, items, project, user)
+        log_msg = 'Updated {} item{} for app "{}"'.format(
+            len(ret), 's' if len(ret) != 1 else '', app_name
+        )
+
+        if project:
+            log_msg += ' in project "{}" ({})'.format(
+                project.title, project.sodar_uuid
+            )
+
+        if user:
+            for item in ret:
+                item.user = user
+
+            log_msg += ' by user "{}"'.format(user.username)
+
+        logger.info(log_msg)
+        return ret
+
     @classmethod
     def get_update_time(cls, app_name, name, project=None):
         """
@@ -205,3 +445,37 @@ class SodarCacheAPI:
         """
         item = cls.get_cache_item(app_name, name, project)
         return item.date_modified.timestamp() if item else None
+
+    @classmethod
+    def get_update_times(cls, app_name, project=None):
+        """
+        Return the time of the last update of all cache objects of an app in
+        a project as seconds since epoch, retrieved with a single query.
+
+        :param app_name: Name of the app which sets the items (string)
+        :param project: Project object (optional, items without project if
+                        not set)
+        :return: Dict of {name: float}
+        :raise: ValueError if app_name is invalid
+        """
+        cls._check_app_name(app_name)
+        return {
+            name: date_modified.timestamp()
+            for name, date_modified in JSONCacheItem.objects.filter(
+                app_name=app_name, project=project
+            ).values_list('name', 'date_modified')
+        }
+
+
+def invalidate_cache_item(sender, instance, **kwargs):
+    """Signal for invalidating a cached item on JSONCacheItem changes"""
+    cache.delete_many(
+        [
+            SodarCacheAPI._get_cache_key(instance.app_name, instance.name, p)
+            for p in [instance.project_id, None]
+        ]
+    )
+
+
+post_save.connect(invalidate_cache_item, sender=JSONCacheItem)
+post_delete.connect(invalidate_cache_item, sender=JSONCacheItem)
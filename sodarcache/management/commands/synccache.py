@@ -1,8 +1,14 @@
 import logging
+import queue
+import time
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
+from django.db import connection
 
 # Projectroles dependency
 from projectroles.models import Project
@@ -22,6 +28,143 @@ class Command(BaseCommand):
             type=str,
             help='Limit sync to a project',
         )
+        parser.add_argument(
+            '-w',
+            '--workers',
+            dest='workers',
+            type=int,
+            required=False,
+            default=1,
+            help='Number of worker threads for updating cached data per app '
+            'and project (default: 1)',
+        )
+        parser.add_argument(
+            '-s',
+            '--since',
+            metavar='MINUTES',
+            dest='since',
+            type=int,
+            required=False,
+            default=None,
+            help='Only update items not updated in the last MINUTES minutes',
+        )
+
+    @classmethod
+    def _get_project_label(cls, project):
+        """Return project label for logging"""
+        if not project:
+            return 'no project'
+
+        return 'project "{}" ({})'.format(project.title, project.sodar_uuid)
+
+    @classmethod
+    def _update_project(cls, cache_backend, plugin, project, cutoff):
+        """
+        Update cached data of an app plugin in a project. If cutoff is set,
+        only update items last updated before the cutoff. If project is None,
+        update items not belonging to a project with update_site_cache().
+
+        :param cache_backend: SodarCacheAPI object
+        :param plugin: ProjectAppPluginPoint object
+        :param project: Project object or None
+        :param cutoff: Cutoff time in seconds since epoch (float or None)
+        :return: Dict
+        """
+        ret = {'plugin': plugin, 'project': project, 'error': None}
+        time_start = time.monotonic()
+
+        try:
+            names = [None]
+
+            if cutoff:
+                update_times = cache_backend.get_update_times(
+                    plugin.name, project
+                )
+
+                # Update all items if none have been cached for the project
+                if update_times:
+                    names = [k for k, v in update_times.items() if v < cutoff]
+
+            for name in names:
+                if project:
+                    plugin.update_cache(name=name, project=project)
+
+                else:
+                    plugin.update_site_cache(name=name)
+
+            ret['count'] = len(names)
+
+        except Exception as ex:
+            logger.error(
+                'Update failed for plugin "{}" in {}: "{}"'.format(
+                    plugin.name, cls._get_project_label(project), ex
+                )
+            )
+            ret['error'] = str(ex)
+
+        ret['time'] = time.monotonic() - time_start
+        logger.debug(
+            'Updated plugin "{}" in {} in {:.2f} s'.format(
+                plugin.name, cls._get_project_label(project), ret['time']
+            )
+        )
+        return ret
+
+    @classmethod
+    def _run_worker(cls, cache_backend, jobs, cutoff, results):
+        """
+        Run update jobs from a queue in a worker thread until it is empty.
+
+        :param cache_backend: SodarCacheAPI object
+        :param jobs: Queue of (index, plugin, project) tuples
+        :param cutoff: Cutoff time in seconds since epoch (float or None)
+        :param results: List for storing results by job index
+        """
+        try:
+            while True:
+                try:
+                    i, plugin, project = jobs.get_nowait()
+
+                except queue.Empty:
+                    break
+
+                results[i] = cls._update_project(
+                    cache_backend, plugin, project, cutoff
+                )
+
+        finally:
+            # Worker threads open their own connections, release them here
+            connection.close()
+
+    @classmethod
+    def _log_summary(cls, results):
+        """Log update time summaries per plugin and project"""
+        plugin_times = defaultdict(float)
+        project_times = defaultdict(float)
+        projects = {}
+        skipped = defaultdict(int)
+
+        for r in results:
+            pk = r['project'].pk if r['project'] else None
+            plugin_times[r['plugin'].name] += r['time']
+            project_times[pk] += r['time']
+            projects[pk] = r['project']
+
+            if r['error'] is None and not r['count']:
+                skipped[r['plugin'].name] += 1
+
+        project_count = len([p for p in projects.values() if p])
+
+        for k, v in sorted(plugin_times.items(), key=lambda x: -x[1]):
+            logger.info(
+                'Plugin "{}": {} projects ({} up to date) in {:.2f} s'.format(
+                    k, project_count, skipped[k], v
+                )
+            )
+
+        for k, v in sorted(project_times.items(), key=lambda x: -x[1]):
+            label = cls._get_project_label(projects[k])
+            logger.info('{}{}: {:.2f} s'.format(label[0].upper(), label[1:], v))
 
     def handle(self, *args, **options):
 
@@ -63,22 +206,94 @@ class Command(BaseCommand):
             logger.info('Synchronizing cache for all projects')
 
         plugins = get_active_plugins(plugin_type='project_app')
+        workers = options.get('workers') or 1
+        since = options.get('since')
         errors = False
+        time_start = time.monotonic()
 
-        for plugin in plugins:
-            try:
-                plugin.update_cache(**update_kwargs)
+        # Update all projects in a single call per plugin
+        if workers <= 1 and not since:
+            for plugin in plugins:
+                plugin_start = time.monotonic()
 
-            except Exception as ex:
-                logger.error(
-                    'Update failed for plugin "{}": "{}"'.format(
-                        plugin.name, ex
+                try:
+                    plugin.update_cache(**update_kwargs)
+
+                except Exception as ex:
+                    logger.error(
+                        'Update failed for plugin "{}": "{}"'.format(
+                            plugin.name, ex
+                        )
+                    )
+                    errors = True
+
+                logger.info(
+                    'Plugin "{}": {:.2f} s'.format(
+                        plugin.name, time.monotonic() - plugin_start
                     )
                 )
-                errors = True
+
+        # Split updates per plugin and project
+        else:
+            if update_kwargs:
+                projects = [update_kwargs['project']]
+
+            else:
+                projects = list(Project.objects.all().order_by('pk'))
+
+            cutoff = time.time() - since * 60 if since else None
+            jobs = [(p, project) for p in plugins for project in projects]
+
+            # Update items not belonging to a project if not limited
+            if not update_kwargs:
+                jobs += [(p, None) for p in plugins]
+
+            logger.info(
+                'Updating {} plugins in {} projects with {} worker{}{}'.format(
+                    len(plugins),
+                    len(projects),
+                    workers,
+                    's' if workers != 1 else '',
+                    ' (items older than {} minutes)'.format(since)
+                    if since
+                    else '',
+                )
+            )
+
+            if workers <= 1:
+                results = [
+                    self._update_project(cache_backend, p, project, cutoff)
+                    for p, project in jobs
+                ]
+
+            else:
+                job_queue = queue.Queue()
+                results = [None] * len(jobs)
+
+                for i, (p, project) in enumerate(jobs):
+                    job_queue.put((i, p, project))
+
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            self._run_worker,
+                            cache_backend,
+                            job_queue,
+                            cutoff,
+                            results,
+                        )
+                        for _ in range(workers)
+                    ]
+
+                for future in futures:
+                    future.result()
+
+            self._log_summary(results)
+            errors = any(r['error'] is not None for r in results)
 
         logger.info(
-            'Cache synchronization {}'.format(
-                'finished with errors (see logs)' if errors else 'OK'
+            'Cache synchronization {} in {:.2f} s'.format(
+                'finished with errors (see logs)' if errors else 'OK',
+                time.monotonic() - time_start,
             )
         )
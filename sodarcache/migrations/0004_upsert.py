@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 05:09
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+# Remove duplicate items without a project, keeping the latest one
+DELETE_DUPLICATES_SQL = '''
+DELETE FROM sodarcache_jsoncacheitem a
+USING sodarcache_jsoncacheitem b
+WHERE a.project_id IS NULL AND b.project_id IS NULL
+AND a.app_name = b.app_name AND a.name = b.name AND a.id < b.id
+'''
+
+# Unique together does not apply to NULL values, so items without a project
+# need a partial unique index to be used as an upsert conflict target
+CREATE_INDEX_SQL = '''
+CREATE UNIQUE INDEX sodarcache_jsoncacheitem_no_project_uniq
+ON sodarcache_jsoncacheitem (app_name, name) WHERE project_id IS NULL
+'''
+DROP_INDEX_SQL = 'DROP INDEX sodarcache_jsoncacheitem_no_project_uniq'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sodarcache', '0003_add_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jsoncacheitem',
+            name='date_modified',
+            field=models.DateTimeField(auto_now=True, help_text='DateTime of the update'),
+        ),
+        migrations.RunSQL(DELETE_DUPLICATES_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(CREATE_INDEX_SQL, DROP_INDEX_SQL),
+    ]
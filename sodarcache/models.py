@@ -43,7 +43,7 @@ class BaseCacheItem(models.Model):
 
     #: DateTime of the update
     date_modified = models.DateTimeField(
-        auto_now_add=True, help_text='DateTime of the update'
+        auto_now=True, help_text='DateTime of the update'
     )
 
     #: User who updated the item (optional)
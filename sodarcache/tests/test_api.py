@@ -169,6 +169,115 @@ class TestSodarCacheAPI(JsonCacheItemMixin, TestJsonCacheItemBase):
 
         self.assertEqual(model_to_dict(update_item), expected)
 
+    def test_set_cache_value_update_time(self):
+        """Test updating the modification time of a cache item"""
+        item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        update_item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            name='test_item',
+            data={'test_key': 'new_test_val'},
+        )
+        self.assertGreater(update_item.date_modified, item.date_modified)
+        self.assertEqual(
+            JSONCacheItem.objects.get(pk=item.pk).date_modified,
+            update_item.date_modified,
+        )
+
+    def test_set_cache_value_retain_user(self):
+        """Test updating a cache item with no user set"""
+        item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        update_item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            name='test_item',
+            data={'test_key': 'new_test_val'},
+        )
+        self.assertEqual(update_item.pk, item.pk)
+        self.assertEqual(update_item.user, self.user_owner)
+
+    def test_set_cache_value_no_project(self):
+        """Test updating a cache item with no project"""
+        item = self.cache_backend.set_cache_item(
+            app_name=TEST_APP_NAME,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        update_item = self.cache_backend.set_cache_item(
+            app_name=TEST_APP_NAME,
+            name='test_item',
+            data={'test_key': 'new_test_val'},
+        )
+        self.assertEqual(JSONCacheItem.objects.all().count(), 1)
+        self.assertEqual(update_item.pk, item.pk)
+        self.assertEqual(update_item.sodar_uuid, item.sodar_uuid)
+        self.assertEqual(
+            JSONCacheItem.objects.get(pk=item.pk).data,
+            {'test_key': 'new_test_val'},
+        )
+
+    def test_set_cache_items(self):
+        """Test creating and updating cache items in bulk"""
+        item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            name='test_item1',
+            data={'test_key': 'test_val'},
+        )
+        items = {
+            'test_item{}'.format(i): {'test_key': 'new_val{}'.format(i)}
+            for i in range(1, 4)
+        }
+
+        with self.assertNumQueries(1):
+            ret = self.cache_backend.set_cache_items(
+                project=self.project,
+                app_name=TEST_APP_NAME,
+                user=self.user_owner,
+                items=items,
+            )
+
+        self.assertEqual(len(ret), 3)
+        self.assertEqual(JSONCacheItem.objects.all().count(), 3)
+        self.assertEqual(
+            {i.name: i.data for i in JSONCacheItem.objects.all()}, items
+        )
+        self.assertEqual(
+            JSONCacheItem.objects.get(name='test_item1').sodar_uuid,
+            item.sodar_uuid,
+        )
+        self.assertEqual(
+            JSONCacheItem.objects.filter(user=self.user_owner).count(), 3
+        )
+
+        # Written items should be read from the Django cache
+        with self.assertNumQueries(0):
+            get_item = self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item1', project=self.project
+            )
+
+        self.assertEqual(get_item.data, {'test_key': 'new_val1'})
+
+    def test_set_cache_items_empty(self):
+        """Test set_cache_items() with no items"""
+        with self.assertNumQueries(0):
+            ret = self.cache_backend.set_cache_items(
+                project=self.project, app_name=TEST_APP_NAME, items={}
+            )
+
+        self.assertEqual(ret, [])
+
     def test_get_cache_item(self):
         """Test getting a cache item"""
 
@@ -202,6 +311,142 @@ class TestSodarCacheAPI(JsonCacheItemMixin, TestJsonCacheItemBase):
 
         self.assertEqual(model_to_dict(get_item), expected)
 
+    def test_get_cache_item_cached(self):
+        """Test getting a cache item from the Django cache"""
+        item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        stats = self.cache_backend.get_cache_stats()
+
+        with self.assertNumQueries(0):
+            get_item = self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=self.project
+            )
+
+        self.assertEqual(model_to_dict(get_item), model_to_dict(item))
+        self.assertEqual(
+            self.cache_backend.get_cache_stats(),
+            {'hits': stats['hits'] + 1, 'misses': stats['misses']},
+        )
+
+    def test_get_cache_item_miss(self):
+        """Test getting a cache item not found in the Django cache"""
+        item = self._make_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        stats = self.cache_backend.get_cache_stats()
+
+        with self.assertNumQueries(1):
+            get_item = self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=self.project
+            )
+
+        self.assertEqual(get_item, item)
+        self.assertEqual(
+            self.cache_backend.get_cache_stats(),
+            {'hits': stats['hits'], 'misses': stats['misses'] + 1},
+        )
+
+        # Item should now be read from the cache
+        with self.assertNumQueries(0):
+            self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=self.project
+            )
+
+    def test_get_cache_item_invalidate(self):
+        """Test invalidating a cached item when updating the model"""
+        item = self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        # Cache item without project lookup
+        self.cache_backend.get_cache_item(
+            app_name=TEST_APP_NAME, name='test_item'
+        )
+        item.data = {'test_key': 'new_val'}
+        item.save()
+
+        for project in [self.project, None]:
+            get_item = self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=project
+            )
+            self.assertEqual(get_item.data, {'test_key': 'new_val'})
+
+    def test_get_cache_item_delete(self):
+        """Test getting a cached item after delete_cache()"""
+        self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        self.cache_backend.delete_cache(app_name=TEST_APP_NAME)
+        self.assertIsNone(
+            self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=self.project
+            )
+        )
+
+    def test_get_cache_item_delete_other(self):
+        """Test getting a cached item not affected by delete_cache()"""
+        self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name='filesfolders',
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        self.assertEqual(
+            self.cache_backend.delete_cache(app_name='filesfolders'), 1
+        )
+
+        with self.assertNumQueries(0):
+            get_item = self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=self.project
+            )
+
+        self.assertEqual(get_item.data, {'test_key': 'test_val'})
+
+    def test_get_cache_item_invalidate_cache(self):
+        """Test getting a cached item after invalidate_cache()"""
+        self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            user=self.user_owner,
+            name='test_item',
+            data={'test_key': 'test_val'},
+        )
+        self.cache_backend.invalidate_cache()
+        stats = self.cache_backend.get_cache_stats()
+
+        with self.assertNumQueries(1):
+            get_item = self.cache_backend.get_cache_item(
+                app_name=TEST_APP_NAME, name='test_item', project=self.project
+            )
+
+        self.assertEqual(get_item.data, {'test_key': 'test_val'})
+        self.assertEqual(
+            self.cache_backend.get_cache_stats()['misses'], stats['misses'] + 1
+        )
+
     def test_get_project_cache(self):
         """Test getting all cache item of a project"""
         first_item = self.cache_backend.set_cache_item(
@@ -244,6 +489,34 @@ class TestSodarCacheAPI(JsonCacheItemMixin, TestJsonCacheItemBase):
 
         self.assertEqual(update_time, item.date_modified.timestamp())
 
+    def test_get_update_times(self):
+        """Test getting update times of all cache items of an app"""
+        items = self.cache_backend.set_cache_items(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            items={'test_item1': {}, 'test_item2': {}},
+        )
+        self.cache_backend.set_cache_item(
+            app_name=TEST_APP_NAME, name='test_item3', data={}
+        )
+
+        with self.assertNumQueries(1):
+            update_times = self.cache_backend.get_update_times(
+                app_name=TEST_APP_NAME, project=self.project
+            )
+
+        self.assertEqual(
+            update_times, {i.name: i.date_modified.timestamp() for i in items},
+        )
+        self.assertEqual(
+            list(
+                self.cache_backend.get_update_times(
+                    app_name=TEST_APP_NAME
+                ).keys()
+            ),
+            ['test_item3'],
+        )
+
     def test_delete(self):
         """Test delete_cache() with no arguments"""
         self.cache_backend.set_cache_item(
@@ -0,0 +1,168 @@
+"""Tests for management commands in the sodarcache app"""
+
+import threading
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.utils import timezone
+
+# Projectroles dependency
+from projectroles.models import SODAR_CONSTANTS
+from projectroles.plugins import get_backend_api
+
+from .test_models import TestJsonCacheItemBase
+from ..models import JSONCacheItem
+
+
+# SODAR constants
+PROJECT_TYPE_PROJECT = SODAR_CONSTANTS['PROJECT_TYPE_PROJECT']
+
+# Local constants
+TEST_APP_NAME = 'sodarcache'
+COMMAND_MODULE = 'sodarcache.management.commands.synccache'
+
+
+class DummyCachePlugin:
+    """Project app plugin recording update_cache() calls"""
+
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def update_cache(self, name=None, project=None, user=None):
+        with self.lock:
+            self.calls.append((name, project))
+
+        if self.fail:
+            raise Exception('Update failed')
+
+    def update_site_cache(self, name=None, user=None):
+        self.update_cache(name=name, project=None, user=user)
+
+
+class TestSyncCache(TestJsonCacheItemBase):
+    """Tests for the synccache management command"""
+
+    def setUp(self):
+        super().setUp()
+        self.project2 = self._make_project(
+            'TestProject2', PROJECT_TYPE_PROJECT, None
+        )
+        self.cache_backend = get_backend_api('sodar_cache')
+        self.plugin = DummyCachePlugin(TEST_APP_NAME)
+
+    def _call_command(self, plugins, **kwargs):
+        """Call synccache with the given plugins, return log output"""
+        with patch(COMMAND_MODULE + '.get_active_plugins') as mock_plugins:
+            mock_plugins.return_value = plugins
+
+            with self.assertLogs(COMMAND_MODULE, level='INFO') as cm:
+                call_command('synccache', **kwargs)
+
+        return cm.output
+
+    def test_sync(self):
+        """Test sync with a single call per plugin"""
+        output = self._call_command([self.plugin])
+        self.assertEqual(self.plugin.calls, [(None, None)])
+        self.assertIn('Plugin "{}"'.format(TEST_APP_NAME), output[1])
+        self.assertIn('Cache synchronization OK', output[-1])
+
+    def test_sync_workers(self):
+        """Test sync split per plugin and project in worker threads"""
+        plugin2 = DummyCachePlugin('timeline')
+
+        with patch(COMMAND_MODULE + '.connection') as mock_connection:
+            output = self._call_command([self.plugin, plugin2], workers=2)
+
+        # Connections are closed once per worker thread
+        self.assertEqual(mock_connection.close.call_count, 2)
+
+        for plugin in [self.plugin, plugin2]:
+            self.assertEqual(
+                sorted(plugin.calls, key=lambda x: x[1].pk if x[1] else 0),
+                [(None, None), (None, self.project), (None, self.project2)],
+            )
+
+        self.assertTrue(
+            any('Project "{}"'.format(self.project.title) in o for o in output)
+        )
+        self.assertTrue(any('No project' in o for o in output))
+        self.assertIn('Cache synchronization OK', output[-1])
+
+    def test_sync_since(self):
+        """Test sync of items not updated within a time limit"""
+        for project, name in [
+            (self.project, 'fresh_item'),
+            (self.project, 'stale_item'),
+            (None, 'fresh_item'),
+            (None, 'stale_item'),
+        ]:
+            self.cache_backend.set_cache_item(
+                project=project, app_name=TEST_APP_NAME, name=name, data={}
+            )
+
+        JSONCacheItem.objects.filter(name='stale_item').update(
+            date_modified=timezone.now() - timedelta(hours=1)
+        )
+        project_empty = self._make_project(
+            'TestProjectEmpty', PROJECT_TYPE_PROJECT, None
+        )
+        output = self._call_command([self.plugin], since=30)
+
+        # Projects without cached items are updated without a name
+        self.assertEqual(
+            sorted(self.plugin.calls, key=lambda x: x[1].pk if x[1] else 0),
+            [
+                ('stale_item', None),
+                ('stale_item', self.project),
+                (None, self.project2),
+                (None, project_empty),
+            ],
+        )
+        self.assertTrue(
+            any(
+                'Plugin "{}": 3 projects (0 up to date)'.format(TEST_APP_NAME)
+                in o
+                for o in output
+            )
+        )
+
+    def test_sync_since_fresh(self):
+        """Test sync of up to date items"""
+        self.cache_backend.set_cache_item(
+            project=self.project,
+            app_name=TEST_APP_NAME,
+            name='fresh_item',
+            data={},
+        )
+        output = self._call_command(
+            [self.plugin], since=30, project=str(self.project.sodar_uuid)
+        )
+        self.assertEqual(self.plugin.calls, [])
+        self.assertTrue(
+            any(
+                'Plugin "{}": 1 projects (1 up to date)'.format(TEST_APP_NAME)
+                in o
+                for o in output
+            )
+        )
+
+    def test_sync_errors(self):
+        """Test aggregating errors of split updates"""
+        plugin_fail = DummyCachePlugin('timeline', fail=True)
+        output = self._call_command(
+            [self.plugin, plugin_fail],
+            workers=2,
+            project=str(self.project.sodar_uuid),
+        )
+        self.assertEqual(self.plugin.calls, [(None, self.project)])
+        self.assertEqual(plugin_fail.calls, [(None, self.project)])
+        self.assertTrue(
+            any(o.startswith('ERROR') and 'timeline' in o for o in output)
+        )
+        self.assertIn('finished with errors', output[-1])
@@ -7,6 +7,7 @@ from django.forms.models import model_to_dict
 from projectroles.models import Role, SODAR_CONSTANTS
 from projectroles.tests.test_models import ProjectMixin, RoleAssignmentMixin
 
+from ..api import SodarCacheAPI
 from ..models import JSONCacheItem
 
 
@@ -41,6 +42,9 @@ class JsonCacheItemMixin:
 
 class TestJsonCacheItemBase(ProjectMixin, RoleAssignmentMixin, TestCase):
     def setUp(self):
+        # Clear items cached in previous tests
+        SodarCacheAPI.invalidate_cache()
+
         # Make owner user
         self.user_owner = self.make_user('owner')
 
@@ -1,8 +1,16 @@
 from django.contrib import admin
 
-from .models import ProjectEvent, ProjectEventObjectRef, ProjectEventStatus
+from .models import (
+    ProjectEvent,
+    ProjectEventArchive,
+    ProjectEventObjectRef,
+    ProjectEventOutbox,
+    ProjectEventStatus,
+)
 
 
 admin.site.register(ProjectEvent)
 admin.site.register(ProjectEventObjectRef)
 admin.site.register(ProjectEventStatus)
+admin.site.register(ProjectEventArchive)
+admin.site.register(ProjectEventOutbox)
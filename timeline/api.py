@@ -1,26 +1,36 @@
 """Timeline API for adding and updating events"""
 import re
 
+from collections import defaultdict
+from functools import lru_cache
+
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.urls import reverse
 from django.utils.text import Truncator
 
 # Projectroles dependency
 from projectroles.models import Project, RemoteSite
-from projectroles.plugins import ProjectAppPluginPoint
+from projectroles.plugins import get_app_plugin
 from projectroles.templatetags.projectroles_common_tags import get_user_html
 from projectroles.utils import get_app_names
 
 from timeline.models import (
     ProjectEvent,
+    ProjectEventArchive,
     ProjectEventObjectRef,
     EVENT_STATUS_TYPES,
 )
+from timeline.writer import TimelineWriter, SYNC_STATUS_TYPES
 
 
 # Local variables
 APP_NAMES = get_app_names()
 LABEL_MAX_WIDTH = 32
+REF_ID_RE = re.compile("{'?(.*?)'?}")
+REF_ID_CACHE_SIZE = 1024
+UNKNOWN_LABEL = '(unknown)'
+ARCHIVE_BATCH_SIZE = 1000
 
 # Access Django user model
 User = get_user_model()
@@ -46,10 +56,36 @@ class TimelineAPI:
         )
 
     @staticmethod
-    def _get_project_desc(ref_obj, request=None):
-        """Get description HTML for special case: Project model"""
-        project = Project.objects.filter(sodar_uuid=ref_obj.object_uuid).first()
+    @lru_cache(maxsize=REF_ID_CACHE_SIZE)
+    def _get_ref_ids(description):
+        """
+        Return object reference labels parsed from an event description. The
+        results are cached, as descriptions are commonly repeated.
+
+        :param description: Event description (string)
+        :return: Tuple of strings
+        """
+        return tuple(REF_ID_RE.findall(description))
 
+    @staticmethod
+    def _get_history_link(event, ref_obj):
+        """Get object history link HTML for an object reference"""
+        history_url = reverse(
+            'timeline:list_object',
+            kwargs={
+                'project': event.project.sodar_uuid,
+                'object_model': ref_obj.object_model,
+                'object_uuid': ref_obj.object_uuid,
+            },
+        )
+        return (
+            '<a href="{}" class="sodar-tl-object-link">'
+            '<i class="fa fa-clock-o"></i></a>'.format(history_url)
+        )
+
+    @staticmethod
+    def _get_project_desc(ref_obj, project, request=None):
+        """Get description HTML for special case: Project model"""
         if (
             project
             and request
@@ -57,7 +93,8 @@ class TimelineAPI:
         ):
             return '<a href="{}">{}</a>'.format(
                 reverse(
-                    'projetroles:detail', kwargs={'project': project.sodar_uuid}
+                    'projectroles:detail',
+                    kwargs={'project': project.sodar_uuid},
                 ),
                 TimelineAPI._get_label(project.title),
             )
@@ -70,10 +107,8 @@ class TimelineAPI:
         return ref_obj.name
 
     @staticmethod
-    def _get_remote_site_desc(ref_obj, history_link, request=None):
+    def _get_remote_site_desc(ref_obj, site, history_link, request=None):
         """Get description HTML for special case: RemoteSite model"""
-        site = RemoteSite.objects.filter(sodar_uuid=ref_obj.object_uuid).first()
-
         if site and request and request.user.is_superuser:
             return '<a href="{}">{}</a> {}'.format(
                 reverse(
@@ -89,6 +124,166 @@ class TimelineAPI:
 
         return TimelineAPI._get_not_found_label(ref_obj, history_link)
 
+    @staticmethod
+    def _get_plugin_desc(ref_obj, link_data, history_link):
+        """Get description HTML for an object in an app with a plugin"""
+        if not link_data:
+            return TimelineAPI._get_not_found_label(ref_obj, history_link)
+
+        return '<a href="{}" {}>{}</a> {}'.format(
+            link_data['url'],
+            (
+                'target="_blank"'
+                if 'blank' in link_data and link_data['blank'] is True
+                else ''
+            ),
+            TimelineAPI._get_label(link_data['label']),
+            history_link,
+        )
+
+    @staticmethod
+    def _get_ref_objects(ref_objs, events):
+        """
+        Retrieve objects referred to in event descriptions in bulk, grouped by
+        model.
+
+        :param ref_objs: List of ProjectEventObjectRef objects
+        :param events: Dict of {event pk: ProjectEvent}
+        :return: Dict of {model or (app name, model): {object uuid: object}}
+        """
+        model_uuids = defaultdict(set)
+        ret = {}
+
+        for ref_obj in ref_objs:
+            if ref_obj.object_model in ['User', 'Project', 'RemoteSite']:
+                k = ref_obj.object_model
+
+            else:
+                k = (events[ref_obj.event_id].app, ref_obj.object_model)
+
+            model_uuids[k].add(ref_obj.object_uuid)
+
+        for model in [User, Project, RemoteSite]:
+            k = model.__name__
+
+            if k in model_uuids:
+                ret[k] = {
+                    str(o.sodar_uuid): o
+                    for o in model.objects.filter(sodar_uuid__in=model_uuids[k])
+                }
+
+        # Object links for apps with plugins
+        for k, uuids in model_uuids.items():
+            if not isinstance(k, tuple) or k[0] == 'projectroles':
+                continue
+
+            app_plugin = get_app_plugin(k[0])
+
+            try:
+                ret[k] = app_plugin.get_object_links(k[1], list(uuids))
+
+            except Exception:
+                ret[k] = {}
+
+        return ret
+
+    @staticmethod
+    def _get_ref_desc(event, ref_obj, objects, request=None):
+        """
+        Get description HTML for an object reference.
+
+        :param event: ProjectEvent object
+        :param ref_obj: ProjectEventObjectRef object
+        :param objects: Dict of referred objects from _get_ref_objects()
+        :param request: Request object (optional)
+        :return: String (contains HTML)
+        """
+        history_link = TimelineAPI._get_history_link(event, ref_obj)
+        model = ref_obj.object_model
+        uuid = str(ref_obj.object_uuid)
+
+        # Special case: User model
+        if model == 'User':
+            user = objects['User'].get(uuid)
+
+            if not user:
+                return UNKNOWN_LABEL
+
+            return '{} {}'.format(get_user_html(user), history_link)
+
+        # Special case: Project model
+        elif model == 'Project':
+            return TimelineAPI._get_project_desc(
+                ref_obj, objects['Project'].get(uuid), request
+            )
+
+        # Special case: RemoteSite model
+        elif model == 'RemoteSite':
+            return TimelineAPI._get_remote_site_desc(
+                ref_obj, objects['RemoteSite'].get(uuid), history_link, request
+            )
+
+        # Special case: projectroles app
+        elif event.app == 'projectroles':
+            return TimelineAPI._get_not_found_label(ref_obj, history_link)
+
+        # Apps with plugins
+        link_data = objects.get((event.app, model), {}).get(uuid)
+        return TimelineAPI._get_plugin_desc(ref_obj, link_data, history_link)
+
+    @staticmethod
+    def _get_archive_data(event):
+        """Return event with its status changes and object refs as a dict"""
+        return {
+            'sodar_uuid': str(event.sodar_uuid),
+            'app': event.app,
+            'user': event.user.username,
+            'event_name': event.event_name,
+            'description': event.description,
+            'classified': event.classified,
+            'extra_data': event.extra_data,
+            'status_type': event.status_type,
+            'timestamp': event.status_timestamp.isoformat(),
+            'status_changes': [
+                {
+                    'timestamp': s.timestamp.isoformat(),
+                    'status_type': s.status_type,
+                    'description': s.description,
+                    'extra_data': s.extra_data,
+                }
+                for s in sorted(event.status_changes.all(), key=lambda x: x.pk)
+            ],
+            'objects': [
+                {
+                    'label': o.label,
+                    'name': o.name,
+                    'object_model': o.object_model,
+                    'object_uuid': str(o.object_uuid)
+                    if o.object_uuid
+                    else None,
+                    'extra_data': o.extra_data,
+                }
+                for o in event.event_objects.all()
+            ],
+        }
+
+    @staticmethod
+    def _validate_event(app_name, status_type=None):
+        """Validate app name and status type for a new event"""
+        if app_name not in APP_NAMES:
+            raise ValueError(
+                'Unknown app name "{}" (active apps: {})'.format(
+                    app_name, ', '.join(x for x in APP_NAMES)
+                )
+            )
+
+        if status_type and status_type not in EVENT_STATUS_TYPES:
+            raise ValueError(
+                'Unknown status type "{}" (valid types: {})'.format(
+                    status_type, ', '.join(x for x in EVENT_STATUS_TYPES)
+                )
+            )
+
     # API functions ------------------------------------------------------------
 
     @staticmethod
@@ -122,20 +317,7 @@ class TimelineAPI:
         :return: ProjectEvent object
         :raise: ValueError if app_name or status_type is invalid
         """
-        if app_name not in APP_NAMES:
-            raise ValueError(
-                'Unknown app name "{}" (active apps: {})'.format(
-                    app_name, ', '.join(x for x in APP_NAMES)
-                )
-            )
-
-        if status_type and status_type not in EVENT_STATUS_TYPES:
-            raise ValueError(
-                'Unknown status type "{}" (valid types: {})'.format(
-                    status_type, ', '.join(x for x in EVENT_STATUS_TYPES)
-                )
-            )
-
+        TimelineAPI._validate_event(app_name, status_type)
         event = ProjectEvent()
         event.project = project
         event.app = app_name
@@ -147,18 +329,91 @@ class TimelineAPI:
         if extra_data:
             event.extra_data = extra_data
 
-        event.save()
+        statuses = []
 
         # Always add "INIT" status when creating, except for "INFO"
         if status_type != 'INFO':
-            event.set_status('INIT')
+            statuses.append(event._get_status('INIT'))
 
         # Add additional status if set (use if e.g. event is immediately "OK")
         if status_type:
-            event.set_status(status_type, status_desc, status_extra_data)
+            statuses.append(
+                event._get_status(status_type, status_desc, status_extra_data)
+            )
+
+        # Queue event in async mode unless it will be updated elsewhere
+        if TimelineWriter.is_async() and status_type not in SYNC_STATUS_TYPES:
+            event._timeline_queued = True
+            TimelineWriter.put(('event', event, statuses))
+
+        else:
+            TimelineWriter.write_sync([('event', event, statuses)])
 
         return event
 
+    @staticmethod
+    def add_events(events):
+        """
+        Create and save multiple timeline events in bulk, along with their
+        statuses and object references. Events are stored with the same
+        semantics as in add_event() and add_object(), using a fixed number of
+        database queries.
+
+        Example of an event dict:
+
+        {
+            'project': project,
+            'app_name': 'projectroles',
+            'user': user,
+            'event_name': 'role_update',
+            'description': 'update role for {user}',
+            'status_type': 'OK',
+            'objects': [{'obj': user, 'label': 'user', 'name': user.username}]
+        }
+
+        :param events: List of dicts with add_event() arguments, optionally
+            including add_object() arguments for each object reference as a
+            list of dicts in "objects"
+        :return: List of ProjectEvent objects
+        :raise: ValueError if app_name or status_type is invalid
+        """
+        ops = []
+
+        for e in events:
+            TimelineAPI._validate_event(e['app_name'], e.get('status_type'))
+            event = ProjectEvent(
+                project=e['project'],
+                app=e['app_name'],
+                user=e['user'],
+                event_name=e['event_name'],
+                description=e['description'],
+                classified=e.get('classified', False),
+                extra_data=e.get('extra_data') or {},
+            )
+            status_type = e.get('status_type')
+            statuses = []
+
+            # Always add "INIT" status when creating, except for "INFO"
+            if status_type != 'INFO':
+                statuses.append(event._get_status('INIT'))
+
+            if status_type:
+                statuses.append(
+                    event._get_status(
+                        status_type,
+                        e.get('status_desc'),
+                        e.get('status_extra_data'),
+                    )
+                )
+
+            ops.append(('event', event, statuses))
+
+            for o in e.get('objects', []):
+                ops.append(('object', event._get_object_ref(**o)))
+
+        TimelineWriter.write_sync(ops)
+        return [op[1] for op in ops if op[0] == 'event']
+
     @staticmethod
     def get_project_events(project, classified=False):
         """
@@ -184,100 +439,130 @@ class TimelineAPI:
         :param request: Request object (optional)
         :return: String (contains HTML)
         """
-        desc = event.description
-        unknown_label = '(unknown)'
-        refs = {}
-        ref_ids = re.findall("{'?(.*?)'?}", desc)
-
-        if len(ref_ids) == 0:
-            return event.description
-
-        for r in ref_ids:
-            # Get reference object or return an unknown label if not found
-            if r.startswith('extra-'):
-                app_plugin = ProjectAppPluginPoint.get_plugin(name=event.app)
-                refs[r] = app_plugin.get_extra_data_link(event.extra_data, r)
-                continue
+        return TimelineAPI.get_event_descriptions([event], request)[event.pk]
 
-            try:
-                ref_obj = ProjectEventObjectRef.objects.get(
-                    event=event, label=r
-                )
+    @staticmethod
+    def get_event_descriptions(events, request=None):
+        """
+        Return the descriptions of multiple timeline events as HTML. Object
+        references and referred objects for all events are retrieved in bulk,
+        so the number of database queries does not depend on the number of
+        events.
 
-            except ProjectEventObjectRef.DoesNotExist:
-                refs[r] = unknown_label
-                continue
+        :param events: List or QuerySet of ProjectEvent objects
+        :param request: Request object (optional)
+        :return: Dict of {event pk: string (contains HTML)}
+        """
+        ret = {}
+        ref_events = {}
 
-            # Get history link
-            history_url = reverse(
-                'timeline:list_object',
-                kwargs={
-                    'project': event.project.sodar_uuid,
-                    'object_model': ref_obj.object_model,
-                    'object_uuid': ref_obj.object_uuid,
-                },
-            )
-            history_link = (
-                '<a href="{}" class="sodar-tl-object-link">'
-                '<i class="fa fa-clock-o"></i></a>'.format(history_url)
+        for event in events:
+            if TimelineAPI._get_ref_ids(event.description):
+                ref_events[event.pk] = event
+
+            else:
+                ret[event.pk] = event.description
+
+        if not ref_events:
+            return ret
+
+        ref_objs = {
+            (r.event_id, r.label): r
+            for r in ProjectEventObjectRef.objects.filter(
+                event__in=ref_events.keys()
             )
+        }
+        objects = TimelineAPI._get_ref_objects(ref_objs.values(), ref_events)
+
+        for event in ref_events.values():
+            refs = {}
+
+            for r in TimelineAPI._get_ref_ids(event.description):
+                if r.startswith('extra-'):
+                    app_plugin = get_app_plugin(event.app)
+                    refs[r] = (
+                        app_plugin.get_extra_data_link(event.extra_data, r)
+                        if app_plugin
+                        else UNKNOWN_LABEL
+                    )
 
-            # Special case: User model
-            if ref_obj.object_model == 'User':
-                try:
-                    user = User.objects.get(sodar_uuid=ref_obj.object_uuid)
-                    refs[r] = '{} {}'.format(get_user_html(user), history_link)
+                elif (event.pk, r) in ref_objs:
+                    refs[r] = TimelineAPI._get_ref_desc(
+                        event, ref_objs[(event.pk, r)], objects, request
+                    )
 
-                except User.DoesNotExist:
-                    refs[r] = unknown_label
+                else:
+                    refs[r] = UNKNOWN_LABEL
 
-            # Special case: Project model
-            elif ref_obj.object_model == 'Project':
-                refs[r] = TimelineAPI._get_project_desc(ref_obj, request)
+            ret[event.pk] = event.description.format(**refs)
 
-            # Special case: RemoteSite model
-            elif ref_obj.object_model == 'RemoteSite':
-                refs[r] = TimelineAPI._get_remote_site_desc(
-                    ref_obj, history_link, request
-                )
+        return ret
 
-            # Special case: projectroles app
-            elif event.app == 'projectroles':
-                refs[r] = TimelineAPI._get_not_found_label(
-                    ref_obj, history_link
-                )
+    @staticmethod
+    def archive_events(project, cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+        """
+        Move events of a project with a current status older than cutoff into
+        compressed archives. Each batch of events is stored as a
+        ProjectEventArchive object and deleted from the event tables in a
+        single transaction.
 
-            # Apps with plugins
-            else:
-                app_plugin = ProjectAppPluginPoint.get_plugin(name=event.app)
+        :param project: Project object
+        :param cutoff: DateTime
+        :param batch_size: Maximum number of events per archive (int)
+        :return: List of ProjectEventArchive objects
+        """
+        ret = []
+        events = (
+            ProjectEvent.objects.filter(
+                project=project, status_timestamp__lt=cutoff
+            )
+            .select_related('user')
+            .prefetch_related('status_changes', 'event_objects')
+            .order_by('pk')
+        )
 
-                try:
-                    link_data = app_plugin.get_object_link(
-                        ref_obj.object_model, ref_obj.object_uuid
+        while True:
+            with transaction.atomic():
+                batch = list(events[:batch_size])
+
+                if not batch:
+                    break
+
+                data = [TimelineAPI._get_archive_data(e) for e in batch]
+                timestamps = [e.status_timestamp for e in batch]
+                ret.append(
+                    ProjectEventArchive.objects.create(
+                        project=project,
+                        date_start=min(timestamps),
+                        date_end=max(timestamps),
+                        event_count=len(batch),
+                        data=ProjectEventArchive.compress_events(data),
                     )
+                )
+                ProjectEvent.objects.filter(
+                    pk__in=[e.pk for e in batch]
+                ).delete()
 
-                except Exception:
-                    link_data = None
-
-                if link_data:
-                    refs[r] = '<a href="{}" {}>{}</a> {}'.format(
-                        link_data['url'],
-                        (
-                            'target="_blank"'
-                            if 'blank' in link_data
-                            and link_data['blank'] is True
-                            else ''
-                        ),
-                        TimelineAPI._get_label(link_data['label']),
-                        history_link,
-                    )
+        return ret
 
-                else:
-                    refs[r] = TimelineAPI._get_not_found_label(
-                        ref_obj, history_link
-                    )
+    @staticmethod
+    def get_archived_description(event):
+        """
+        Return the description of an archived event with object references
+        replaced by object names.
+
+        :param event: Archived event (dict)
+        :return: String
+        """
+        ref_ids = TimelineAPI._get_ref_ids(event['description'])
 
-        return event.description.format(**refs)
+        if not ref_ids:
+            return event['description']
+
+        names = {o['label']: o['name'] for o in event['objects']}
+        return event['description'].format(
+            **{r: names.get(r, UNKNOWN_LABEL) for r in ref_ids}
+        )
 
     @staticmethod
     def get_object_url(project_uuid, obj):
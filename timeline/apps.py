@@ -1,5 +1,15 @@
+import atexit
+
 from django.apps import AppConfig
+from django.core.signals import request_finished, request_started
 
 
 class TimelineConfig(AppConfig):
     name = 'timeline'
+
+    def ready(self):
+        from timeline.writer import flush_deferred, flush_exit, start_request
+
+        request_started.connect(start_request)
+        request_finished.connect(flush_deferred)
+        atexit.register(flush_exit)
@@ -0,0 +1,88 @@
+import logging
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Projectroles dependency
+from projectroles.models import Project
+
+from timeline.api import TimelineAPI, ARCHIVE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves timeline events older than the retention period into '
+        'compressed per-project archives.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-d',
+            '--days',
+            dest='days',
+            type=int,
+            required=False,
+            default=getattr(settings, 'TIMELINE_ARCHIVE_DAYS', None),
+            help='Archive events older than this many days (default: '
+            'TIMELINE_ARCHIVE_DAYS)',
+        )
+        parser.add_argument(
+            '-p',
+            '--project',
+            dest='project',
+            required=False,
+            default=None,
+            help='Limit archiving to a project or category by UUID',
+        )
+        parser.add_argument(
+            '-b',
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            required=False,
+            default=ARCHIVE_BATCH_SIZE,
+            help='Maximum number of events per archive',
+        )
+
+    def handle(self, *args, **options):
+        if not options['days']:
+            logger.error(
+                'Retention period not set, use --days or set '
+                'TIMELINE_ARCHIVE_DAYS'
+            )
+            return
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        projects = Project.objects.filter(
+            events__status_timestamp__lt=cutoff
+        ).distinct()
+
+        if options['project']:
+            projects = projects.filter(sodar_uuid=options['project'])
+
+        logger.info(
+            'Archiving timeline events older than {}..'.format(
+                cutoff.strftime('%Y-%m-%d %H:%M:%S')
+            )
+        )
+        timeline = TimelineAPI()
+        event_count = 0
+
+        for project in projects.order_by('pk'):
+            archives = timeline.archive_events(
+                project, cutoff, options['batch_size']
+            )
+            count = sum(a.event_count for a in archives)
+            event_count += count
+            logger.debug(
+                'Archived {} events in project "{}" ({})'.format(
+                    count, project.title, project.sodar_uuid
+                )
+            )
+
+        logger.info('Archived {} timeline events'.format(event_count))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 04:56
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_current_status(apps, schema_editor):
+    """Set status_type and status_timestamp for existing events"""
+    ProjectEvent = apps.get_model('timeline', 'ProjectEvent')
+    ProjectEventStatus = apps.get_model('timeline', 'ProjectEventStatus')
+    statuses = ProjectEventStatus.objects.filter(
+        event=OuterRef('pk')
+    ).order_by('-timestamp', '-pk')
+    ProjectEvent.objects.update(
+        status_type=Subquery(statuses.values('status_type')[:1]),
+        status_timestamp=Subquery(statuses.values('timestamp')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeline', '0004_update_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectevent',
+            name='status_timestamp',
+            field=models.DateTimeField(blank=True, help_text='DateTime of the current status', null=True),
+        ),
+        migrations.AddField(
+            model_name='projectevent',
+            name='status_type',
+            field=models.CharField(blank=True, help_text='Type of the current status', max_length=64, null=True),
+        ),
+        migrations.RunPython(
+            populate_current_status, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='projectevent',
+            index=models.Index(fields=['project', 'status_type'], name='timeline_pr_project_15b505_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 04:58
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeline', '0005_projectevent_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectevent',
+            index=models.Index(fields=['project', 'classified', '-id'], name='timeline_pr_project_dd0618_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecteventobjectref',
+            index=models.Index(fields=['object_model', 'object_uuid', 'event'], name='timeline_pr_object__e79b5b_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 05:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0018_remotesite_sync_version'),
+        ('timeline', '0006_event_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectEventArchive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_start', models.DateTimeField(help_text='Timestamp of the earliest archived event')),
+                ('date_end', models.DateTimeField(help_text='Timestamp of the latest archived event')),
+                ('event_count', models.PositiveIntegerField(help_text='Number of archived events')),
+                ('data', models.BinaryField(help_text='Archived events as gzip compressed JSON lines')),
+                ('date_created', models.DateTimeField(auto_now_add=True, help_text='DateTime of archive creation')),
+                ('sodar_uuid', models.UUIDField(default=uuid.uuid4, help_text='Archive SODAR UUID', unique=True)),
+                ('project', models.ForeignKey(help_text='Project in which the archived events belong', on_delete=django.db.models.deletion.CASCADE, related_name='event_archives', to='projectroles.Project')),
+            ],
+            options={
+                'ordering': ['project', '-date_end'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 05:55
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeline', '0008_status_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectEventOutbox',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('op_type', models.CharField(help_text='Type of the operation ("event", "status" or "object")', max_length=64)),
+                ('event_uuid', models.UUIDField(help_text='SODAR UUID of the event the operation refers to')),
+                ('data', django.contrib.postgres.fields.jsonb.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Serialized objects of the operation as JSON')),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Number of failed write attempts')),
+                ('error', models.TextField(blank=True, help_text='Error message of the latest failed write attempt', null=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True, help_text='DateTime of operation creation')),
+            ],
+            options={
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -1,8 +1,13 @@
+import gzip
+import json
 import uuid
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 # Projectroles dependency
 from projectroles.models import Project
@@ -89,6 +94,19 @@ class ProjectEvent(models.Model):
         'specified in rules)',
     )
 
+    #: Type of the current status (denormalized from status changes)
+    status_type = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text='Type of the current status',
+    )
+
+    #: DateTime of the current status (denormalized from status changes)
+    status_timestamp = models.DateTimeField(
+        null=True, blank=True, help_text='DateTime of the current status'
+    )
+
     #: UUID for the event
     sodar_uuid = models.UUIDField(
         default=uuid.uuid4, unique=True, help_text='Event SODAR UUID'
@@ -97,6 +115,15 @@ class ProjectEvent(models.Model):
     # Set manager for custom queries
     objects = ProjectEventManager()
 
+    #: Event is queued for writing by TimelineWriter in async mode
+    _timeline_queued = False
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status_type']),
+            models.Index(fields=['project', 'classified', '-id']),
+        ]
+
     def __str__(self):
         return '{}: {}/{}'.format(
             self.project.title, self.event_name, self.user.username
@@ -109,11 +136,16 @@ class ProjectEvent(models.Model):
 
     def get_current_status(self):
         """Return the current event status"""
-        return self.status_changes.order_by('-timestamp').first()
+        return self.status_changes.order_by('-timestamp', '-pk').first()
 
     def get_timestamp(self):
         """Return the timestamp of current status"""
-        return self.status_changes.order_by('-timestamp').first().timestamp
+        if self.status_timestamp:
+            return self.status_timestamp
+
+        return (
+            self.status_changes.order_by('-timestamp', '-pk').first().timestamp
+        )
 
     def get_status_changes(self, reverse=False):
         """Return all status changes for the event"""
@@ -121,16 +153,8 @@ class ProjectEvent(models.Model):
             '{}pk'.format('-' if reverse else '')
         )
 
-    def add_object(self, obj, label, name, extra_data=None):
-        """
-        Add object reference to an event.
-
-        :param obj: Django object to which we want to refer
-        :param label: Label for the object in the event description (string)
-        :param name: Name or title of the object (string)
-        :param extra_data: Additional data related to object (dict, optional)
-        :return: ProjectEventObjectRef object
-        """
+    def _get_object_ref(self, obj, label, name, extra_data=None):
+        """Return a new unsaved object reference for the event"""
         ref = ProjectEventObjectRef()
         ref.event = self
         ref.label = label
@@ -141,19 +165,10 @@ class ProjectEvent(models.Model):
         if extra_data:
             ref.extra_data = extra_data
 
-        ref.save()
         return ref
 
-    def set_status(self, status_type, status_desc=None, extra_data=None):
-        """
-        Set event status.
-
-        :param status_type: Status type string (see EVENT_STATUS_TYPES)
-        :param status_desc: Description string (optional)
-        :param extra_data: Extra data for the status (dict, optional)
-        :return: ProjectEventStatus object
-        :raise: TypeError if status_type is invalid
-        """
+    def _get_status(self, status_type, status_desc=None, extra_data=None):
+        """Return a new unsaved status for the event"""
         if status_type not in EVENT_STATUS_TYPES:
             raise TypeError(
                 'Invalid status type (accepted values: {})'.format(
@@ -172,7 +187,70 @@ class ProjectEvent(models.Model):
         if extra_data:
             status.extra_data = extra_data
 
+        return status
+
+    def _set_current_status(self, status):
+        """Update the denormalized current status of the event"""
+        self.status_type = status.status_type
+        self.status_timestamp = status.timestamp
+        self.save(update_fields=['status_type', 'status_timestamp'])
+
+    def add_object(self, obj, label, name, extra_data=None):
+        """
+        Add object reference to an event.
+
+        :param obj: Django object to which we want to refer
+        :param label: Label for the object in the event description (string)
+        :param name: Name or title of the object (string)
+        :param extra_data: Additional data related to object (dict, optional)
+        :return: ProjectEventObjectRef object
+        """
+        ref = self._get_object_ref(obj, label, name, extra_data)
+
+        if self._timeline_queued:
+            from timeline.writer import TimelineWriter
+
+            TimelineWriter.put(('object', ref))
+            return ref
+
+        ref.save()
+        return ref
+
+    def set_status(self, status_type, status_desc=None, extra_data=None):
+        """
+        Set event status.
+
+        :param status_type: Status type string (see EVENT_STATUS_TYPES)
+        :param status_desc: Description string (optional)
+        :param extra_data: Extra data for the status (dict, optional)
+        :return: ProjectEventStatus object
+        :raise: TypeError if status_type is invalid
+        """
+        status = self._get_status(status_type, status_desc, extra_data)
+
+        # Keep status changes of queued events in order with the event
+        if self._timeline_queued:
+            from timeline.writer import TimelineWriter, SYNC_STATUS_TYPES
+
+            if status_type in SYNC_STATUS_TYPES:
+                TimelineWriter.flush()
+                self.pk = (
+                    ProjectEvent.objects.filter(sodar_uuid=self.sodar_uuid)
+                    .values_list('pk', flat=True)
+                    .first()
+                )
+
+            # Event may not have been written if the flush timed out
+            if status_type not in SYNC_STATUS_TYPES or not self.pk:
+                self.status_type = status.status_type
+                self.status_timestamp = status.timestamp
+                TimelineWriter.put(('status', status))
+                return status
+
+            status.event_id = self.pk
+
         status.save()
+        self._set_current_status(status)
         return status
 
 
@@ -221,6 +299,11 @@ class ProjectEventObjectRef(models.Model):
         default=dict, help_text='Additional data related to the object as JSON'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_model', 'object_uuid', 'event'])
+        ]
+
     def __str__(self):
         return '{}: {}/{} ({})'.format(
             self.event.project.title,
@@ -253,7 +336,9 @@ class ProjectEventStatus(models.Model):
 
     #: DateTime of the status change
     timestamp = models.DateTimeField(
-        auto_now_add=True, help_text='DateTime of the status change'
+        default=timezone.now,
+        editable=False,
+        help_text='DateTime of the status change',
     )
 
     #: Type of the status change
@@ -292,3 +377,155 @@ class ProjectEventStatus(models.Model):
         return 'ProjectEventStatus({})'.format(
             ', '.join(repr(v) for v in values)
         )
+
+
+class ProjectEventArchive(models.Model):
+    """Class representing a set of archived timeline events of a project,
+    stored as compressed JSON lines"""
+
+    #: Project in which the archived events belong
+    project = models.ForeignKey(
+        Project,
+        related_name='event_archives',
+        help_text='Project in which the archived events belong',
+    )
+
+    #: Timestamp of the earliest archived event
+    date_start = models.DateTimeField(
+        help_text='Timestamp of the earliest archived event'
+    )
+
+    #: Timestamp of the latest archived event
+    date_end = models.DateTimeField(
+        help_text='Timestamp of the latest archived event'
+    )
+
+    #: Number of archived events
+    event_count = models.PositiveIntegerField(
+        help_text='Number of archived events'
+    )
+
+    #: Archived events as gzip compressed JSON lines
+    data = models.BinaryField(
+        help_text='Archived events as gzip compressed JSON lines'
+    )
+
+    #: DateTime of archive creation
+    date_created = models.DateTimeField(
+        auto_now_add=True, help_text='DateTime of archive creation'
+    )
+
+    #: UUID for the archive
+    sodar_uuid = models.UUIDField(
+        default=uuid.uuid4, unique=True, help_text='Archive SODAR UUID'
+    )
+
+    class Meta:
+        ordering = ['project', '-date_end']
+
+    def __str__(self):
+        return '{}: {} events ({} - {})'.format(
+            self.project.title,
+            self.event_count,
+            self.date_start.strftime('%Y-%m-%d'),
+            self.date_end.strftime('%Y-%m-%d'),
+        )
+
+    def __repr__(self):
+        values = (
+            self.project.title,
+            self.event_count,
+            self.date_start.strftime('%Y-%m-%d'),
+            self.date_end.strftime('%Y-%m-%d'),
+        )
+        return 'ProjectEventArchive({})'.format(
+            ', '.join(repr(v) for v in values)
+        )
+
+    @classmethod
+    def compress_events(cls, events):
+        """
+        Return event data compressed as gzip JSON lines.
+
+        :param events: List of dicts
+        :return: Bytes
+        """
+        return gzip.compress(
+            ''.join(json.dumps(e) + '\n' for e in events).encode('utf-8')
+        )
+
+    def get_events(self):
+        """
+        Return archived events with timestamps parsed, newest first.
+
+        :return: List of dicts
+        """
+        ret = []
+
+        for line in (
+            gzip.decompress(bytes(self.data)).decode('utf-8').split('\n')
+        ):
+            if not line:
+                continue
+
+            event = json.loads(line)
+            event['timestamp'] = parse_datetime(event['timestamp'])
+
+            for status in event['status_changes']:
+                status['timestamp'] = parse_datetime(status['timestamp'])
+
+            ret.append(event)
+
+        return ret[::-1]
+
+
+class ProjectEventOutbox(models.Model):
+    """Class representing a timeline write operation stored until it is
+    written by TimelineWriter in async mode"""
+
+    #: Type of the operation ("event", "status" or "object")
+    op_type = models.CharField(
+        max_length=64,
+        help_text='Type of the operation ("event", "status" or "object")',
+    )
+
+    #: SODAR UUID of the event the operation refers to
+    event_uuid = models.UUIDField(
+        help_text='SODAR UUID of the event the operation refers to'
+    )
+
+    #: Serialized objects of the operation as JSON
+    data = JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        help_text='Serialized objects of the operation as JSON',
+    )
+
+    #: Number of failed write attempts
+    attempts = models.PositiveIntegerField(
+        default=0, help_text='Number of failed write attempts'
+    )
+
+    #: Error message of the latest failed write attempt
+    error = models.TextField(
+        null=True,
+        blank=True,
+        help_text='Error message of the latest failed write attempt',
+    )
+
+    #: DateTime of operation creation
+    date_created = models.DateTimeField(
+        auto_now_add=True, help_text='DateTime of operation creation'
+    )
+
+    class Meta:
+        ordering = ['pk']
+
+    def __str__(self):
+        return '{}: {}'.format(self.op_type, self.event_uuid)
+
+    def __repr__(self):
+        values = (self.op_type, self.event_uuid, self.attempts)
+        return 'ProjectEventOutbox({})'.format(
+            ', '.join(repr(v) for v in values)
+        )
@@ -32,23 +32,35 @@ def get_timestamp(event):
 
 
 @register.simple_tag
-def get_event_description(event, request=None):
-    """Return printable version of event description"""
+def get_event_description(event, request=None, descriptions=None):
+    """
+    Return printable version of event description. If descriptions retrieved
+    with get_event_descriptions are provided, the description is returned
+    from them.
+    """
+    if descriptions and event.pk in descriptions:
+        return descriptions[event.pk]
+
     timeline = TimelineAPI()
     return timeline.get_event_description(event, request)
 
 
+@register.simple_tag
+def get_event_descriptions(events, request=None):
+    """Return printable descriptions for multiple events in bulk"""
+    timeline = TimelineAPI()
+    return timeline.get_event_descriptions(events, request)
+
+
 @register.simple_tag
 def get_details_events(project, view_classified):
     """Return recent events for card on project details page"""
-    events = ProjectEvent.objects.filter(project=project)
+    events = ProjectEvent.objects.filter(project=project, status_type='OK')
 
     if not view_classified:
         events = events.exclude(classified=True)
 
-    events = events.order_by('-pk')
-
-    return [x for x in events if x.get_current_status().status_type == 'OK'][:5]
+    return list(events.select_related('project', 'user').order_by('-pk')[:5])
 
 
 # Template rendering -----------------------------------------------------------
@@ -56,10 +68,15 @@ def get_details_events(project, view_classified):
 
 @register.simple_tag
 def get_status_style(status):
-    """Retrn status style class"""
+    """Return status style class for a status, an event or an archived event"""
+    status_type = (
+        status['status_type']
+        if isinstance(status, dict)
+        else status.status_type
+    )
     return (
-        (STATUS_STYLES[status.status_type] + ' text-light')
-        if status.status_type in STATUS_STYLES
+        (STATUS_STYLES[status_type] + ' text-light')
+        if status_type in STATUS_STYLES
         else 'bg-light'
     )
 
@@ -2,10 +2,12 @@
 
 from django.forms.models import model_to_dict
 from django.urls import reverse
+from django.utils import timezone
 
 # Projectroles dependency
 from projectroles.models import SODAR_CONSTANTS
 from projectroles.plugins import get_backend_api
+from projectroles.templatetags.projectroles_common_tags import get_user_html
 
 
 from .test_models import (
@@ -15,6 +17,7 @@ from .test_models import (
 )
 from ..models import (
     ProjectEvent,
+    ProjectEventArchive,
     ProjectEventStatus,
     ProjectEventObjectRef,
     DEFAULT_MESSAGES,
@@ -69,6 +72,8 @@ class TestTimelineAPI(
             'description': 'description',
             'classified': False,
             'extra_data': {'test_key': 'test_val'},
+            'status_type': 'INIT',
+            'status_timestamp': event.get_current_status().timestamp,
             'sodar_uuid': event.sodar_uuid,
         }
 
@@ -121,6 +126,8 @@ class TestTimelineAPI(
             'description': 'description',
             'classified': False,
             'extra_data': {'test_key': 'test_val'},
+            'status_type': 'OK',
+            'status_timestamp': status.timestamp,
             'sodar_uuid': event.sodar_uuid,
         }
 
@@ -218,6 +225,105 @@ class TestTimelineAPI(
 
         self.assertEqual(model_to_dict(ref), expected)
 
+    def test_add_events(self):
+        """Test adding multiple events in bulk"""
+        temp_obj = self.project.get_owner()
+        events = [
+            {
+                'project': self.project,
+                'app_name': 'projectroles',
+                'user': self.user_owner,
+                'event_name': 'test_event',
+                'description': 'event with {obj}',
+                'extra_data': {'test_key': 'test_val'},
+                'status_type': 'OK',
+                'status_desc': 'OK description',
+                'objects': [
+                    {
+                        'obj': temp_obj,
+                        'label': 'obj',
+                        'name': 'assignment',
+                        'extra_data': {'test_key': 'test_val'},
+                    }
+                ],
+            },
+            {
+                'project': self.project,
+                'app_name': 'projectroles',
+                'user': self.user_owner,
+                'event_name': 'test_event_info',
+                'description': 'description',
+                'classified': True,
+                'status_type': 'INFO',
+            },
+            {
+                'project': self.project,
+                'app_name': 'projectroles',
+                'user': self.user_owner,
+                'event_name': 'test_event_init',
+                'description': 'description',
+            },
+        ]
+
+        with self.assertNumQueries(3):
+            new_events = self.timeline.add_events(events)
+
+        self.assertEqual(ProjectEvent.objects.all().count(), 3)
+        self.assertEqual(ProjectEventStatus.objects.all().count(), 4)
+        self.assertEqual(ProjectEventObjectRef.objects.all().count(), 1)
+
+        event = ProjectEvent.objects.get(pk=new_events[0].pk)
+        self.assertEqual(event.extra_data, {'test_key': 'test_val'})
+        self.assertEqual(
+            [s.status_type for s in event.get_status_changes()], ['INIT', 'OK']
+        )
+        status = event.get_current_status()
+        self.assertEqual(status.status_type, 'OK')
+        self.assertEqual(status.description, 'OK description')
+        self.assertEqual(event.status_type, 'OK')
+        ref = event.event_objects.first()
+        expected = {
+            'id': ref.pk,
+            'event': event.pk,
+            'label': 'obj',
+            'name': 'assignment',
+            'object_model': temp_obj.__class__.__name__,
+            'object_uuid': temp_obj.sodar_uuid,
+            'extra_data': {'test_key': 'test_val'},
+        }
+        self.assertEqual(model_to_dict(ref), expected)
+
+        event = ProjectEvent.objects.get(pk=new_events[1].pk)
+        self.assertEqual(event.classified, True)
+        self.assertEqual(
+            [s.status_type for s in event.get_status_changes()], ['INFO']
+        )
+        self.assertEqual(event.status_type, 'INFO')
+        event = ProjectEvent.objects.get(pk=new_events[2].pk)
+        self.assertEqual(event.get_current_status().status_type, 'INIT')
+        self.assertEqual(event.status_type, 'INIT')
+        self.assertEqual(
+            event.get_current_status().description, DEFAULT_MESSAGES['INIT']
+        )
+
+    def test_add_events_invalid_status(self):
+        """Test adding multiple events with an invalid status type"""
+        with self.assertRaises(ValueError):
+            self.timeline.add_events(
+                [
+                    {
+                        'project': self.project,
+                        'app_name': 'projectroles',
+                        'user': self.user_owner,
+                        'event_name': 'test_event',
+                        'description': 'description',
+                        'status_type': 'NON-EXISTING STATUS TYPE',
+                    }
+                ]
+            )
+
+        self.assertEqual(ProjectEvent.objects.all().count(), 0)
+
     def test_get_project_events(self):
         """Test get_project_events()"""
 
@@ -254,6 +360,147 @@ class TestTimelineAPI(
         self.assertEqual(events.count(), 2)
         self.assertIn(event_classified, events)
 
+    def test_get_event_description(self):
+        """Test get_event_description()"""
+        event = self.timeline.add_event(
+            project=self.project,
+            app_name='projectroles',
+            user=self.user_owner,
+            event_name='test_event',
+            description='description',
+        )
+        self.assertEqual(
+            self.timeline.get_event_description(event), 'description'
+        )
+
+    def test_get_event_description_refs(self):
+        """Test get_event_description() with object references"""
+        event = self.timeline.add_event(
+            project=self.project,
+            app_name='projectroles',
+            user=self.user_owner,
+            event_name='test_event',
+            description='update {user} in {project} ({missing})',
+        )
+        event.add_object(self.user_owner, 'user', self.user_owner.username)
+        event.add_object(self.project, 'project', self.project.title)
+        desc = self.timeline.get_event_description(event)
+
+        self.assertIn(get_user_html(self.user_owner), desc)
+        self.assertIn(
+            self.timeline.get_object_url(
+                self.project.sodar_uuid, self.user_owner
+            ),
+            desc,
+        )
+        self.assertIn(
+            '<span class="text-danger">{}</span>'.format(self.project.title),
+            desc,
+        )
+        self.assertIn('(unknown)', desc)
+
+    def test_get_event_descriptions(self):
+        """Test get_event_descriptions() with multiple events"""
+        events = []
+
+        for i in range(5):
+            user = self.make_user('user{}'.format(i))
+            event = self.timeline.add_event(
+                project=self.project,
+                app_name='filesfolders',
+                user=self.user_owner,
+                event_name='test_event',
+                description='update {user} in {project}',
+            )
+            event.add_object(user, 'user', user.username)
+            event.add_object(self.project, 'project', self.project.title)
+            events.append(event)
+
+        events = list(
+            ProjectEvent.objects.filter(
+                pk__in=[e.pk for e in events]
+            ).select_related('project')
+        )
+
+        # Object refs, users and projects
+        with self.assertNumQueries(3):
+            ret = self.timeline.get_event_descriptions(events)
+
+        self.assertEqual(len(ret), 5)
+
+        for event in events:
+            self.assertEqual(
+                ret[event.pk], self.timeline.get_event_description(event)
+            )
+            self.assertIn(self.project.title, ret[event.pk])
+
+    def test_archive_events(self):
+        """Test archive_events()"""
+        event = self.timeline.add_event(
+            project=self.project,
+            app_name='projectroles',
+            user=self.user_owner,
+            event_name='test_event',
+            description='update {user}',
+            extra_data={'test_key': 'test_val'},
+            status_type='OK',
+        )
+        event.add_object(self.user_owner, 'user', self.user_owner.username)
+        for i in range(2):
+            self.timeline.add_event(
+                project=self.project,
+                app_name='projectroles',
+                user=self.user_owner,
+                event_name='test_event',
+                description='description {}'.format(i),
+            )
+        cutoff = timezone.now()
+        event_new = self.timeline.add_event(
+            project=self.project,
+            app_name='projectroles',
+            user=self.user_owner,
+            event_name='test_event',
+            description='description',
+        )
+
+        archives = self.timeline.archive_events(
+            self.project, cutoff, batch_size=2
+        )
+
+        self.assertEqual(len(archives), 2)
+        self.assertEqual([a.event_count for a in archives], [2, 1])
+        self.assertEqual(ProjectEventArchive.objects.count(), 2)
+        self.assertEqual(list(ProjectEvent.objects.all()), [event_new])
+        self.assertEqual(ProjectEventStatus.objects.count(), 1)
+        self.assertEqual(ProjectEventObjectRef.objects.count(), 0)
+
+        archived = archives[0].get_events()[-1]
+        self.assertEqual(archived['sodar_uuid'], str(event.sodar_uuid))
+        self.assertEqual(archived['user'], self.user_owner.username)
+        self.assertEqual(archived['extra_data'], {'test_key': 'test_val'})
+        self.assertEqual(archived['status_type'], 'OK')
+        self.assertEqual(archived['timestamp'], event.status_timestamp)
+        self.assertEqual(
+            [s['status_type'] for s in archived['status_changes']],
+            ['INIT', 'OK'],
+        )
+        self.assertEqual(archived['objects'][0]['label'], 'user')
+        self.assertEqual(
+            self.timeline.get_archived_description(archived),
+            'update {}'.format(self.user_owner.username),
+        )
+
+    def test_get_archived_description(self):
+        """Test get_archived_description() with a missing reference"""
+        event = {
+            'description': 'update {user} in {project}',
+            'objects': [{'label': 'user', 'name': 'owner'}],
+        }
+        self.assertEqual(
+            self.timeline.get_archived_description(event),
+            'update owner in (unknown)',
+        )
+
     def test_get_object_url(self):
         """Test get_object_url()"""
 
@@ -119,6 +119,8 @@ class TestProjectEvent(
             'description': 'description',
             'classified': False,
             'extra_data': {'test_key': 'test_val'},
+            'status_type': None,
+            'status_timestamp': None,
             'sodar_uuid': self.event.sodar_uuid,
         }
 
@@ -317,3 +319,7 @@ class TestProjectEventStatus(
         }
 
         self.assertEqual(model_to_dict(new_status), expected)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.status_type, 'FAILED')
+        self.assertEqual(self.event.status_timestamp, new_status.timestamp)
+        self.assertEqual(self.event.get_timestamp(), new_status.timestamp)
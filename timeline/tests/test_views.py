@@ -1,11 +1,14 @@
 """Tests for views in the timeline app"""
 
 from django.urls import reverse
+from django.utils import timezone
 
 # Projectroles dependency
 from projectroles.models import Role, SODAR_CONSTANTS
 from projectroles.plugins import get_backend_api
 
+from timeline.models import ProjectEvent
+
 from timeline.tests.test_models import (
     TestProjectEventBase,
     ProjectEventMixin,
@@ -86,6 +89,68 @@ class TestProjectListView(TestViewsBase):
             )
             self.assertEqual(response.status_code, 200)
 
+    def test_render_status(self):
+        """Test rendering the list view with a status filter"""
+        event_failed = self.timeline.add_event(
+            project=self.project,
+            app_name='projectroles',
+            user=self.user,
+            event_name='test_event',
+            description='description',
+            status_type='FAILED',
+        )
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'timeline:list_project',
+                    kwargs={'project': self.project.sodar_uuid},
+                ),
+                {'status': 'FAILED'},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                list(response.context['object_list']), [event_failed]
+            )
+
+    def test_render_pagination(self):
+        """Test rendering the list view with keyset pagination"""
+        for i in range(20):
+            self.timeline.add_event(
+                project=self.project,
+                app_name='projectroles',
+                user=self.user,
+                event_name='test_event',
+                description='description {}'.format(i),
+            )
+        url = reverse(
+            'timeline:list_project', kwargs={'project': self.project.sodar_uuid}
+        )
+        events = list(
+            ProjectEvent.objects.filter(project=self.project).order_by('-pk')
+        )
+
+        with self.login(self.user):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['object_list']), events[:15])
+            self.assertIsNone(response.context['page_newer'])
+            self.assertEqual(response.context['page_older'], events[14].pk)
+
+            response = self.client.get(
+                url, {'before': response.context['page_older']}
+            )
+            self.assertEqual(list(response.context['object_list']), events[15:])
+            self.assertEqual(response.context['page_newer'], events[15].pk)
+            self.assertIsNone(response.context['page_older'])
+
+            response = self.client.get(
+                url, {'after': response.context['page_newer']}
+            )
+            self.assertEqual(list(response.context['object_list']), events[:15])
+            self.assertIsNone(response.context['page_newer'])
+            self.assertEqual(response.context['page_older'], events[14].pk)
+
     def test_render_category(self):
         """Test rendering the list view for a category"""
         with self.login(self.user):
@@ -123,3 +188,70 @@ class TestObjectListView(TestViewsBase):
                 )
             )
             self.assertEqual(response.status_code, 200)
+
+
+class TestArchiveViews(TestViewsBase):
+    """Tests for the timeline archive views"""
+
+    def setUp(self):
+        super().setUp()
+        self.event_classified = self.timeline.add_event(
+            project=self.project,
+            app_name='projectroles',
+            user=self.user,
+            event_name='test_event',
+            description='classified',
+            classified=True,
+        )
+        self.archive = self.timeline.archive_events(
+            self.project, timezone.now()
+        )[0]
+        self.user_guest = self.make_user('guest')
+        self._make_assignment(self.project, self.user_guest, self.role_guest)
+
+    def test_render_list(self):
+        """Test rendering the archive list view"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'timeline:list_archive',
+                    kwargs={'project': self.project.sodar_uuid},
+                )
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                list(response.context['object_list']), [self.archive]
+            )
+
+    def test_render_archive(self):
+        """Test rendering the archive view"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'timeline:archive',
+                    kwargs={'projecteventarchive': self.archive.sodar_uuid},
+                )
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [e['sodar_uuid'] for e in response.context['events']],
+                [
+                    str(self.event_classified.sodar_uuid),
+                    str(self.event.sodar_uuid),
+                ],
+            )
+
+    def test_render_archive_guest(self):
+        """Test rendering the archive view without classified access"""
+        with self.login(self.user_guest):
+            response = self.client.get(
+                reverse(
+                    'timeline:archive',
+                    kwargs={'projecteventarchive': self.archive.sodar_uuid},
+                )
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [e['sodar_uuid'] for e in response.context['events']],
+                [str(self.event.sodar_uuid)],
+            )
@@ -0,0 +1,338 @@
+"""Tests for the timeline event writer"""
+
+import time
+
+from unittest.mock import patch
+
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+
+from test_plus.test import BaseTestCase
+
+# Projectroles dependency
+from projectroles.models import Role, SODAR_CONSTANTS
+from projectroles.plugins import get_backend_api
+from projectroles.tests.test_models import ProjectMixin, RoleAssignmentMixin
+
+from timeline.models import (
+    ProjectEvent,
+    ProjectEventObjectRef,
+    ProjectEventOutbox,
+    ProjectEventStatus,
+)
+from timeline.writer import (
+    MAX_ATTEMPTS,
+    TimelineWriter,
+    flush_deferred,
+    start_request,
+)
+
+
+# SODAR constants
+PROJECT_ROLE_OWNER = SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
+PROJECT_TYPE_PROJECT = SODAR_CONSTANTS['PROJECT_TYPE_PROJECT']
+
+
+class TestTimelineWriterBase(
+    ProjectMixin, RoleAssignmentMixin, TransactionTestCase, BaseTestCase
+):
+    """
+    Base class for TimelineWriter tests. Transactions are committed so
+    stored operations are visible to the writer thread.
+    """
+
+    def setUp(self):
+        self.user_owner = self.make_user('owner')
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, None
+        )
+        self.role_owner = Role.objects.get_or_create(name=PROJECT_ROLE_OWNER)[0]
+        self.assignment_owner = self._make_assignment(
+            self.project, self.user_owner, self.role_owner
+        )
+        self.timeline = get_backend_api('timeline_backend')
+
+    def tearDown(self):
+        TimelineWriter.flush()
+
+    def _add_event(self, status_type=None, project=None):
+        return self.timeline.add_event(
+            project=project or self.project,
+            app_name='projectroles',
+            user=self.user_owner,
+            event_name='test_event',
+            description='description',
+            status_type=status_type,
+        )
+
+
+@override_settings(TIMELINE_ASYNC_MODE='deferred')
+class TestTimelineWriter(TestTimelineWriterBase):
+    """Tests for TimelineWriter in deferred async mode"""
+
+    def setUp(self):
+        super().setUp()
+        # Simulate writing within a request
+        start_request(sender=self.__class__)
+
+    def tearDown(self):
+        flush_deferred(sender=self.__class__)
+
+    def test_add_event(self):
+        """Test queuing an event with an object ref and a status change"""
+        event = self._add_event()
+        event.add_object(self.user_owner, 'user', self.user_owner.username)
+        event.set_status('OK')
+
+        self.assertIsNone(event.pk)
+        self.assertEqual(event.status_type, 'OK')
+        self.assertEqual(ProjectEvent.objects.count(), 0)
+
+        with self.assertNumQueries(8):
+            TimelineWriter.flush()
+
+        event = ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid)
+        self.assertEqual(event.status_type, 'OK')
+        self.assertEqual(
+            [s.status_type for s in event.get_status_changes()], ['INIT', 'OK']
+        )
+        self.assertEqual(
+            event.status_timestamp, event.get_current_status().timestamp
+        )
+        self.assertEqual(ProjectEventObjectRef.objects.count(), 1)
+
+    def test_set_status_flushed(self):
+        """Test setting status for an event queued in a previous batch"""
+        event = self._add_event()
+        TimelineWriter.flush()
+        event.set_status('FAILED')
+        self.assertEqual(ProjectEventStatus.objects.count(), 1)
+
+        TimelineWriter.flush()
+        event = ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid)
+        self.assertEqual(event.status_type, 'FAILED')
+        self.assertEqual(ProjectEventStatus.objects.count(), 2)
+
+    def test_add_event_submit(self):
+        """Test adding an event with the SUBMIT status"""
+        event_queued = self._add_event(status_type='OK')
+        event = self._add_event(status_type='SUBMIT')
+
+        # Queued event is written first to retain ordering
+        self.assertEqual(
+            list(
+                ProjectEvent.objects.order_by('pk').values_list(
+                    'sodar_uuid', flat=True
+                )
+            ),
+            [event_queued.sodar_uuid, event.sodar_uuid],
+        )
+
+    def test_set_status_submit(self):
+        """Test setting the SUBMIT status for a queued event"""
+        event = self._add_event()
+        event.set_status('SUBMIT')
+
+        event = ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid)
+        self.assertEqual(event.status_type, 'SUBMIT')
+        self.assertEqual(ProjectEventStatus.objects.count(), 2)
+
+    def test_flush_deferred(self):
+        """Test writing queued events at the end of a request"""
+        self._add_event(status_type='OK')
+        self.assertEqual(ProjectEvent.objects.count(), 0)
+        flush_deferred(sender=self.__class__)
+        self.assertEqual(ProjectEvent.objects.count(), 1)
+
+    def test_add_event_no_request(self):
+        """Test adding an event outside of a request"""
+        flush_deferred(sender=self.__class__)
+        event = self._add_event()
+        self.assertTrue(
+            ProjectEvent.objects.filter(sodar_uuid=event.sodar_uuid).exists()
+        )
+
+        # Operations in a transaction are written once it is committed
+        with transaction.atomic():
+            event.set_status('OK')
+            self.assertEqual(ProjectEventStatus.objects.count(), 1)
+
+        self.assertEqual(ProjectEventStatus.objects.count(), 2)
+        self.assertEqual(ProjectEventOutbox.objects.count(), 0)
+
+    @override_settings(TIMELINE_ASYNC_MODE='invalid')
+    def test_invalid_mode(self):
+        """Test adding an event with an invalid async mode"""
+        with self.assertRaises(ValueError):
+            self._add_event()
+
+    def test_add_event_rollback(self):
+        """Test adding an event in a rolled back transaction"""
+        try:
+            with transaction.atomic():
+                self._add_event(status_type='OK')
+                raise ValueError()
+
+        except ValueError:
+            pass
+
+        self.assertEqual(ProjectEventOutbox.objects.count(), 0)
+        TimelineWriter.flush()
+        self.assertEqual(ProjectEvent.objects.count(), 0)
+
+    def test_set_status_submit_transaction(self):
+        """Test setting the SUBMIT status in the transaction of the event"""
+        with transaction.atomic():
+            event = self._add_event()
+            event.set_status('SUBMIT')
+            self.assertEqual(ProjectEventOutbox.objects.count(), 0)
+
+        TimelineWriter.flush()
+        event = ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid)
+        self.assertEqual(event.status_type, 'SUBMIT')
+
+    def test_add_event_stored(self):
+        """Test operations being stored in the outbox"""
+        event = self._add_event()
+        event.set_status('OK')
+        self.assertEqual(
+            list(ProjectEventOutbox.objects.values_list('op_type', flat=True)),
+            ['event', 'status'],
+        )
+        self.assertEqual(
+            ProjectEventOutbox.objects.first().data['event']['app'],
+            'projectroles',
+        )
+
+        TimelineWriter.flush()
+        self.assertEqual(ProjectEventOutbox.objects.count(), 0)
+        self.assertEqual(
+            ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid).status_type,
+            'OK',
+        )
+
+    def test_write_failure(self):
+        """Test writing a batch with an invalid operation"""
+        event = self._add_event(status_type='OK')
+        event.add_object(self.user_owner, 'user', self.user_owner.username)
+        event_invalid = self._add_event()
+        row = ProjectEventOutbox.objects.get(
+            event_uuid=event_invalid.sodar_uuid
+        )
+        row.data['event']['app'] = None  # Not nullable
+        row.save()
+        event_invalid.add_object(
+            self.user_owner, 'user', self.user_owner.username
+        )
+        event_invalid.set_status('OK')
+        self._add_event(status_type='OK')
+
+        with self.assertLogs('timeline.writer', level='ERROR'):
+            TimelineWriter.flush()
+
+        # Operations of the invalid event are kept in the outbox
+        self.assertEqual(ProjectEvent.objects.count(), 2)
+        self.assertEqual(ProjectEventObjectRef.objects.count(), 1)
+        self.assertEqual(
+            ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid).status_type,
+            'OK',
+        )
+        self.assertEqual(
+            list(ProjectEventOutbox.objects.values_list('op_type', flat=True)),
+            ['event', 'object', 'status'],
+        )
+        self.assertTrue(all(r.error for r in ProjectEventOutbox.objects.all()))
+
+        # Failed operations are retried up to MAX_ATTEMPTS times
+        with self.assertLogs('timeline.writer', level='ERROR'):
+            for i in range(MAX_ATTEMPTS):
+                TimelineWriter.flush()
+
+        self.assertEqual(
+            set(ProjectEventOutbox.objects.values_list('attempts', flat=True)),
+            {MAX_ATTEMPTS},
+        )
+        self.assertEqual(ProjectEvent.objects.count(), 2)
+
+    def test_flush_timeout(self):
+        """Test flush() timing out while the outbox is locked"""
+        self._add_event(status_type='OK')
+
+        with patch.object(TimelineWriter, '_lock', return_value=False):
+            with self.assertLogs('timeline.writer', level='WARNING'):
+                self.assertFalse(TimelineWriter.flush(timeout=0.1))
+
+        self.assertEqual(ProjectEvent.objects.count(), 0)
+        self.assertTrue(TimelineWriter.flush())
+        self.assertEqual(ProjectEvent.objects.count(), 1)
+
+    def test_flush_deferred_locked(self):
+        """Test writing at the end of a request while the outbox is locked"""
+        self._add_event(status_type='OK')
+
+        with patch.object(TimelineWriter, '_lock', return_value=False):
+            flush_deferred(sender=self.__class__)
+
+        self.assertEqual(ProjectEvent.objects.count(), 0)
+        self.assertEqual(ProjectEventOutbox.objects.count(), 1)
+
+
+@override_settings(TIMELINE_ASYNC_MODE='thread')
+class TestTimelineWriterThread(TestTimelineWriterBase):
+    """Tests for TimelineWriter in thread async mode"""
+
+    def test_add_event(self):
+        """Test writing an event in the writer thread"""
+        event = self._add_event()
+        event.set_status('OK')
+        TimelineWriter.flush()
+
+        self.assertTrue(TimelineWriter.thread.is_alive())
+        event = ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid)
+        self.assertEqual(event.status_type, 'OK')
+        self.assertEqual(ProjectEventStatus.objects.count(), 2)
+
+    def test_add_event_transaction(self):
+        """Test adding an event for a project created in a transaction"""
+        with transaction.atomic():
+            project = self._make_project(
+                'NewProject', PROJECT_TYPE_PROJECT, None
+            )
+            event = self._add_event(status_type='OK', project=project)
+            self.assertEqual(ProjectEvent.objects.count(), 0)
+
+        TimelineWriter.flush()
+        self.assertEqual(
+            ProjectEvent.objects.get(sodar_uuid=event.sodar_uuid).project,
+            project,
+        )
+
+    def test_add_event_rollback(self):
+        """Test adding an event in a rolled back transaction"""
+        try:
+            with transaction.atomic():
+                self._add_event(status_type='OK')
+                raise ValueError()
+
+        except ValueError:
+            pass
+
+        TimelineWriter.flush()
+        self.assertEqual(ProjectEvent.objects.count(), 0)
+
+    def test_write_thread(self):
+        """Test the writer thread writing stored operations without flush()"""
+        event = self._add_event(status_type='OK')
+
+        for i in range(50):
+            if ProjectEvent.objects.filter(
+                sodar_uuid=event.sodar_uuid
+            ).exists():
+                break
+
+            time.sleep(0.1)
+
+        self.assertTrue(
+            ProjectEvent.objects.filter(sodar_uuid=event.sodar_uuid).exists()
+        )
+        self.assertEqual(ProjectEventOutbox.objects.count(), 0)
@@ -18,6 +18,16 @@ urls_ui = [
         view=views.ObjectTimelineView.as_view(),
         name='list_object',
     ),
+    url(
+        regex=r'^(?P<project>[0-9a-f-]+)/archive$',
+        view=views.ProjectArchiveListView.as_view(),
+        name='list_archive',
+    ),
+    url(
+        regex=r'^archive/(?P<projecteventarchive>[0-9a-f-]+)$',
+        view=views.ProjectArchiveView.as_view(),
+        name='archive',
+    ),
 ]
 
 # Taskflow API views
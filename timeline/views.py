@@ -2,7 +2,7 @@
 
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import ListView
+from django.views.generic import DetailView, ListView
 
 # Projectroles dependency
 from projectroles.models import Project
@@ -13,7 +13,12 @@ from projectroles.views import (
     ProjectPermissionMixin,
 )
 
-from timeline.models import ProjectEvent
+from timeline.api import TimelineAPI
+from timeline.models import (
+    ProjectEvent,
+    ProjectEventArchive,
+    EVENT_STATUS_TYPES,
+)
 
 
 # Local variables
@@ -32,25 +37,94 @@ class ProjectTimelineView(
     permission_required = 'timeline.view_timeline'
     template_name = 'timeline/timeline.html'
     model = ProjectEvent
-    paginate_by = getattr(settings, 'TIMELINE_PAGINATION', DEFAULT_PAGINATION)
+    page_size = getattr(settings, 'TIMELINE_PAGINATION', DEFAULT_PAGINATION)
 
     def get_context_data(self, *args, **kwargs):
-        context = super().get_context_data(*args, **kwargs)
+        events, cursors = self._get_page(self.object_list)
+        context = super().get_context_data(*args, object_list=events, **kwargs)
+        context.update(cursors)
         context['timeline_title'] = '{} Timeline'.format(
             get_display_name(context['project'].type, title=True)
         )
         context['timeline_mode'] = 'project'
+        context['timeline_status'] = self._get_status_type()
+        context['event_descriptions'] = TimelineAPI.get_event_descriptions(
+            context['object_list'], self.request
+        )
         return context
 
+    def _get_cursor(self, param):
+        """Return event pk from a pagination cursor or None if not set"""
+        try:
+            return int(self.request.GET.get(param))
+
+        except (TypeError, ValueError):
+            return None
+
+    def _get_page(self, queryset):
+        """
+        Return a page of events with keyset pagination. Pages are retrieved
+        relative to the pk of the first or last event of the previous page,
+        so the total number of events is not counted.
+
+        :param queryset: QuerySet of ProjectEvent objects
+        :return: List of ProjectEvent objects, dict of cursor context data
+        """
+        before = self._get_cursor('before')
+        after = self._get_cursor('after')
+
+        if after is not None:
+            events = list(
+                queryset.filter(pk__gt=after).order_by('pk')[
+                    : self.page_size + 1
+                ]
+            )
+            has_newer = len(events) > self.page_size
+            events = events[: self.page_size][::-1]
+            has_older = queryset.filter(pk__lte=after).exists()
+
+        else:
+            events = queryset.order_by('-pk')
+
+            if before is not None:
+                events = events.filter(pk__lt=before)
+
+            events = list(events[: self.page_size + 1])
+            has_older = len(events) > self.page_size
+            events = events[: self.page_size]
+            has_newer = (
+                before is not None and queryset.filter(pk__gte=before).exists()
+            )
+
+        return (
+            events,
+            {
+                'page_newer': events[0].pk if events and has_newer else None,
+                'page_older': events[-1].pk if events and has_older else None,
+            },
+        )
+
+    def _get_status_type(self):
+        """Return status type for filtering events or None if not set"""
+        status_type = self.request.GET.get('status')
+        return status_type if status_type in EVENT_STATUS_TYPES else None
+
     def get_queryset(self):
         set_kwargs = {'project__sodar_uuid': self.kwargs['project']}
 
+        if self._get_status_type():
+            set_kwargs['status_type'] = self._get_status_type()
+
         if not self.request.user.has_perm(
             'timeline.view_classified_event', self.get_permission_object()
         ):
             set_kwargs['classified'] = False
 
-        return ProjectEvent.objects.filter(**set_kwargs).order_by('-pk')
+        return (
+            ProjectEvent.objects.filter(**set_kwargs)
+            .select_related('project', 'user')
+            .order_by('-pk')
+        )
 
 
 class ObjectTimelineView(ProjectTimelineView):
@@ -80,4 +154,61 @@ class ObjectTimelineView(ProjectTimelineView):
         ):
             queryset = queryset.filter(classified=False)
 
-        return queryset
+        if self._get_status_type():
+            queryset = queryset.filter(status_type=self._get_status_type())
+
+        return queryset.select_related('project', 'user')
+
+
+class ProjectArchiveListView(
+    LoginRequiredMixin,
+    LoggedInPermissionMixin,
+    ProjectContextMixin,
+    ProjectPermissionMixin,
+    ListView,
+):
+    """View for displaying archived timeline events of a project"""
+
+    permission_required = 'timeline.view_timeline'
+    template_name = 'timeline/archive_list.html'
+    model = ProjectEventArchive
+
+    def get_queryset(self):
+        return (
+            ProjectEventArchive.objects.filter(
+                project__sodar_uuid=self.kwargs['project']
+            )
+            .defer('data')
+            .order_by('-date_end')
+        )
+
+
+class ProjectArchiveView(
+    LoginRequiredMixin,
+    LoggedInPermissionMixin,
+    ProjectContextMixin,
+    ProjectPermissionMixin,
+    DetailView,
+):
+    """View for displaying the events of a timeline archive"""
+
+    permission_required = 'timeline.view_timeline'
+    template_name = 'timeline/archive.html'
+    model = ProjectEventArchive
+    slug_url_kwarg = 'projecteventarchive'
+    slug_field = 'sodar_uuid'
+
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        events = self.object.get_events()
+
+        if not self.request.user.has_perm(
+            'timeline.view_classified_event', self.get_permission_object()
+        ):
+            events = [e for e in events if not e['classified']]
+
+        for e in events:
+            e['description'] = TimelineAPI.get_archived_description(e)
+
+        context['events'] = events
+        return context
@@ -0,0 +1,469 @@
+"""Writer for storing timeline events in bulk and asynchronously"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+
+from timeline.models import (
+    ProjectEvent,
+    ProjectEventObjectRef,
+    ProjectEventOutbox,
+    ProjectEventStatus,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Local constants
+ASYNC_MODES = ['thread', 'deferred']
+WRITE_BATCH_SIZE = 500
+# Status types for which events are written immediately, as they are expected
+# to be updated from outside the current process (e.g. by taskflow)
+SYNC_STATUS_TYPES = ['SUBMIT']
+# Failed operations are kept in the outbox and retried up to this many times
+MAX_ATTEMPTS = 3
+# Default timeout in seconds for waiting on other writers in flush()
+FLUSH_TIMEOUT = 10
+# Interval in seconds for the writer thread to check for stored operations
+POLL_INTERVAL = 5
+# Interval in seconds for retrying to acquire the outbox lock
+LOCK_INTERVAL = 0.05
+# Postgres advisory lock ID for writing from the outbox
+OUTBOX_LOCK_ID = 7391546
+
+
+class TimelineWriter:
+    """
+    Writer for timeline events, status changes and object references. Writes
+    are given as operations, which are tuples of one of the following:
+
+    - ``('event', event, [status, ...])``
+    - ``('status', status)``
+    - ``('object', ref)``
+
+    In async mode (``TIMELINE_ASYNC_MODE``), operations are stored in the
+    ProjectEventOutbox table within the transaction of the caller, so they are
+    committed or rolled back along with it. Stored operations are written in
+    bulk and in the order they were stored, so events of a project retain
+    their order. In "thread" mode a background thread writes them, in
+    "deferred" mode they are written after the current response has been sent
+    or when flush() is called. Outside of requests, e.g. in management
+    commands or Celery tasks, deferred mode writes operations once the
+    current transaction is committed. Writing is serialized between processes with a
+    database lock.
+
+    If writing a batch fails, its operations are retried one at a time.
+    Operations which still fail are kept in the outbox with their error and
+    retried up to MAX_ATTEMPTS times.
+    """
+
+    thread = None
+    thread_lock = threading.Lock()
+    wake = threading.Event()
+    # Whether operations have been stored by the current process
+    stored = False
+    # Request state of the current thread for deferred mode
+    local = threading.local()
+
+    @staticmethod
+    def get_mode():
+        """
+        Return the async mode set in TIMELINE_ASYNC_MODE.
+
+        :return: "thread", "deferred" or None if async mode is disabled
+        :raise: ValueError if the mode is not recognized
+        """
+        mode = getattr(settings, 'TIMELINE_ASYNC_MODE', None)
+
+        if mode and mode not in ASYNC_MODES:
+            raise ValueError(
+                'Unknown async mode "{}" (valid modes: {})'.format(
+                    mode, ', '.join(ASYNC_MODES)
+                )
+            )
+
+        return mode
+
+    @classmethod
+    def is_async(cls):
+        """Return True if async mode is enabled"""
+        return cls.get_mode() is not None
+
+    @staticmethod
+    def write(ops):
+        """
+        Write operations to the database in bulk, using a fixed number of
+        queries for events and their new status changes and object refs.
+
+        :param ops: List of operation tuples
+        """
+        events = []
+        statuses = []
+        refs = []
+
+        for op in ops:
+            if op[0] == 'event':
+                events.append(op[1])
+                statuses += op[2]
+
+            elif op[0] == 'status':
+                statuses.append(op[1])
+
+            else:
+                refs.append(op[1])
+
+        # Latest status of each event in queue order
+        current = {id(s.event): s for s in statuses}
+
+        for status in current.values():
+            status.event.status_type = status.status_type
+            status.event.status_timestamp = status.timestamp
+
+        new_events = set(id(e) for e in events)
+
+        try:
+            with transaction.atomic(savepoint=False):
+                ProjectEvent.objects.bulk_create(events)
+
+                for obj in statuses + refs:
+                    obj.event_id = obj.event.pk
+
+                ProjectEventStatus.objects.bulk_create(statuses)
+                ProjectEventObjectRef.objects.bulk_create(refs)
+
+                # Update current status for events written previously
+                for status in current.values():
+                    if id(status.event) not in new_events:
+                        ProjectEvent.objects.filter(pk=status.event.pk).update(
+                            status_type=status.status_type,
+                            status_timestamp=status.timestamp,
+                        )
+
+        except Exception:
+            # Events were not stored if the transaction was rolled back
+            for event in events:
+                event.pk = None
+
+            raise
+
+    @classmethod
+    def write_sync(cls, ops):
+        """
+        Write operations immediately after any stored operations.
+
+        :param ops: List of operation tuples
+        """
+        if cls.is_async():
+            cls.flush()
+
+        cls.write(ops)
+
+    @classmethod
+    def put(cls, op):
+        """
+        Store an operation in the outbox for writing in async mode. Inside a
+        transaction, the operation is stored as part of the transaction.
+
+        :param op: Operation tuple
+        """
+        ProjectEventOutbox.objects.create(
+            op_type=op[0],
+            event_uuid=cls._get_event(op).sodar_uuid,
+            data=cls._serialize_op(op),
+        )
+        cls.stored = True
+        mode = cls.get_mode()
+
+        if mode == 'thread':
+            transaction.on_commit(cls._notify)
+
+        # Nothing flushes deferred operations outside of the request cycle
+        elif mode == 'deferred' and not getattr(cls.local, 'request', False):
+            transaction.on_commit(cls.flush)
+
+    @classmethod
+    def flush(cls, timeout=None):
+        """
+        Write operations stored in the outbox. If another process is writing,
+        wait for it to release the outbox until the timeout is reached.
+
+        :param timeout: Timeout in seconds (int or float, optional, defaults
+                        to TIMELINE_FLUSH_TIMEOUT)
+        :return: False if the timeout was reached, otherwise True
+        """
+        if timeout is None:
+            timeout = getattr(settings, 'TIMELINE_FLUSH_TIMEOUT', FLUSH_TIMEOUT)
+
+        return cls._write_outbox(time.monotonic() + timeout)
+
+    @staticmethod
+    def _get_event(op):
+        """Return the event of an operation"""
+        return op[1] if op[0] == 'event' else op[1].event
+
+    @staticmethod
+    def _serialize(obj):
+        """Return model fields of an unsaved object as a dict"""
+        return {
+            f.attname: f.value_from_object(obj)
+            for f in obj._meta.concrete_fields
+            if f.name not in ['id', 'event']
+        }
+
+    @staticmethod
+    def _deserialize(model, data):
+        """Return an unsaved object of model from serialized fields"""
+        fields = {f.attname: f for f in model._meta.concrete_fields}
+        return model(**{k: fields[k].to_python(v) for k, v in data.items()})
+
+    @classmethod
+    def _serialize_op(cls, op):
+        """Return operation objects as a JSON serializable dict"""
+        if op[0] == 'event':
+            return {
+                'event': cls._serialize(op[1]),
+                'statuses': [cls._serialize(s) for s in op[2]],
+            }
+
+        return {op[0]: cls._serialize(op[1])}
+
+    @classmethod
+    def _get_ops(cls, rows):
+        """
+        Return operations for outbox rows. Status changes and object refs are
+        linked to events in the same batch or events already written.
+
+        :param rows: List of ProjectEventOutbox objects
+        :return: List of operation tuples, None for operations of unknown
+                 events
+        """
+        events = {
+            r.event_uuid: cls._deserialize(ProjectEvent, r.data['event'])
+            for r in rows
+            if r.op_type == 'event'
+        }
+        missing = set(r.event_uuid for r in rows) - set(events.keys())
+
+        if missing:
+            events.update(
+                {
+                    e.sodar_uuid: e
+                    for e in ProjectEvent.objects.filter(
+                        sodar_uuid__in=missing
+                    ).only('pk', 'sodar_uuid')
+                }
+            )
+
+        ret = []
+
+        for row in rows:
+            event = events.get(row.event_uuid)
+
+            if not event:
+                ret.append(None)
+                continue
+
+            if row.op_type == 'event':
+                objs = [
+                    cls._deserialize(ProjectEventStatus, s)
+                    for s in row.data['statuses']
+                ]
+
+            elif row.op_type == 'status':
+                objs = cls._deserialize(ProjectEventStatus, row.data['status'])
+
+            else:
+                objs = cls._deserialize(
+                    ProjectEventObjectRef, row.data['object']
+                )
+
+            for obj in objs if isinstance(objs, list) else [objs]:
+                obj.event = event
+
+            ret.append(
+                (row.op_type, event, objs)
+                if row.op_type == 'event'
+                else (row.op_type, objs)
+            )
+
+        return ret
+
+    @staticmethod
+    def _is_writable(op):
+        """Return False if op refers to an event which was not written"""
+        return op is not None and (
+            op[0] == 'event' or op[1].event.pk is not None
+        )
+
+    @classmethod
+    def _set_failed(cls, row, error):
+        """Log a failed operation and update its outbox row"""
+        logger.error(
+            'Unable to write timeline operation "{}" for event {}: {}'.format(
+                row.op_type, row.event_uuid, error
+            )
+        )
+        ProjectEventOutbox.objects.filter(pk=row.pk).update(
+            attempts=F('attempts') + 1, error=error
+        )
+
+    @classmethod
+    def _write_batch(cls, rows):
+        """
+        Write a batch of outbox rows and remove the written rows. If the batch
+        fails, retry operations one at a time so a single invalid operation
+        does not prevent writing the others.
+
+        :param rows: List of ProjectEventOutbox objects
+        """
+        ops = cls._get_ops(rows)
+
+        try:
+            with transaction.atomic():
+                if None in ops:
+                    raise ValueError('Event not found')
+
+                cls.write(ops)
+                ProjectEventOutbox.objects.filter(
+                    pk__in=[r.pk for r in rows]
+                ).delete()
+
+            return
+
+        except Exception as ex:
+            logger.error(
+                'Unable to write {} timeline operations, retrying '
+                'individually: {}'.format(len(ops), ex)
+            )
+
+        for row, op in zip(rows, ops):
+            if not cls._is_writable(op):
+                cls._set_failed(row, 'Event not written')
+                continue
+
+            try:
+                with transaction.atomic():
+                    cls.write([op])
+                    row.delete()
+
+            except Exception as ex:
+                cls._set_failed(row, str(ex))
+
+    @staticmethod
+    def _lock():
+        """
+        Acquire the outbox lock for the current transaction if available.
+
+        :return: True if the lock was acquired
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_try_advisory_xact_lock(%s)', [OUTBOX_LOCK_ID]
+            )
+            return cursor.fetchone()[0]
+
+    @classmethod
+    def _write_outbox(cls, deadline=None):
+        """
+        Write operations from the outbox in batches until it is empty.
+
+        :param deadline: Time to wait for the outbox lock until, compared to
+                         time.monotonic() (optional, don't wait if not set)
+        :return: False if the outbox was not written due to the deadline
+        """
+        while True:
+            with transaction.atomic():
+                locked = cls._lock()
+
+                if locked:
+                    rows = list(
+                        ProjectEventOutbox.objects.filter(
+                            attempts__lt=MAX_ATTEMPTS
+                        ).order_by('pk')[:WRITE_BATCH_SIZE]
+                    )
+
+                    if rows:
+                        cls._write_batch(rows)
+
+            if locked:
+                if len(rows) < WRITE_BATCH_SIZE:
+                    return True
+
+                continue
+
+            if deadline is None:
+                return False
+
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    'Timed out waiting for another process to write timeline '
+                    'operations'
+                )
+                return False
+
+            time.sleep(LOCK_INTERVAL)
+
+    @classmethod
+    def _notify(cls):
+        """Wake up the writer thread, starting it if not running"""
+        cls._start_thread()
+        cls.wake.set()
+
+    @classmethod
+    def _run(cls):
+        """Write stored operations in a background thread"""
+        while True:
+            cls.wake.wait(POLL_INTERVAL)
+            cls.wake.clear()
+
+            try:
+                cls._write_outbox()
+
+            except Exception as ex:
+                logger.error(
+                    'Unable to write timeline operations: {}'.format(ex)
+                )
+
+            close_old_connections()
+
+    @classmethod
+    def _start_thread(cls):
+        """Start the background writer thread if not running"""
+        with cls.thread_lock:
+            if cls.thread and cls.thread.is_alive():
+                return
+
+            cls.thread = threading.Thread(
+                target=cls._run, name='timeline-writer', daemon=True
+            )
+            cls.thread.start()
+
+
+def start_request(**kwargs):
+    """Mark the current thread as serving a request for deferred mode"""
+    TimelineWriter.local.request = True
+
+
+def flush_deferred(**kwargs):
+    """Write stored operations at the end of a request in deferred mode"""
+    TimelineWriter.local.request = False
+
+    if TimelineWriter.get_mode() == 'deferred':
+        # Don't block the request, operations are written by the process
+        # holding the lock
+        TimelineWriter._write_outbox()
+
+
+def flush_exit():
+    """Write stored operations at process exit"""
+    if TimelineWriter.stored and TimelineWriter.is_async():
+        try:
+            TimelineWriter.flush()
+
+        except Exception as ex:
+            logger.error('Unable to write timeline operations: {}'.format(ex))